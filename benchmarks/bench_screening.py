@@ -0,0 +1,312 @@
+"""
+Benchmarks for the screening and indicator hot paths.
+
+Uses an in-process fake Stock client that serves synthetic daily bars, per symbol and
+through a fake multi-symbol bars endpoint, so results only measure the strategy's own
+processing. Each stage is timed and its peak traced memory is recorded for every combination
+of ticker count and history length; data stages are timed both per symbol and with the
+default batch size.
+
+Usage:
+    python -m benchmarks.bench_screening --tickers 10 100 --years 1 --output results.json
+"""
+
+import argparse
+import json
+import logging
+import platform
+import time
+import tracemalloc
+import zlib
+from datetime import datetime, timezone
+from importlib import metadata
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from alpaca_daily_losers import global_functions
+from alpaca_daily_losers.close_positions import ClosePositions
+from alpaca_daily_losers.daily_losers import DailyLosers
+from alpaca_daily_losers.global_functions import (
+    DEFAULT_BATCH_SIZE,
+    calculate_indicators,
+    get_ticker_data,
+)
+from alpaca_daily_losers.indicators import INDICATOR_WINDOWS
+from alpaca_daily_losers.market_data import MarketData
+
+DEFAULT_TICKER_COUNTS = [10, 100, 1000, 5000]
+DEFAULT_YEARS = [1, 5]
+TRADING_DAYS_PER_YEAR = 252
+
+logger = logging.getLogger(__name__)
+
+
+class FakeHistory:
+    """
+    Serves synthetic daily bars with the layout of `History.get_stock_data`.
+    """
+
+    data_url = "https://data.example/v2"
+    headers: dict = {}
+
+    def __init__(self, bars: int, seed: int = 0):
+        self.bars = bars
+        self.seed = seed
+        self.dates = pd.bdate_range(end="2024-06-28", periods=bars)
+
+    def get_stock_data(self, symbol: str, start: str, end: str, **kwargs) -> pd.DataFrame:
+        rng = np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, self.bars)))
+        return pd.DataFrame(
+            {
+                "symbol": symbol,
+                "date": self.dates,
+                "open": close,
+                "high": close * 1.01,
+                "low": close * 0.99,
+                "close": close,
+                "volume": rng.integers(1_000, 1_000_000, self.bars),
+                "trade_count": rng.integers(10, 10_000, self.bars),
+                "vwap": close,
+            }
+        )
+
+    def get_bars(self, symbol: str) -> list:
+        """
+        Get the bars of a symbol in the format of the Alpaca bars endpoint.
+        """
+        history = self.get_stock_data(symbol, start="", end="")
+        bars = history.rename(columns=BAR_FIELDS)[list(BAR_FIELDS.values())]
+        bars["t"] = history["date"].dt.strftime("%Y-%m-%dT00:00:00Z")
+        return bars.to_dict("records")
+
+
+BAR_FIELDS = {
+    "open": "o",
+    "high": "h",
+    "low": "l",
+    "close": "c",
+    "volume": "v",
+    "trade_count": "n",
+    "vwap": "vw",
+}
+
+
+class FakeBarsEndpoint:
+    """
+    Serves the multi-symbol bars endpoint from a `FakeHistory`, paginated by the `limit`
+    parameter like the Alpaca API.
+
+    Pages are built once and then served from memory, so a warmed-up endpoint only adds the
+    cost of returning the response text to the stage being measured.
+    """
+
+    def __init__(self, history: FakeHistory):
+        self.history = history
+        self._pages = {}
+
+    def request(self, method: str, url: str, headers=None, params=None, **kwargs):
+        key = (params["symbols"], params["limit"], params.get("page_token"))
+        if key not in self._pages:
+            self._pages[key] = self._page(*key)
+        return SimpleNamespace(text=self._pages[key])
+
+    def _page(self, symbols: str, limit: int, page_token) -> str:
+        offset = int(page_token or 0)
+        bars, position = {}, 0
+        for symbol in symbols.split(","):
+            symbol_bars = self.history.get_bars(symbol)
+            start, end = max(offset - position, 0), offset + limit - position
+            if start < len(symbol_bars) and end > 0:
+                bars[symbol] = symbol_bars[start:end]
+            position += len(symbol_bars)
+        next_offset = offset + limit
+        next_page_token = str(next_offset) if next_offset < position else None
+        return json.dumps({"bars": bars, "next_page_token": next_page_token})
+
+
+class FakeStock:
+    """
+    In-process stand-in for `py_alpaca_api.Stock`.
+    """
+
+    def __init__(self, bars: int, seed: int = 0):
+        self.history = FakeHistory(bars, seed)
+
+
+class FakeWatchlists:
+    def update(self, watchlist_name, symbols):
+        return None
+
+
+class FakePositions:
+    def __init__(self, symbols):
+        rng = np.random.default_rng(len(symbols))
+        self.positions = pd.DataFrame(
+            {
+                "symbol": list(symbols) + ["Cash"],
+                "qty": list(rng.integers(1, 100, len(symbols))) + [0],
+                "market_value": list(rng.uniform(100, 10_000, len(symbols))) + [1_000.0],
+                "profit_pct": list(rng.normal(0, 8, len(symbols))) + [0.0],
+            }
+        )
+
+    def get_all(self):
+        return self.positions
+
+
+class FakeTrading:
+    def __init__(self, symbols):
+        self.positions = FakePositions(symbols)
+        self.watchlists = FakeWatchlists()
+
+
+class FakeAlpaca:
+    def __init__(self, stock, trading):
+        self.stock = stock
+        self.trading = trading
+
+
+def measure(function, trace_memory: bool = True):
+    """
+    Run a function and return its wall time in seconds and peak traced memory in bytes.
+
+    tracemalloc slows allocation heavy code considerably, so the time is taken from an
+    untraced run and the peak memory from a second, traced run.
+    """
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_case(ticker_count: int, years: int, repeat: int = 1, trace_memory: bool = True) -> dict:
+    """
+    Benchmark every stage for one ticker count and history length.
+
+    Args:
+        ticker_count (int): Number of tickers to screen.
+        years (int): Years of daily history per ticker.
+        repeat (int, optional): Number of timed runs per stage; the fastest is reported.
+        trace_memory (bool, optional): Whether to also measure peak memory per stage.
+
+    Returns:
+        dict: Seconds and peak bytes per stage.
+    """
+    tickers = [f"SYM{i:05d}" for i in range(ticker_count)]
+    stock = FakeStock(bars=years * TRADING_DAYS_PER_YEAR)
+    trading = FakeTrading(tickers)
+
+    daily_losers = DailyLosers.__new__(DailyLosers)
+    daily_losers.alpaca = FakeAlpaca(stock, trading)
+    close_positions = ClosePositions(trading, stock, logger)
+
+    def run_calculate_indicators():
+        for ticker in tickers:
+            history = stock.history.get_stock_data(ticker, start="", end="")
+            for window in INDICATOR_WINDOWS:
+                calculate_indicators(history, window)
+
+    endpoint = FakeBarsEndpoint(stock.history)
+
+    def batched(function):
+        def run():
+            with patch.object(global_functions, "Requests", lambda: endpoint):
+                return function()
+
+        return run
+
+    # Build the endpoint's pages up front, so they are not part of the measured stages.
+    batched(lambda: get_ticker_data(tickers, stock, batch_size=DEFAULT_BATCH_SIZE))()
+
+    ticker_data = get_ticker_data(tickers, stock, batch_size=1)
+    stages = {
+        "get_ticker_data": lambda: get_ticker_data(tickers, stock, batch_size=1),
+        "get_ticker_data_batched": batched(
+            lambda: get_ticker_data(tickers, stock, batch_size=DEFAULT_BATCH_SIZE)
+        ),
+        "calculate_indicators": run_calculate_indicators,
+        "buy_criteria": lambda: daily_losers.buy_criteria(ticker_data),
+        "get_stocks_to_sell": lambda: close_positions.get_stocks_to_sell(
+            market_data=MarketData(stock, logger, batch_size=1)
+        ),
+        "get_stocks_to_sell_batched": batched(
+            lambda: close_positions.get_stocks_to_sell(
+                market_data=MarketData(stock, logger, batch_size=DEFAULT_BATCH_SIZE)
+            )
+        ),
+    }
+
+    results = {}
+    for name, stage in stages.items():
+        seconds, peak = measure(stage, trace_memory)
+        for _ in range(repeat - 1):
+            seconds = min(seconds, measure(stage, trace_memory=False)[0])
+        results[name] = {"seconds": seconds, "peak_bytes": peak}
+    return results
+
+
+def run_benchmarks(ticker_counts, years_list, repeat: int = 1, trace_memory: bool = True) -> dict:
+    """
+    Benchmark every combination of ticker count and history length.
+
+    Returns:
+        dict: Environment metadata and a list of per-case results.
+    """
+    try:
+        version = metadata.version("py-alpaca-daily-losers")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+
+    cases = []
+    for years in years_list:
+        for ticker_count in ticker_counts:
+            stages = bench_case(ticker_count, years, repeat, trace_memory)
+            cases.append({"tickers": ticker_count, "years": years, "stages": stages})
+            print(
+                f"tickers={ticker_count} years={years} "
+                + " ".join(f"{name}={stage['seconds']:.3f}s" for name, stage in stages.items())
+            )
+
+    return {
+        "version": version,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "cases": cases,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickers", type=int, nargs="+", default=DEFAULT_TICKER_COUNTS)
+    parser.add_argument("--years", type=int, nargs="+", default=DEFAULT_YEARS)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the traced peak memory runs."
+    )
+    args = parser.parse_args(argv)
+
+    logging.getLogger("alpaca_daily_losers").setLevel(logging.WARNING)
+    results = run_benchmarks(args.tickers, args.years, args.repeat, not args.no_memory)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+from alpaca_daily_losers.near_duplicates import NearDuplicateIndex, article_text
+
+
+def article_key(article: dict) -> Optional[str]:
+    """
+    Get the id identifying an article across tickers: its id, or its URL.
+    """
+    return article.get("id") or article.get("url")
+
+
+class ArticleRegistry:
+    """
+    A per-run registry sharing one classification of an article across all its tickers.
+
+    News items often mention several symbols, so the same article is fetched for each of
+    them. The first ticker to classify an article owns it; every other ticker reuses the
+    result, waiting for it if the classification is still in flight. The article is
+    classified with all the symbols it was fetched for in its prompt context. Articles
+    without an id or URL are never shared.
+
+    With a `NearDuplicateIndex`, syndicated copies of a story published under other ids and
+    titles are treated as the same article.
+
+    Attributes:
+        near_duplicates (NearDuplicateIndex): Index clustering near-duplicate articles, or
+            None to share only articles with the same id.
+    """
+
+    def __init__(self, near_duplicates: Optional[NearDuplicateIndex] = None):
+        self.near_duplicates = near_duplicates
+        self._results: Dict[str, Future] = {}
+        self._symbols: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, articles: List[dict]) -> None:
+        """
+        Record the symbols the articles were fetched for.
+
+        Args:
+            articles (list): Articles with a `symbol` key.
+        """
+        keys = [self.key(article) for article in articles]
+        with self._lock:
+            for article, key in zip(articles, keys):
+                symbols = self._symbols.setdefault(key, []) if key else None
+                if symbols is not None and article.get("symbol") not in symbols:
+                    symbols.append(article.get("symbol"))
+
+    def symbols(self, article: dict) -> List[str]:
+        """
+        Get the symbols an article was registered for.
+        """
+        key = self.key(article)
+        with self._lock:
+            return list(self._symbols.get(key, [])) if key else [article.get("symbol")]
+
+    def known_sentiments(self, articles: List[dict]) -> List[Optional[str]]:
+        """
+        Get the sentiments already classified in this run.
+
+        Returns:
+            list: The sentiment of each article, or None if it has not been classified yet.
+        """
+        keys = [self.key(article) for article in articles]
+        with self._lock:
+            results = [self._results.get(key) for key in keys]
+        return [
+            (
+                result.result()
+                if result is not None and result.done() and not result.exception()
+                else None
+            )
+            for result in results
+        ]
+
+    def classify(
+        self, articles: List[dict], classify: Callable[[List[dict]], List[str]]
+    ) -> List[str]:
+        """
+        Classify articles, sharing the result of articles classified by other tickers.
+
+        Articles not yet claimed are classified with `classify`, with the symbols of every
+        ticker they were fetched for; the others wait for the owner's result.
+
+        Args:
+            articles (list): Articles with `title`, `symbol` and `content` keys.
+            classify (callable): Classifies a list of articles, e.g.
+                `OpenAIAPI.classify_articles`.
+
+        Returns:
+            list: The sentiment of each article, in the same order as `articles`.
+        """
+        owned, results = [], []
+        keys = [self.key(article) for article in articles]
+        with self._lock:
+            for article, key in zip(articles, keys):
+                result = self._results.get(key) if key else None
+                if result is None:
+                    result = Future()
+                    owned.append((article, result))
+                    if key:
+                        self._results[key] = result
+                results.append(result)
+
+        if owned:
+            try:
+                sentiments = classify([self._with_symbols(article) for article, _ in owned])
+            except Exception as e:
+                for _, result in owned:
+                    result.set_exception(e)
+                raise
+            for (_, result), sentiment in zip(owned, sentiments):
+                result.set_result(sentiment)
+
+        return [result.result() for result in results]
+
+    def key(self, article: dict) -> Optional[str]:
+        """
+        Get the key an article is shared under: the key of its near-duplicate cluster, or
+        its id. Articles without an id or URL have no key.
+        """
+        key = article_key(article)
+        if key is None or self.near_duplicates is None:
+            return key
+        return self.near_duplicates.representative(key, article_text(article))
+
+    def _with_symbols(self, article: dict) -> dict:
+        symbols = self.symbols(article)
+        if len(symbols) < 2:
+            return article
+        return {**article, "symbol": ", ".join(symbol for symbol in symbols if symbol)}
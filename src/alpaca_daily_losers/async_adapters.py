@@ -0,0 +1,205 @@
+import asyncio
+from typing import Callable, List, Optional
+
+import pandas as pd
+from py_alpaca_api import PyAlpacaAPI
+
+from alpaca_daily_losers.global_functions import format_position_message, send_message
+from alpaca_daily_losers.news_fetcher import NewsFetcher
+from alpaca_daily_losers.openai import OpenAIAPI
+from alpaca_daily_losers.portfolio import PortfolioSnapshot
+
+DEFAULT_ALPACA_CONCURRENCY = 8
+DEFAULT_OPENAI_CONCURRENCY = 4
+# A single Slack worker keeps messages in the order they were posted.
+DEFAULT_SLACK_CONCURRENCY = 1
+
+
+class AsyncService:
+    """
+    Runs blocking client calls on worker threads with a per-service concurrency limit.
+
+    The wrapped clients are synchronous, so every call is handed to `asyncio.to_thread` and a
+    semaphore caps how many calls to the same service are in flight at once.
+
+    Attributes:
+        name (str): Name of the external service.
+        limit (int): Maximum number of concurrent calls.
+    """
+
+    def __init__(self, name: str, limit: int):
+        if limit < 1:
+            raise ValueError(f"Concurrency limit for {name} must be at least 1.")
+        self.name = name
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def call(self, function: Callable, *args, **kwargs):
+        """
+        Call a blocking function on a worker thread once a slot is free.
+
+        Args:
+            function (callable): The blocking function.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            The return value of the function.
+        """
+        async with self._semaphore:
+            return await asyncio.to_thread(function, *args, **kwargs)
+
+
+class AsyncAlpaca(AsyncService):
+    """
+    Async adapter around the Alpaca trading and stock clients.
+
+    Attributes:
+        alpaca (PyAlpacaAPI): The wrapped Alpaca client.
+        news (NewsFetcher): Source of news articles, defaults to the Alpaca news client.
+    """
+
+    def __init__(
+        self,
+        alpaca: PyAlpacaAPI,
+        limit: int = DEFAULT_ALPACA_CONCURRENCY,
+        news: Optional[NewsFetcher] = None,
+    ):
+        super().__init__("alpaca", limit)
+        self.alpaca = alpaca
+        self.news = news or alpaca.trading.news
+
+    async def get_positions(self) -> pd.DataFrame:
+        """
+        Get all current positions, including the cash row.
+        """
+        return await self.call(self.alpaca.trading.positions.get_all)
+
+    async def get_portfolio(self) -> PortfolioSnapshot:
+        """
+        Fetch the positions into a portfolio snapshot for the run.
+        """
+        return PortfolioSnapshot(self.alpaca.trading, positions=await self.get_positions())
+
+    async def get_cash(self) -> float:
+        """
+        Get the available cash of the account.
+        """
+        account = await self.call(self.alpaca.trading.account.get)
+        return account.cash
+
+    async def get_news(self, symbol: str, limit: int, content_length: int = 4000) -> List[dict]:
+        """
+        Get recent news articles for a symbol.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            limit (int): Maximum number of articles.
+            content_length (int, optional): Maximum length of each article's content.
+
+        Returns:
+            list: Articles with `title`, `symbol` and `content` keys.
+        """
+        return await self.call(
+            self.news.get_news,
+            symbol=symbol,
+            limit=limit,
+            content_length=content_length,
+        )
+
+
+class AsyncOpenAIAPI(AsyncService):
+    """
+    Async adapter around `OpenAIAPI`.
+
+    Attributes:
+        openai (OpenAIAPI): The wrapped OpenAI client.
+    """
+
+    def __init__(self, openai: OpenAIAPI, limit: int = DEFAULT_OPENAI_CONCURRENCY):
+        super().__init__("openai", limit)
+        self.openai = openai
+
+    async def get_sentiment_analysis(
+        self, title: str, symbol: str, article: str, article_id: Optional[str] = None
+    ) -> str:
+        """
+        Get the sentiment analysis for financial news, see `OpenAIAPI.get_sentiment_analysis`.
+        """
+        return await self.call(
+            self.openai.get_sentiment_analysis,
+            title=title,
+            symbol=symbol,
+            article=article,
+            article_id=article_id,
+        )
+
+    async def get_sentiment_analyses(self, articles: List[dict]) -> List[str]:
+        """
+        Get the sentiment analysis for several articles in one completion, see
+        `OpenAIAPI.get_sentiment_analyses`.
+        """
+        return await self.call(self.openai.get_sentiment_analyses, articles)
+
+
+class AsyncSlack(AsyncService):
+    """
+    Async adapter around `send_message`.
+
+    Messages can be posted in the background so that they overlap with the next stage of a
+    run; `drain` waits for every posted message to be sent.
+    """
+
+    def __init__(self, limit: int = DEFAULT_SLACK_CONCURRENCY):
+        super().__init__("slack", limit)
+        self._pending: List[asyncio.Task] = []
+
+    async def send_message(self, message: str) -> bool:
+        """
+        Send a message and wait for it to be delivered.
+
+        Args:
+            message (str): Message to send.
+
+        Returns:
+            bool: True if the message was sent successfully, False otherwise.
+        """
+        return await self.call(send_message, message)
+
+    def post(self, message: str) -> asyncio.Task:
+        """
+        Send a message in the background.
+
+        Args:
+            message (str): Message to send.
+
+        Returns:
+            asyncio.Task: The task delivering the message.
+        """
+        task = asyncio.create_task(self.send_message(message))
+        self._pending.append(task)
+        return task
+
+    def post_positions(self, positions: list, pos_type: str) -> asyncio.Task:
+        """
+        Send a position message in the background, see `send_position_messages`.
+
+        Args:
+            positions (list): List of position dictionaries.
+            pos_type (str): Type of position ("buy", "sell", or "liquidate").
+
+        Returns:
+            asyncio.Task: The task delivering the message.
+        """
+        return self.post(format_position_message(positions, pos_type))
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for all messages posted so far to be sent.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+        """
+        pending, self._pending = self._pending, []
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
@@ -0,0 +1,206 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+import pandas as pd
+
+BAR_COLUMNS = [
+    "symbol",
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "trade_count",
+    "vwap",
+]
+BAR_DTYPES = {
+    "open": "float",
+    "high": "float",
+    "low": "float",
+    "close": "float",
+    "symbol": "str",
+    "date": "datetime64[ns]",
+    "vwap": "float",
+    "trade_count": "int",
+    "volume": "int",
+}
+DATE_FORMAT = "%Y-%m-%d"
+
+
+class BarCache:
+    """
+    A local SQLite store of OHLCV bars keyed by symbol and timeframe.
+
+    The cache records, per symbol, the requested start date of the first download and the
+    date of the newest stored bar, so callers only need to request the bars that are missing.
+
+    Attributes:
+        path (str): Path to the SQLite database file.
+        timeframe (str): Timeframe of the stored bars, e.g. "1d".
+    """
+
+    def __init__(self, path: str, timeframe: str = "1d"):
+        """
+        Initializes the cache and creates the database schema if needed.
+
+        Args:
+            path (str): Path to the SQLite database file. Parent directories are created.
+            timeframe (str, optional): Timeframe of the stored bars. Defaults to "1d".
+        """
+        self.path = path
+        self.timeframe = timeframe
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS bars (
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume INTEGER,
+                    trade_count INTEGER,
+                    vwap REAL,
+                    PRIMARY KEY (symbol, timeframe, date)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS coverage (
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    start TEXT NOT NULL,
+                    end TEXT NOT NULL,
+                    PRIMARY KEY (symbol, timeframe)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            conn = sqlite3.connect(self.path)
+            try:
+                yield conn
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_coverage(self, symbol: str) -> Optional[Tuple[str, str]]:
+        """
+        Get the date range covered by the cache for a symbol.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+
+        Returns:
+            tuple: The (start, end) dates as "YYYY-MM-DD" strings, or None if the symbol is
+            not cached.
+        """
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT start, end FROM coverage WHERE symbol = ? AND timeframe = ?",
+                (symbol, self.timeframe),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def missing_range(
+        self, symbol: str, start_date: str, end_date: str
+    ) -> Optional[Tuple[str, str]]:
+        """
+        Get the date range that has to be downloaded to serve a request from the cache.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            start_date (str): Requested start date.
+            end_date (str): Requested end date.
+
+        Returns:
+            tuple: The (start, end) range to download, or None if the cache is up to date.
+        """
+        coverage = self.get_coverage(symbol)
+        if coverage is None or coverage[0] > start_date:
+            return start_date, end_date
+
+        if coverage[1] >= end_date:
+            return None
+
+        next_day = datetime.strptime(coverage[1], DATE_FORMAT) + timedelta(days=1)
+        return next_day.strftime(DATE_FORMAT), end_date
+
+    def store(self, symbol: str, bars: pd.DataFrame, start_date: str) -> None:
+        """
+        Insert or replace bars for a symbol and extend its recorded coverage.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            bars (pd.DataFrame): Bars as returned by `History.get_stock_data`.
+            start_date (str): Start date that was requested for these bars.
+        """
+        if bars.empty:
+            return
+
+        rows = bars[BAR_COLUMNS[1:]].astype(object)
+        rows["date"] = pd.to_datetime(rows["date"]).dt.strftime("%Y-%m-%d %H:%M:%S")
+        last_bar_date = rows["date"].max()[:10]
+
+        with self._connection() as conn:
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO bars
+                (symbol, timeframe, date, open, high, low, close, volume, trade_count, vwap)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [(symbol, self.timeframe, *row) for row in rows.itertuples(index=False, name=None)],
+            )
+            coverage = conn.execute(
+                "SELECT start, end FROM coverage WHERE symbol = ? AND timeframe = ?",
+                (symbol, self.timeframe),
+            ).fetchone()
+            if coverage:
+                start_date = min(start_date, coverage[0])
+                last_bar_date = max(last_bar_date, coverage[1])
+            conn.execute(
+                "INSERT OR REPLACE INTO coverage (symbol, timeframe, start, end) "
+                "VALUES (?, ?, ?, ?)",
+                (symbol, self.timeframe, start_date, last_bar_date),
+            )
+
+    def load(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Load cached bars for a symbol within a date range.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            start_date (str): Start date, inclusive.
+            end_date (str): End date, inclusive.
+
+        Returns:
+            pd.DataFrame: Bars with the same columns and dtypes as `History.get_stock_data`.
+        """
+        end_exclusive = datetime.strptime(end_date, DATE_FORMAT) + timedelta(days=1)
+        with self._connection() as conn:
+            bars = pd.read_sql_query(
+                "SELECT symbol, date, open, high, low, close, volume, trade_count, vwap "
+                "FROM bars WHERE symbol = ? AND timeframe = ? AND date >= ? AND date < ? "
+                "ORDER BY date",
+                conn,
+                params=(symbol, self.timeframe, start_date, end_exclusive.strftime(DATE_FORMAT)),
+            )
+        if bars.empty:
+            return pd.DataFrame()
+        return bars.astype(BAR_DTYPES)
@@ -1,24 +1,43 @@
 import logging
-from typing import List
+from typing import List, Optional, Tuple
 
 import pandas as pd
 from py_alpaca_api import Stock, Trading
 
+from alpaca_daily_losers.async_adapters import AsyncAlpaca, AsyncSlack
+from alpaca_daily_losers.bar_cache import BarCache
 from alpaca_daily_losers.global_functions import (
     get_ticker_data,
     send_message,
     send_position_messages,
 )
+from alpaca_daily_losers.indicator_state import IndicatorStateStore
+from alpaca_daily_losers.market_data import MarketData
+from alpaca_daily_losers.order_executor import OrderExecutor
+from alpaca_daily_losers.portfolio import PortfolioSnapshot
 
 
 class ClosePositions:
-    def __init__(self, trading_client: Trading, stock_client: Stock, py_logger: logging.Logger):
+    def __init__(
+        self,
+        trading_client: Trading,
+        stock_client: Stock,
+        py_logger: logging.Logger,
+        bar_cache: Optional[BarCache] = None,
+        state_store: Optional[IndicatorStateStore] = None,
+    ):
         self.trade = trading_client
         self.stock = stock_client
         self.py_logger = py_logger
+        self.bar_cache = bar_cache
+        self.state_store = state_store
 
     def sell_positions_from_criteria(
-        self, stop_loss_percentage: float = 10.0, take_profit_percentage: float = 10.0
+        self,
+        stop_loss_percentage: float = 10.0,
+        take_profit_percentage: float = 10.0,
+        market_data: Optional[MarketData] = None,
+        portfolio: Optional[PortfolioSnapshot] = None,
     ) -> None:
         """
         Sells positions based on the defined sell criteria, including RSI and
@@ -31,53 +50,163 @@ class ClosePositions:
         the `_sell_positions()` method to execute the sell orders and
         sends messages to notify of the sold positions. If no positions meet the
         sell criteria, a message is sent indicating that no sell opportunities were found.
+
+        Args:
+            stop_loss_percentage (float): The stop loss percentage criteria.
+            take_profit_percentage (float): The take profit percentage criteria.
+            market_data (MarketData, optional): Run-scoped market data shared with other stages.
+            portfolio (PortfolioSnapshot, optional): Run-scoped portfolio, updated with the
+                closed positions. Fetched for this call if not given.
+
         Raises:
             Exception: If an error occurs while selling the positions.
         """
         try:
+            portfolio = portfolio or PortfolioSnapshot(self.trade, self.py_logger)
             stocks_to_sell = self.get_stocks_to_sell(
                 stop_loss_percentage=stop_loss_percentage,
                 take_profit_percentage=take_profit_percentage,
+                market_data=market_data,
+                portfolio=portfolio,
             )
             if not stocks_to_sell:
                 send_message("No sell opportunities found.")
                 return
 
-            current_positions = self.trade.positions.get_all()
-            sold_positions = self._sell_positions(stocks_to_sell, current_positions)
+            sold_positions = self._sell_positions(stocks_to_sell, portfolio.positions, portfolio)
             send_position_messages(sold_positions, "sell")
         except Exception as e:
             self.py_logger.error(f"Error selling positions from criteria. Error: {e}")
 
+    async def asell_positions_from_criteria(
+        self,
+        alpaca: AsyncAlpaca,
+        slack: AsyncSlack,
+        stop_loss_percentage: float = 10.0,
+        take_profit_percentage: float = 10.0,
+        market_data: Optional[MarketData] = None,
+        portfolio: Optional[PortfolioSnapshot] = None,
+    ) -> None:
+        """
+        Asynchronous variant of `sell_positions_from_criteria`.
+
+        The positions that meet the sell criteria are closed concurrently by an
+        `OrderExecutor` on a worker thread, and the Slack messages are posted in the
+        background.
+
+        Args:
+            alpaca (AsyncAlpaca): Async adapter around the Alpaca client.
+            slack (AsyncSlack): Async adapter used for Slack messages.
+            stop_loss_percentage (float): The stop loss percentage criteria.
+            take_profit_percentage (float): The take profit percentage criteria.
+            market_data (MarketData, optional): Run-scoped market data shared with other stages.
+            portfolio (PortfolioSnapshot, optional): Run-scoped portfolio, updated with the
+                closed positions. Fetched for this call if not given.
+        """
+        try:
+            portfolio = portfolio or await alpaca.get_portfolio()
+            stocks_to_sell = await alpaca.call(
+                self.get_stocks_to_sell,
+                stop_loss_percentage=stop_loss_percentage,
+                take_profit_percentage=take_profit_percentage,
+                market_data=market_data,
+                portfolio=portfolio,
+            )
+            if not stocks_to_sell:
+                slack.post("No sell opportunities found.")
+                return
+
+            sold_positions = await self._asell_positions(
+                alpaca, slack, stocks_to_sell, portfolio.positions, portfolio
+            )
+            slack.post_positions(sold_positions, "sell")
+        except Exception as e:
+            self.py_logger.error(f"Error selling positions from criteria. Error: {e}")
+
+    async def _asell_positions(
+        self,
+        alpaca: AsyncAlpaca,
+        slack: AsyncSlack,
+        stocks_to_sell: List[str],
+        current_positions: pd.DataFrame,
+        portfolio: Optional[PortfolioSnapshot] = None,
+    ) -> List[dict]:
+        """
+        Asynchronous variant of `_sell_positions`, posting the errors to Slack.
+
+        Returns:
+            list: The sold positions in the order of `stocks_to_sell`.
+        """
+        sold_positions, errors = await alpaca.call(
+            self._close_positions, stocks_to_sell, current_positions, portfolio
+        )
+        for error in errors:
+            slack.post(error)
+        return sold_positions
+
     def _sell_positions(
-        self, stocks_to_sell: List[str], current_positions: pd.DataFrame
+        self,
+        stocks_to_sell: List[str],
+        current_positions: pd.DataFrame,
+        portfolio: Optional[PortfolioSnapshot] = None,
     ) -> List[dict]:
         """
-        Sell positions for the given stocks.
+        Sell positions for the given stocks, closing them concurrently.
 
         Args:
             stocks_to_sell (list): List of symbols for the stocks to sell.
             current_positions (pandas.DataFrame): DataFrame containing the current positions.
+            portfolio (PortfolioSnapshot, optional): Portfolio updated with the closed positions.
 
         Returns:
             list: List of dictionaries representing the sold positions, each containing
             the symbol and quantity.
         """
-        sold_positions = []
+        sold_positions, errors = self._close_positions(stocks_to_sell, current_positions, portfolio)
+        for error in errors:
+            send_message(error)
+        return sold_positions
 
+    def _close_positions(
+        self,
+        stocks_to_sell: List[str],
+        current_positions: pd.DataFrame,
+        portfolio: Optional[PortfolioSnapshot] = None,
+    ) -> Tuple[List[dict], List[str]]:
+        """
+        Close the positions of the given stocks through an `OrderExecutor`.
+
+        Returns:
+            tuple: The sold positions and the error messages of the positions not sold.
+        """
+        positions, errors = [], []
         for symbol in stocks_to_sell:
             try:
                 qty = current_positions.loc[current_positions["symbol"] == symbol, "qty"].values[0]
-                self.trade.positions.close(symbol_or_id=symbol, qty=qty)
-                sold_positions.append({"symbol": symbol, "qty": qty})
+                positions.append({"symbol": symbol, "qty": qty})
             except Exception as e:
                 self.py_logger.warning(f"Could not close {symbol}. Error: {e}")
-                send_message(f"Error selling {symbol}: {e}")
+                errors.append(f"Error selling {symbol}: {e}")
 
-        return sold_positions
+        sold_positions = []
+        results = OrderExecutor(self.trade, self.py_logger).close_positions(positions)
+        for position, result in zip(positions, results):
+            if result.ok:
+                sold_positions.append(position)
+                if portfolio is not None:
+                    portfolio.apply_close(position["symbol"], position["qty"])
+            else:
+                self.py_logger.warning(f"Could not close {result.symbol}. Error: {result.error}")
+                errors.append(f"Error selling {result.symbol}: {result.error}")
+
+        return sold_positions, errors
 
     def get_stocks_to_sell(
-        self, stop_loss_percentage: float = 10.0, take_profit_percentage: float = 10.0
+        self,
+        stop_loss_percentage: float = 10.0,
+        take_profit_percentage: float = 10.0,
+        market_data: Optional[MarketData] = None,
+        portfolio: Optional[PortfolioSnapshot] = None,
     ) -> List[str]:
         """
         Retrieves a list of stocks to sell based on specific criteria.
@@ -85,18 +214,33 @@ class ClosePositions:
         Args:
             stop_loss_percentage (float): The stop loss percentage criteria.
             take_profit_percentage (float): The take profit percentage criteria.
+            market_data (MarketData, optional): Run-scoped market data shared with other stages.
+            portfolio (PortfolioSnapshot, optional): Run-scoped portfolio. The positions are
+                fetched if not given.
 
         Returns:
             list: A list of stocks to sell.
         """
-        current_positions = self.trade.positions.get_all()
+        if portfolio is not None:
+            current_positions = portfolio.positions
+        else:
+            current_positions = self.trade.positions.get_all()
         non_cash_positions = current_positions[current_positions["symbol"] != "Cash"]
 
         if non_cash_positions.empty:
             return []
 
         current_positions_symbols = non_cash_positions["symbol"].tolist()
-        assets_history = get_ticker_data(current_positions_symbols, self.stock, self.py_logger)
+        if market_data is not None:
+            assets_history = market_data.get_ticker_data(current_positions_symbols)
+        else:
+            assets_history = get_ticker_data(
+                current_positions_symbols,
+                self.stock,
+                self.py_logger,
+                bar_cache=self.bar_cache,
+                state_store=self.state_store,
+            )
 
         RSI_COLUMNS = ["rsi14", "rsi30", "rsi50", "rsi200"]
         BBHI_COLUMNS = ["bbhi14", "bbhi30", "bbhi50", "bbhi200"]
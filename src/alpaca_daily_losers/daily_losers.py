@@ -1,18 +1,51 @@
 import logging
 import os
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 from py_alpaca_api import PyAlpacaAPI
 
+from alpaca_daily_losers.article_registry import ArticleRegistry
+from alpaca_daily_losers.async_adapters import (
+    DEFAULT_ALPACA_CONCURRENCY,
+    DEFAULT_OPENAI_CONCURRENCY,
+    DEFAULT_SLACK_CONCURRENCY,
+    AsyncAlpaca,
+    AsyncOpenAIAPI,
+    AsyncSlack,
+)
+from alpaca_daily_losers.bar_cache import BarCache
 from alpaca_daily_losers.close_positions import ClosePositions
+from alpaca_daily_losers.fill_tracker import DEFAULT_FILL_TIMEOUT, FillTracker
 from alpaca_daily_losers.global_functions import (
     get_ticker_data,
     send_message,
     send_position_messages,
 )
+from alpaca_daily_losers.indicator_state import IndicatorStateStore
+from alpaca_daily_losers.lexicon import LexiconClassifier
 from alpaca_daily_losers.liquidate import Liquidate
+from alpaca_daily_losers.market_data import MarketData
+from alpaca_daily_losers.near_duplicates import MinHasher, NearDuplicateIndex
+from alpaca_daily_losers.news_cache import NewsCache
+from alpaca_daily_losers.news_fetcher import NewsFetcher
+from alpaca_daily_losers.news_sentiment import (
+    DEFAULT_SENTIMENT_WORKERS,
+    NewsSentimentEvaluator,
+)
 from alpaca_daily_losers.openai import OpenAIAPI
+from alpaca_daily_losers.order_executor import OrderExecutor
+from alpaca_daily_losers.portfolio import PortfolioSnapshot
+from alpaca_daily_losers.prompt_compaction import (
+    DEFAULT_ARTICLE_TOKEN_BUDGET,
+    PromptCompactor,
+)
+from alpaca_daily_losers.rate_limiter import (
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TOKENS_PER_MINUTE,
+    RateLimiter,
+)
+from alpaca_daily_losers.sentiment_cache import SentimentCache
 from alpaca_daily_losers.statistics import Statistics
 
 # Constants
@@ -22,12 +55,28 @@ DEFAULT_ARTICLE_LIMIT = 4
 DEFAULT_STOP_LOSS_PERCENTAGE = 10.0
 DEFAULT_TAKE_PROFIT_PERCENTAGE = 10.0
 DEFAULT_FUTURE_DAYS = 4
+# Seconds the buy stage waits for its orders to fill, so the run's fill stats include them.
+BUY_FILL_TIMEOUT = DEFAULT_FILL_TIMEOUT
+# Classify the shortest articles first, so undecided votes cost the fewest tokens.
+ARTICLE_ORDER = "length"
 
 # Load environment configuration
 PRODUCTION = os.environ.get("PRODUCTION") == "True"
 API_KEY = os.environ.get("ALPACA_API_KEY")
 API_SECRET = os.environ.get("ALPACA_SECRET_KEY")
 API_PAPER = os.environ.get("ALPACA_PAPER") == "True"
+BAR_CACHE_PATH = os.environ.get("BAR_CACHE_PATH")
+INDICATOR_STATE_PATH = os.environ.get("INDICATOR_STATE_PATH")
+SENTIMENT_CACHE_PATH = os.environ.get("SENTIMENT_CACHE_PATH")
+NEWS_CACHE_PATH = os.environ.get("NEWS_CACHE_PATH")
+LEXICON_PRE_CLASSIFIER = os.environ.get("LEXICON_PRE_CLASSIFIER") == "True"
+OPENAI_REQUESTS_PER_MINUTE = float(
+    os.environ.get("OPENAI_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)
+)
+OPENAI_TOKENS_PER_MINUTE = float(
+    os.environ.get("OPENAI_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)
+)
+ARTICLE_TOKEN_BUDGET = int(os.environ.get("ARTICLE_TOKEN_BUDGET", DEFAULT_ARTICLE_TOKEN_BUDGET))
 
 # Configure logging
 logging.basicConfig(
@@ -40,12 +89,30 @@ logger = logging.getLogger(__name__)
 class DailyLosers:
     def __init__(self):
         self.alpaca = PyAlpacaAPI(api_key=API_KEY, api_secret=API_SECRET, api_paper=API_PAPER)
-        self.liquidate = Liquidate(trading_client=self.alpaca.trading, py_logger=logger)
+        self.bar_cache = BarCache(BAR_CACHE_PATH) if BAR_CACHE_PATH else None
+        self.state_store = (
+            IndicatorStateStore(INDICATOR_STATE_PATH) if INDICATOR_STATE_PATH else None
+        )
+        self.news_cache = NewsCache(NEWS_CACHE_PATH) if NEWS_CACHE_PATH else None
+        self.fill_tracker = FillTracker(self.alpaca.trading, logger)
+        self.liquidate = Liquidate(
+            trading_client=self.alpaca.trading, py_logger=logger, fill_tracker=self.fill_tracker
+        )
         self.close = ClosePositions(
-            trading_client=self.alpaca.trading, stock_client=self.alpaca.stock, py_logger=logger
+            trading_client=self.alpaca.trading,
+            stock_client=self.alpaca.stock,
+            py_logger=logger,
+            bar_cache=self.bar_cache,
+            state_store=self.state_store,
         )
         self.statistics = Statistics(account=self.alpaca.trading.account, py_logger=logger)
-        self.openai = OpenAIAPI()
+        self.openai = OpenAIAPI(
+            sentiment_cache=SentimentCache(SENTIMENT_CACHE_PATH) if SENTIMENT_CACHE_PATH else None,
+            rate_limiter=RateLimiter(OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE),
+            pre_classifier=LexiconClassifier() if LEXICON_PRE_CLASSIFIER else None,
+            prompt_compactor=PromptCompactor(ARTICLE_TOKEN_BUDGET),
+            minhasher=MinHasher(),
+        )
 
     def run(
         self,
@@ -57,50 +124,173 @@ class DailyLosers:
     ):
         """
         Executes the main logic of the program, orchestrating the various components.
+
+        Market data is memoized for the run, so symbols evaluated by the sell stage are not
+        downloaded again by the buy stage. The portfolio is fetched once and updated by each
+        stage with the orders it submitted. The liquidation orders are given time to fill
+        before the buy stage uses the cash they raise.
         """
+        portfolio = PortfolioSnapshot(self.alpaca.trading, logger)
+        market_data = MarketData(
+            stock_client=self.alpaca.stock,
+            py_logger=logger,
+            bar_cache=self.bar_cache,
+            state_store=self.state_store,
+        )
 
         try:
-            self.close.sell_positions_from_criteria(stop_loss_percentage, take_profit_percentage)
+            self.close.sell_positions_from_criteria(
+                stop_loss_percentage,
+                take_profit_percentage,
+                market_data=market_data,
+                portfolio=portfolio,
+            )
         except Exception as e:
             logger.error(f"Error selling positions from criteria: {e}")
 
         try:
-            self.liquidate.liquidate_positions()
+            self.liquidate.liquidate_positions(portfolio=portfolio)
+            self._settle_orders(portfolio)
         except Exception as e:
             logger.error(f"Error liquidating positions for capital: {e}")
 
         try:
-            current_positions = self.alpaca.trading.positions.get_all()
+            if not self.has_cash_for_new_positions(portfolio.positions):
+                return
 
-            cash_row = current_positions[current_positions["symbol"] == "Cash"]
-            total_holdings = current_positions["market_value"].sum()
+            self.check_for_buy_opportunities(
+                buy_limit, article_limit, future_days, market_data=market_data, portfolio=portfolio
+            )
+        except Exception as e:
+            logger.error(f"Error entering new positions: {e}")
+        finally:
+            logger.info(f"Market data cache: {market_data.stats()}")
+            logger.info(f"Sentiment tiers: {self.openai.metrics.stats()}")
+            logger.info(f"Portfolio snapshot version: {portfolio.version}")
+            self.fill_tracker.stop()
+            logger.info(f"Order fills: {self.fill_tracker.stats()}")
 
-            # Check if cash is less than 10% of total holdings
-            if cash_row["market_value"].iloc[0] / total_holdings < 0.1:
-                print(
-                    "Cash is less than 10% of total holdings. Can't open any new positions today."
-                )
-                logger.info(
-                    "Cash is less than 10% of total holdings. \
-                    Can't open any new positions today."
-                )
-                return
+    async def arun(
+        self,
+        buy_limit=DEFAULT_BUY_LIMIT,
+        article_limit=DEFAULT_ARTICLE_LIMIT,
+        stop_loss_percentage=DEFAULT_STOP_LOSS_PERCENTAGE,
+        take_profit_percentage=DEFAULT_TAKE_PROFIT_PERCENTAGE,
+        future_days=DEFAULT_FUTURE_DAYS,
+        alpaca_concurrency=DEFAULT_ALPACA_CONCURRENCY,
+        openai_concurrency=DEFAULT_OPENAI_CONCURRENCY,
+        slack_concurrency=DEFAULT_SLACK_CONCURRENCY,
+    ):
+        """
+        Asynchronous variant of `run`.
+
+        The stages run one after another in the same order as `run`, with the blocking calls
+        of each stage on worker threads: the orders of the sell, liquidation and buy stages are
+        submitted concurrently by an `OrderExecutor`, the liquidation fills are awaited before
+        buying, news and sentiment for candidate tickers are evaluated concurrently and Slack
+        messages are sent in the background.
+
+        Args:
+            alpaca_concurrency (int, optional): Maximum number of concurrent Alpaca calls.
+            openai_concurrency (int, optional): Maximum number of concurrent OpenAI calls.
+            slack_concurrency (int, optional): Maximum number of concurrent Slack messages.
+        """
+        news = self._news_fetcher()
+        alpaca = AsyncAlpaca(self.alpaca, alpaca_concurrency, news=news)
+        openai = AsyncOpenAIAPI(self.openai, openai_concurrency)
+        slack = AsyncSlack(slack_concurrency)
+        market_data = MarketData(
+            stock_client=self.alpaca.stock,
+            py_logger=logger,
+            bar_cache=self.bar_cache,
+            state_store=self.state_store,
+        )
+
+        portfolio = PortfolioSnapshot(self.alpaca.trading, logger)
+
+        try:
+            await alpaca.call(portfolio.refresh)
+            await self.close.asell_positions_from_criteria(
+                alpaca,
+                slack,
+                stop_loss_percentage,
+                take_profit_percentage,
+                market_data=market_data,
+                portfolio=portfolio,
+            )
+        except Exception as e:
+            logger.error(f"Error selling positions from criteria: {e}")
 
-            self.check_for_buy_opportunities(buy_limit, article_limit, future_days)
+        try:
+            await self.liquidate.aliquidate_positions(alpaca, slack, portfolio=portfolio)
+            await alpaca.call(self._settle_orders, portfolio)
+        except Exception as e:
+            logger.error(f"Error liquidating positions for capital: {e}")
+
+        try:
+            positions = await alpaca.call(lambda: portfolio.positions)
+            if self.has_cash_for_new_positions(positions):
+                await self.acheck_for_buy_opportunities(
+                    alpaca,
+                    openai,
+                    slack,
+                    buy_limit,
+                    article_limit,
+                    future_days,
+                    market_data,
+                    portfolio,
+                )
         except Exception as e:
             logger.error(f"Error entering new positions: {e}")
+        finally:
+            news.close()
+            await slack.drain()
+            logger.info(f"Market data cache: {market_data.stats()}")
+            logger.info(f"Sentiment tiers: {self.openai.metrics.stats()}")
+            logger.info(f"Portfolio snapshot version: {portfolio.version}")
+            self.fill_tracker.stop()
+            logger.info(f"Order fills: {self.fill_tracker.stats()}")
+
+    def _settle_orders(self, portfolio: PortfolioSnapshot) -> None:
+        """
+        Wait for the pending orders to fill. If one did not, the portfolio snapshot no longer
+        matches the account and is fetched again at its next use.
+        """
+        unfilled = [fill.symbol for fill in self.fill_tracker.wait() if not fill.filled]
+        if unfilled:
+            logger.info(f"Orders did not fill for {', '.join(unfilled)}, refreshing portfolio.")
+            portfolio.invalidate()
+
+    @staticmethod
+    def has_cash_for_new_positions(current_positions: pd.DataFrame) -> bool:
+        """
+        Check whether cash is at least 10% of total holdings.
+        """
+        cash_row = current_positions[current_positions["symbol"] == "Cash"]
+        total_holdings = current_positions["market_value"].sum()
+
+        if cash_row["market_value"].iloc[0] / total_holdings < 0.1:
+            print("Cash is less than 10% of total holdings. Can't open any new positions today.")
+            logger.info(
+                "Cash is less than 10% of total holdings. \
+                Can't open any new positions today."
+            )
+            return False
+        return True
 
     def check_for_buy_opportunities(
         self,
         buy_limit=DEFAULT_BUY_LIMIT,
         article_limit=DEFAULT_ARTICLE_LIMIT,
         future_days=DEFAULT_FUTURE_DAYS,
+        market_data: Optional[MarketData] = None,
+        portfolio: Optional[PortfolioSnapshot] = None,
     ):
         """
         Checks for buy opportunities based on daily losers and news sentiment.
         """
         try:
-            losers = self.get_daily_losers(future_days)
+            losers = self.get_daily_losers(future_days, market_data=market_data)
             if not losers:
                 print("No buy opportunities found.")
                 logger.info("No buy opportunities found.")
@@ -109,39 +299,160 @@ class DailyLosers:
             tickers = self.filter_tickers_with_news(losers, article_limit, buy_limit)
             if tickers:
                 logger.info(f"Found {len(tickers)} buy opportunities.")
-                self.open_positions(tickers=tickers, ticker_limit=buy_limit)
+                self.open_positions(tickers=tickers, ticker_limit=buy_limit, portfolio=portfolio)
+            else:
+                print("No buy opportunities found.")
+                logger.info("No buy opportunities found.")
+        except Exception as e:
+            logger.error(f"Error checking for buy opportunities: {e}")
+
+    async def acheck_for_buy_opportunities(
+        self,
+        alpaca: AsyncAlpaca,
+        openai: AsyncOpenAIAPI,
+        slack: AsyncSlack,
+        buy_limit=DEFAULT_BUY_LIMIT,
+        article_limit=DEFAULT_ARTICLE_LIMIT,
+        future_days=DEFAULT_FUTURE_DAYS,
+        market_data: Optional[MarketData] = None,
+        portfolio: Optional[PortfolioSnapshot] = None,
+    ):
+        """
+        Asynchronous variant of `check_for_buy_opportunities`.
+        """
+        try:
+            losers = await alpaca.call(self.get_daily_losers, future_days, market_data=market_data)
+            if not losers:
+                print("No buy opportunities found.")
+                logger.info("No buy opportunities found.")
+                return
+
+            tickers = await self.afilter_tickers_with_news(
+                alpaca, openai, losers, article_limit, buy_limit
+            )
+            if tickers:
+                logger.info(f"Found {len(tickers)} buy opportunities.")
+                await self.aopen_positions(
+                    alpaca, slack, tickers=tickers, ticker_limit=buy_limit, portfolio=portfolio
+                )
             else:
                 print("No buy opportunities found.")
                 logger.info("No buy opportunities found.")
         except Exception as e:
             logger.error(f"Error checking for buy opportunities: {e}")
 
-    def open_positions(self, tickers: List[str], ticker_limit=DEFAULT_BUY_LIMIT):
+    async def aopen_positions(
+        self,
+        alpaca: AsyncAlpaca,
+        slack: AsyncSlack,
+        tickers: List[str],
+        ticker_limit=DEFAULT_BUY_LIMIT,
+        portfolio: Optional[PortfolioSnapshot] = None,
+    ):
+        """
+        Asynchronous variant of `open_positions`. The buy orders are submitted concurrently
+        by an `OrderExecutor` on a worker thread.
+        """
+        try:
+            if not tickers:
+                slack.post("No tickers to buy.")
+                return
+
+            if portfolio is not None:
+                available_cash = portfolio.cash
+            else:
+                available_cash = await alpaca.get_cash()
+            notional = (available_cash / len(tickers[:ticker_limit])) - 1
+
+            bought_positions, errors = await alpaca.call(
+                self._submit_buys, tickers[:ticker_limit], notional, portfolio
+            )
+            for error in errors:
+                slack.post(error)
+            slack.post_positions(bought_positions, "buy")
+        except Exception as e:
+            logger.error(f"Error opening positions: {e}")
+
+    def open_positions(
+        self,
+        tickers: List[str],
+        ticker_limit=DEFAULT_BUY_LIMIT,
+        portfolio: Optional[PortfolioSnapshot] = None,
+    ):
         """
         Opens buying orders based on buy opportunities and OpenAI sentiment.
+
+        The orders are submitted concurrently by an `OrderExecutor`. The cash is taken from
+        the run's portfolio snapshot, which is updated with the accepted orders; without a
+        snapshot it is fetched from the account.
         """
         try:
-            available_cash = self.alpaca.trading.account.get().cash
+            if portfolio is not None:
+                available_cash = portfolio.cash
+            else:
+                available_cash = self.alpaca.trading.account.get().cash
             if not tickers:
                 send_message("No tickers to buy.")
                 return
 
             notional = (available_cash / len(tickers[:ticker_limit])) - 1
-            bought_positions = []
-
-            for ticker in tickers[:ticker_limit]:
-                try:
-                    self.alpaca.trading.orders.market(symbol=ticker, notional=notional)
-                    bought_positions.append({"symbol": ticker, "notional": round(notional, 2)})
-                except Exception as e:
-                    logger.warning(f"Error entering new position for {ticker}: {e}")
-                    send_message(f"Error buying {ticker}: {e}")
-                    continue
+            bought_positions, errors = self._submit_buys(
+                tickers[:ticker_limit], notional, portfolio
+            )
+            for error in errors:
+                send_message(error)
 
             send_position_messages(positions=bought_positions, pos_type="buy")
         except Exception as e:
             logger.error(f"Error opening positions: {e}")
 
+    def _submit_buys(
+        self, tickers: List[str], notional: float, portfolio: Optional[PortfolioSnapshot] = None
+    ) -> Tuple[List[dict], List[str]]:
+        """
+        Submit a notional buy order per ticker through an `OrderExecutor`, expecting each to
+        fill at the ticker's latest ask, and wait up to `BUY_FILL_TIMEOUT` for the fills.
+
+        Returns:
+            tuple: The bought positions and the error messages of the orders not accepted.
+        """
+        prices = self._ask_prices(tickers)
+        executor = OrderExecutor(self.alpaca.trading, logger, fill_tracker=self.fill_tracker)
+        results = executor.submit_market_orders(
+            [
+                {"symbol": ticker, "notional": notional, "side": "buy", "price": prices.get(ticker)}
+                for ticker in tickers
+            ],
+            stage="buy",
+        )
+        if self.fill_tracker is not None:
+            self.fill_tracker.wait(BUY_FILL_TIMEOUT)
+        bought_positions, errors = [], []
+        for result in results:
+            if result.ok:
+                bought_positions.append({"symbol": result.symbol, "notional": round(notional, 2)})
+                if portfolio is not None:
+                    portfolio.apply_market_order(result.symbol, notional, "buy")
+            else:
+                logger.warning(f"Error entering new position for {result.symbol}: {result.error}")
+                errors.append(f"Error buying {result.symbol}: {result.error}")
+        return bought_positions, errors
+
+    def _ask_prices(self, tickers: List[str]) -> Dict[str, float]:
+        """
+        Get the latest ask price of each ticker with one quotes request, empty on failure.
+        """
+        if not tickers:
+            return {}
+        try:
+            quotes = self.alpaca.stock.latest_quote.get(list(tickers))
+        except Exception as e:
+            logger.warning(f"Error getting latest quotes for {', '.join(tickers)}: {e}")
+            return {}
+        if not isinstance(quotes, list):
+            quotes = [quotes]
+        return {quote.symbol: quote.ask for quote in quotes if quote.ask}
+
     def update_or_create_watchlist(self, name: str, symbols: List[str]):
         """
         Updates an existing watchlist or creates a new one.
@@ -163,46 +474,103 @@ class DailyLosers:
     ):
         """
         Filters tickers based on news sentiment.
+
+        Candidate tickers are evaluated concurrently, and the first `filter_ticker_limit`
+        tickers with bullish news are kept in their original order. An article fetched for
+        several tickers is classified once.
         """
+        news = self._news_fetcher()
         try:
-            filtered_tickers = []
-            for ticker in tickers:
-                if len(filtered_tickers) >= filter_ticker_limit:
-                    break
-
-                articles = self.alpaca.trading.news.get_news(
-                    symbol=ticker, limit=article_limit, content_length=4000
-                )
-                if len(articles) >= article_limit:
-                    bullish_count = sum(
-                        1
-                        for article in articles
-                        if self.openai.get_sentiment_analysis(
-                            title=article["title"],
-                            symbol=article["symbol"],
-                            article=article["content"],
-                        )
-                        == "BULLISH"
-                    )
-
-                    if bullish_count > len(articles) // 2:
-                        filtered_tickers.append(ticker)
+            evaluator = self._news_evaluator(
+                article_limit, ArticleRegistry(NearDuplicateIndex()), news_client=news
+            )
+            filtered_tickers = evaluator.filter_tickers(tickers, filter_ticker_limit)
 
             self.update_or_create_watchlist(name=WATCHLIST_NAME, symbols=filtered_tickers)
             return self.alpaca.trading.watchlists.get_assets(watchlist_name=WATCHLIST_NAME)
         except Exception as e:
             logger.warning(f"Error filtering tickers with news: {e}")
             return []
+        finally:
+            news.close()
+
+    async def afilter_tickers_with_news(
+        self,
+        alpaca: AsyncAlpaca,
+        openai: AsyncOpenAIAPI,
+        tickers: List[str],
+        article_limit=DEFAULT_ARTICLE_LIMIT,
+        filter_ticker_limit=DEFAULT_BUY_LIMIT,
+    ):
+        """
+        Asynchronous variant of `filter_tickers_with_news`.
 
-    def get_daily_losers(self, future_days=DEFAULT_FUTURE_DAYS):
+        The same `NewsSentimentEvaluator` pipeline selects the tickers, run on a worker thread
+        with one evaluation per OpenAI concurrency slot, so both variants share the story
+        deduplication, cutoff and caching of the sequential version.
+        """
+        try:
+            evaluator = self._news_evaluator(
+                article_limit,
+                ArticleRegistry(NearDuplicateIndex()),
+                news_client=alpaca.news,
+                max_workers=openai.limit,
+            )
+            filtered_tickers = await openai.call(
+                evaluator.filter_tickers, tickers, filter_ticker_limit
+            )
+
+            await alpaca.call(
+                self.update_or_create_watchlist, name=WATCHLIST_NAME, symbols=filtered_tickers
+            )
+            return await alpaca.call(
+                self.alpaca.trading.watchlists.get_assets, watchlist_name=WATCHLIST_NAME
+            )
+        except Exception as e:
+            logger.warning(f"Error filtering tickers with news: {e}")
+            return []
+
+    def _news_evaluator(
+        self,
+        article_limit: int,
+        article_registry: Optional[ArticleRegistry] = None,
+        news_client: Optional[NewsFetcher] = None,
+        max_workers: int = DEFAULT_SENTIMENT_WORKERS,
+    ) -> NewsSentimentEvaluator:
+        return NewsSentimentEvaluator(
+            news_client=news_client or self.alpaca.trading.news,
+            openai=self.openai,
+            py_logger=logger,
+            article_limit=article_limit,
+            max_workers=max_workers,
+            article_order=ARTICLE_ORDER,
+            article_registry=article_registry,
+        )
+
+    def _news_fetcher(self) -> NewsFetcher:
+        """
+        Create the news fetcher of a run, backed by the on-disk news cache if configured.
+        """
+        return NewsFetcher(self.alpaca.trading.news, cache=self.news_cache, py_logger=logger)
+
+    def get_daily_losers(
+        self, future_days=DEFAULT_FUTURE_DAYS, market_data: Optional[MarketData] = None
+    ):
         """
         Get daily losers based on the criteria and predictions.
         """
         try:
             losers = self.alpaca.stock.predictor.get_losers_to_gainers(future_periods=future_days)
-            losers_data = get_ticker_data(
-                tickers=losers, stock_client=self.alpaca.stock, py_logger=logger
-            )
+            if market_data is not None:
+                losers_data = market_data.get_ticker_data(losers)
+            else:
+                losers_data = get_ticker_data(
+                    tickers=losers,
+                    stock_client=self.alpaca.stock,
+                    py_logger=logger,
+                    bar_cache=self.bar_cache,
+                    state_store=self.state_store,
+                )
             return self.buy_criteria(losers_data)
         except Exception as e:
             logger.error(f"Error fetching daily losers: {e}")
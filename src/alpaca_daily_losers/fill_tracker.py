@@ -0,0 +1,337 @@
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import wait as wait_futures
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+from py_alpaca_api.http.requests import Requests
+from py_alpaca_api.trading import Trading
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_FILL_TIMEOUT = 10.0
+ORDERS_PAGE_SIZE = 500
+# Order statuses after which an order no longer changes.
+FINAL_STATUSES = {"filled", "canceled", "expired", "rejected", "done_for_day"}
+
+
+class Fill:
+    """
+    The outcome of a tracked order.
+
+    Attributes:
+        symbol (str): Stock ticker symbol.
+        client_order_id (str): Client order id of the order.
+        side (str): "buy" or "sell".
+        status (str): Last known status of the order, "unknown" if it was never seen.
+        filled_qty (float): Quantity filled.
+        filled_avg_price (float): Average fill price, None if nothing filled.
+        expected_price (float): Price the order was expected to fill at, None if unknown.
+        latency (float): Seconds from submission to the final status, None if not final.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        client_order_id: str,
+        side: str,
+        status: str,
+        filled_qty: float = 0.0,
+        filled_avg_price: Optional[float] = None,
+        expected_price: Optional[float] = None,
+        latency: Optional[float] = None,
+    ):
+        self.symbol = symbol
+        self.client_order_id = client_order_id
+        self.side = side
+        self.status = status
+        self.filled_qty = filled_qty
+        self.filled_avg_price = filled_avg_price
+        self.expected_price = expected_price
+        self.latency = latency
+
+    @property
+    def filled(self) -> bool:
+        return self.status == "filled"
+
+    @property
+    def slippage_bps(self) -> Optional[float]:
+        """
+        The slippage of the fill against the expected price in basis points, positive when
+        the fill was worse than expected. None without a fill or an expected price.
+        """
+        if not self.filled or not self.expected_price or self.filled_avg_price is None:
+            return None
+        slippage = (self.filled_avg_price - self.expected_price) / self.expected_price * 10_000
+        return slippage if self.side == "buy" else -slippage
+
+
+class OrderPollingFeed:
+    """
+    Gets the updates of tracked orders with a single request listing the recent orders of
+    the account.
+
+    Attributes:
+        trade (Trading): Alpaca trading client.
+        page_size (int): Maximum number of orders listed per request.
+    """
+
+    def __init__(self, trading_client: Trading, page_size: int = ORDERS_PAGE_SIZE):
+        self.trade = trading_client
+        self.page_size = page_size
+
+    def poll(self, client_order_ids: Set[str], since: datetime) -> List[dict]:
+        """
+        Get the current state of the tracked orders.
+
+        Args:
+            client_order_ids (set): Client order ids of the tracked orders.
+            since (datetime): Time before the first tracked order was submitted.
+
+        Returns:
+            list: Orders in the format of the Alpaca orders endpoint.
+        """
+        orders = self.trade.orders
+        response = Requests().request(
+            method="GET",
+            url=f"{orders.base_url}/orders",
+            headers=orders.headers,
+            params={
+                "status": "all",
+                "after": since.isoformat(),
+                "limit": self.page_size,
+                "direction": "desc",
+            },
+        )
+        return [
+            order
+            for order in json.loads(response.text)
+            if order.get("client_order_id") in client_order_ids
+        ]
+
+
+class LocalTradeFeed:
+    """
+    A local stand-in for the Alpaca trade updates stream.
+
+    Orders published to the feed are handed to the tracker on its next poll, in the order
+    they were published.
+    """
+
+    def __init__(self):
+        self._orders: queue.Queue = queue.Queue()
+
+    def publish(self, order: dict) -> None:
+        """
+        Publish the updated state of an order.
+
+        Args:
+            order (dict): The order, in the format of the Alpaca orders endpoint.
+        """
+        self._orders.put(order)
+
+    def poll(self, client_order_ids: Set[str], since: datetime) -> List[dict]:
+        """
+        Get the orders of the updates published since the last poll.
+        """
+        orders = []
+        while True:
+            try:
+                order = self._orders.get_nowait()
+            except queue.Empty:
+                return orders
+            if order.get("client_order_id") in client_order_ids:
+                orders.append(order)
+
+
+class _TrackedOrder:
+    def __init__(self, symbol: str, side: str, expected_price: Optional[float], started: float):
+        self.symbol = symbol
+        self.side = side
+        self.expected_price = expected_price
+        self.started = started
+        self.submitted = datetime.now(timezone.utc)
+        self.order: Optional[dict] = None
+        self.future: Future = Future()
+
+
+class FillTracker:
+    """
+    Tracks submitted orders until they reach a final status.
+
+    Each tracked order gets a future resolving to its `Fill`. A background thread polls the
+    feed for the updates of all pending orders at once and stops when no order is pending.
+    The default feed lists the recent orders of the account in one request per poll; any
+    object with the `poll` method of `OrderPollingFeed`, such as a `LocalTradeFeed`, can be
+    used instead.
+
+    Attributes:
+        feed (OrderPollingFeed): Source of order updates.
+        py_logger (logging.Logger): Logger for logging information.
+        poll_interval (float): Seconds between polls.
+    """
+
+    def __init__(
+        self,
+        trading_client: Trading,
+        py_logger: logging.Logger,
+        feed: Optional[OrderPollingFeed] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.feed = feed or OrderPollingFeed(trading_client)
+        self.py_logger = py_logger
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._pending: Dict[str, _TrackedOrder] = {}
+        self._fills: List[Fill] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(
+        self,
+        client_order_id: str,
+        symbol: str,
+        side: str,
+        expected_price: Optional[float] = None,
+    ) -> Future:
+        """
+        Start tracking a submitted order.
+
+        Args:
+            client_order_id (str): Client order id of the order.
+            symbol (str): Stock ticker symbol.
+            side (str): "buy" or "sell".
+            expected_price (float, optional): Price the order is expected to fill at.
+
+        Returns:
+            Future: Resolves to the `Fill` of the order.
+        """
+        with self._lock:
+            if client_order_id not in self._pending:
+                self._pending[client_order_id] = _TrackedOrder(
+                    symbol, side, expected_price, self._clock()
+                )
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+                self._thread.start()
+            return self._pending[client_order_id].future
+
+    def wait(self, timeout: float = DEFAULT_FILL_TIMEOUT) -> List[Fill]:
+        """
+        Wait for the pending orders to reach a final status.
+
+        Orders still pending after `timeout` stop being tracked and resolve with their last
+        known status.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait.
+
+        Returns:
+            list: The fills of the orders that were pending.
+        """
+        with self._lock:
+            futures = [tracked.future for tracked in self._pending.values()]
+        wait_futures(futures, timeout=timeout)
+        self.stop()
+        return [future.result() for future in futures]
+
+    def stop(self) -> List[Fill]:
+        """
+        Stop tracking the pending orders without waiting, resolving them with their last
+        known status.
+
+        Returns:
+            list: The fills of the orders that were pending.
+        """
+        with self._lock:
+            return [self._resolve(client_order_id) for client_order_id in list(self._pending)]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get the fill rate, latency and slippage of the orders tracked so far.
+
+        Orders that stopped being tracked before reaching a final status are only counted as
+        `unresolved`, so they do not count as unfilled.
+
+        Returns:
+            dict: `orders` that reached a final status, `filled`, `unresolved`, median and
+            maximum `latency` in seconds and mean `slippage_bps`.
+        """
+        with self._lock:
+            fills = [fill for fill in self._fills if fill.status in FINAL_STATUSES]
+            unresolved = len(self._fills) - len(fills)
+        latencies = [fill.latency for fill in fills if fill.filled and fill.latency is not None]
+        slippages = [fill.slippage_bps for fill in fills if fill.slippage_bps is not None]
+        return {
+            "orders": len(fills),
+            "filled": sum(fill.filled for fill in fills),
+            "unresolved": unresolved,
+            "latency_p50": round(float(np.median(latencies)), 4) if latencies else 0.0,
+            "latency_max": round(max(latencies), 4) if latencies else 0.0,
+            "slippage_bps": round(float(np.mean(slippages)), 4) if slippages else 0.0,
+        }
+
+    def _poll_loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                client_order_ids = set(self._pending)
+                since = min(tracked.submitted for tracked in self._pending.values())
+
+            try:
+                orders = self.feed.poll(client_order_ids, since - timedelta(minutes=1))
+            except Exception as e:
+                self.py_logger.warning(f"Error polling order updates: {e}")
+                orders = []
+
+            with self._lock:
+                for order in orders:
+                    tracked = self._pending.get(order["client_order_id"])
+                    if tracked is None:
+                        continue
+                    tracked.order = order
+                    if order.get("status") in FINAL_STATUSES:
+                        self._resolve(order["client_order_id"])
+                if not self._pending:
+                    continue
+            time.sleep(self.poll_interval)
+
+    def _resolve(self, client_order_id: str) -> Fill:
+        tracked = self._pending.pop(client_order_id)
+        order = tracked.order or {}
+        status = order.get("status", "unknown")
+        fill = Fill(
+            tracked.symbol,
+            client_order_id,
+            tracked.side,
+            status,
+            filled_qty=float(order.get("filled_qty") or 0.0),
+            filled_avg_price=_to_float(order.get("filled_avg_price")),
+            expected_price=tracked.expected_price,
+            latency=self._latency(tracked, order) if status in FINAL_STATUSES else None,
+        )
+        self._fills.append(fill)
+        tracked.future.set_result(fill)
+        return fill
+
+    def _latency(self, tracked: _TrackedOrder, order: dict) -> float:
+        """
+        Get the latency of an order from the broker's timestamps, or from the local clock
+        if they are missing.
+        """
+        final_at = order.get("filled_at") or order.get("updated_at")
+        if order.get("submitted_at") and final_at:
+            return (pd.Timestamp(final_at) - pd.Timestamp(order["submitted_at"])).total_seconds()
+        return self._clock() - tracked.started
+
+
+def _to_float(value) -> Optional[float]:
+    return None if value is None else float(value)
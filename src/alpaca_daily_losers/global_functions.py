@@ -1,13 +1,25 @@
+import json
 import logging
 import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional
 
 import pandas as pd
 from py_alpaca_api import Stock
+from py_alpaca_api.http.requests import Requests
+from py_alpaca_api.stock.history import History
 from pytz import timezone
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands
 
+from alpaca_daily_losers.bar_cache import BarCache
+from alpaca_daily_losers.indicator_state import IndicatorState, IndicatorStateStore
+from alpaca_daily_losers.indicator_table import IndicatorTable
+from alpaca_daily_losers.indicators import (
+    align_closes,
+    calculate_latest_indicators,
+    calculate_panel_indicators,
+)
 from alpaca_daily_losers.slack import Slack
 
 # Constants
@@ -16,6 +28,9 @@ ctime = datetime.now(tz)
 today = ctime.strftime("%Y-%m-%d")
 previous_day = (ctime - timedelta(days=1)).strftime("%Y-%m-%d")
 year_ago = (ctime - timedelta(days=365)).strftime("%Y-%m-%d")
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_BATCH_SIZE = 100
+BATCH_BAR_LIMIT = 10000
 
 # Environment Variables
 production = os.environ.get("PRODUCTION")
@@ -36,86 +51,420 @@ def calculate_indicators(history: pd.DataFrame, window: int) -> pd.DataFrame:
     Returns:
         df (pd.DataFrame): DataFrame with RSI and Bollinger Band indicators.
     """
-    rsi = RSIIndicator(close=history["close"], window=window).rsi()
-    bb = BollingerBands(close=history["close"], window=window, window_dev=2)
-    history[f"rsi{window}"] = rsi
-    history[f"bbhi{window}"] = bb.bollinger_hband_indicator()
-    history[f"bblo{window}"] = bb.bollinger_lband_indicator()
+    indicators = calculate_panel_indicators(align_closes([history["close"]]), [window])
+    for column, values in indicators.items():
+        history[column] = values[0]
     return history
 
 
 def get_historical_data(
-    stock_client: Stock, ticker: str, start_date: str, end_date: str
+    stock_client: Stock,
+    ticker: str,
+    start_date: str,
+    end_date: str,
+    bar_cache: Optional[BarCache] = None,
 ) -> pd.DataFrame:
     """
     Retrieve historical data for a given ticker.
 
+    When a bar cache is given, cached bars are served first and only the missing date
+    range is requested from the API and appended to the cache.
+
     Args:
         stock_client (Stock): Stock client for retrieving historical data.
         ticker (str): Stock ticker symbol.
         start_date (str): Start date for historical data.
         end_date (str): End date for historical data.
+        bar_cache (BarCache, optional): Local bar store to read from and update.
 
     Returns:
         history (pd.DataFrame): Historical stock data.
     """
+    if bar_cache is None:
+        try:
+            history = stock_client.history.get_stock_data(
+                symbol=ticker, start=start_date, end=end_date
+            )
+            return history
+        except Exception as e:
+            logger.warning(f"Error getting historical data for {ticker}. Error: {e}")
+            return pd.DataFrame()
+
+    missing = bar_cache.missing_range(ticker, start_date, end_date)
+    if missing:
+        try:
+            delta = stock_client.history.get_stock_data(
+                symbol=ticker, start=missing[0], end=missing[1]
+            )
+            bar_cache.store(ticker, delta, missing[0])
+        except Exception as e:
+            if missing[0] == start_date:
+                logger.warning(f"Error getting historical data for {ticker}. Error: {e}")
+                return pd.DataFrame()
+            logger.info(f"No new bars for {ticker} from {missing[0]} to {missing[1]}: {e}")
+
+    return bar_cache.load(ticker, start_date, end_date)
+
+
+def _iter_bar_pages(url: str, headers: dict, params: dict):
+    """
+    Yield the per-symbol bars of each page of a multi-symbol bars response.
+    """
+    session = Requests()
+    page_token = None
+    while True:
+        params["page_token"] = page_token
+        response = json.loads(
+            session.request(method="GET", url=url, headers=headers, params=params).text
+        )
+        yield response.get("bars") or {}
+        page_token = response.get("next_page_token")
+        if not page_token:
+            break
+
+
+def get_batched_historical_data(
+    stock_client: Stock, tickers: List[str], start_date: str, end_date: str
+) -> Dict[str, pd.DataFrame]:
+    """
+    Retrieve daily historical data for several tickers with one multi-symbol bars request.
+
+    Paginated responses are consumed page by page and split back into per-symbol frames
+    with the same layout as `History.get_stock_data`.
+
+    Args:
+        stock_client (Stock): Stock client whose data URL and headers are used.
+        tickers (list): Stock ticker symbols to request together.
+        start_date (str): Start date for historical data.
+        end_date (str): End date for historical data.
+
+    Returns:
+        histories (dict): Historical stock data keyed by symbol. Symbols without bars
+        are omitted.
+    """
+    params = {
+        "symbols": ",".join(tickers),
+        "timeframe": "1Day",
+        "start": start_date,
+        "end": end_date,
+        "limit": BATCH_BAR_LIMIT,
+        "adjustment": "raw",
+        "feed": "sip",
+        "sort": "asc",
+    }
+    url = f"{stock_client.history.data_url}/stocks/bars"
+
+    bars = defaultdict(list)
+    for page in _iter_bar_pages(url, stock_client.history.headers, params):
+        for symbol, symbol_bars in page.items():
+            bars[symbol].extend(symbol_bars)
+
+    return {
+        symbol: History.preprocess_data(symbol_bars, symbol)
+        for symbol, symbol_bars in bars.items()
+        if symbol_bars
+    }
+
+
+def _get_batched_chunk(
+    stock_client: Stock, tickers: List[str], start_date: str, end_date: str
+) -> Dict[str, pd.DataFrame]:
+    """
+    Retrieve the histories of a chunk of tickers with one multi-symbol request.
+
+    Symbols without bars, such as those that are not stocks, are left out of the response.
+    If the request fails, each ticker of the chunk is requested on its own.
+    """
     try:
-        history = stock_client.history.get_stock_data(symbol=ticker, start=start_date, end=end_date)
-        return history
+        return get_batched_historical_data(stock_client, tickers, start_date, end_date)
     except Exception as e:
-        logger.warning(f"Error getting historical data for {ticker}. Error: {e}")
-        return pd.DataFrame()
+        logger.warning(
+            f"Error getting historical data for {', '.join(tickers)}, "
+            f"requesting each ticker on its own. Error: {e}"
+        )
+    histories = {
+        ticker: get_historical_data(stock_client, ticker, start_date, end_date)
+        for ticker in tickers
+    }
+    return {ticker: history for ticker, history in histories.items() if not history.empty}
+
+
+def _get_batched_histories(
+    tickers,
+    stock_client: Stock,
+    max_workers: int,
+    bar_cache: Optional[BarCache],
+    start_dates: Dict[str, str],
+    batch_size: int,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Retrieve histories with multi-symbol requests, grouping tickers by the date range to fetch.
+    """
+    ranges = {}
+    groups = defaultdict(list)
+    for ticker in dict.fromkeys(tickers):
+        start_date = start_dates.get(ticker, year_ago)
+        if bar_cache is None:
+            ranges[ticker] = (start_date, previous_day)
+        else:
+            ranges[ticker] = bar_cache.missing_range(ticker, start_date, previous_day)
+        if ranges[ticker]:
+            groups[ranges[ticker]].append(ticker)
+
+    fetched = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(_get_batched_chunk, stock_client, chunk, *date_range): chunk
+            for date_range, group in groups.items()
+            for chunk in (
+                group[start : start + batch_size] for start in range(0, len(group), batch_size)
+            )
+        }
+        for future in as_completed(futures):
+            try:
+                fetched.update(future.result())
+            except Exception as e:
+                logger.warning(
+                    f"Error getting historical data for {', '.join(futures[future])}. Error: {e}"
+                )
+
+    if bar_cache is None:
+        return {ticker: fetched.get(ticker, pd.DataFrame()) for ticker in ranges}
+
+    for ticker, history in fetched.items():
+        bar_cache.store(ticker, history, ranges[ticker][0])
+    return {
+        ticker: bar_cache.load(ticker, start_dates.get(ticker, year_ago), previous_day)
+        for ticker in ranges
+    }
 
 
-def get_ticker_data(tickers, stock_client: Stock, py_logger=None) -> pd.DataFrame:
+def get_histories(
+    tickers,
+    stock_client: Stock,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    bar_cache: Optional[BarCache] = None,
+    start_dates: Optional[Dict[str, str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[pd.DataFrame]:
+    """
+    Retrieve historical data for given tickers on a bounded thread pool.
+
+    Tickers are requested in multi-symbol batches of `batch_size`; with a batch size of 1
+    each ticker is requested on its own. A failure for one request is logged and does not
+    affect the others, and the tickers of a failed batch are requested one by one.
+
+    Args:
+        tickers (list): List of stock ticker symbols.
+        stock_client (Stock): Stock client for retrieving historical data.
+        max_workers (int, optional): Maximum number of histories fetched concurrently.
+            Use 1 to fetch sequentially.
+        bar_cache (BarCache, optional): Local bar store consulted before the API.
+        start_dates (dict, optional): Start date per ticker. Defaults to a year ago.
+        batch_size (int, optional): Maximum number of symbols per bars request.
+
+    Returns:
+        histories (list): Non-empty histories in the same order as `tickers`.
+    """
+    if batch_size > 1:
+        histories = _get_batched_histories(
+            tickers, stock_client, max_workers, bar_cache, start_dates or {}, batch_size
+        )
+        return [histories[ticker] for ticker in tickers if not histories[ticker].empty]
+
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            executor.submit(
+                get_historical_data,
+                stock_client,
+                ticker,
+                (start_dates or {}).get(ticker, year_ago),
+                previous_day,
+                bar_cache,
+            ): (position, ticker)
+            for position, ticker in enumerate(tickers)
+        }
+        for future in as_completed(futures):
+            position, ticker = futures[future]
+            try:
+                results[position] = future.result()
+            except Exception as e:
+                logger.error(f"Unhandled exception processing {ticker}. Error: {e}")
+
+    return [results[position] for position in sorted(results) if not results[position].empty]
+
+
+def get_ticker_data(
+    tickers,
+    stock_client: Stock,
+    py_logger=None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    bar_cache: Optional[BarCache] = None,
+    state_store: Optional[IndicatorStateStore] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> pd.DataFrame:
     """
     Retrieve historical data for given tickers and compute technical indicators.
 
+    See `get_indicator_table` for how histories are fetched and indicators computed.
+
     Args:
         tickers (list): List of stock ticker symbols.
         stock_client (Stock): Stock client for retrieving historical data.
         py_logger (logging.Logger, optional): Logger for logging warnings and errors.
+        max_workers (int, optional): Maximum number of histories fetched concurrently.
+            Use 1 to fetch sequentially.
+        bar_cache (BarCache, optional): Local bar store consulted before the API.
+        state_store (IndicatorStateStore, optional): Persisted per-symbol indicator states.
+        batch_size (int, optional): Maximum number of symbols per bars request.
 
     Returns:
-        df_tech (pd.DataFrame): DataFrame with the latest technical indicators for each ticker.
+        df_tech (pd.DataFrame): DataFrame with the symbol and latest technical indicators for
+        each ticker, in the same order as `tickers`.
     """
-    df_tech = []
+    table = get_indicator_table(
+        tickers, stock_client, max_workers, bar_cache, state_store, batch_size
+    )
+    return table.to_pandas()
+
+
+def get_indicator_table(
+    tickers,
+    stock_client: Stock,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    bar_cache: Optional[BarCache] = None,
+    state_store: Optional[IndicatorStateStore] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> IndicatorTable:
+    """
+    Retrieve historical data for given tickers and compute their latest indicators.
 
-    for ticker in tickers:
+    Histories are fetched concurrently, then the latest indicators for all tickers and windows
+    are computed in one vectorized pass over the aligned close prices. Only the final value of
+    each indicator is evaluated, since screening only uses the latest bar. When a state store is
+    given, indicators are advanced incrementally instead, see `get_incremental_indicator_table`.
 
-        try:
-            history = get_historical_data(stock_client, ticker, year_ago, previous_day)
-            if history.empty:
-                continue
-            for window in [14, 30, 50, 200]:
-                history = calculate_indicators(history, window)
-
-            df_tech_temp = history.tail(1)
-            df_tech.append(df_tech_temp)
-        except KeyError as ke:
-            logger.warning(f"KeyError processing indicators for {ticker}. Error: {ke}")
-        except Exception as e:
-            logger.error(f"Unhandled exception processing {ticker}. Error: {e}")
+    Args:
+        tickers (list): List of stock ticker symbols.
+        stock_client (Stock): Stock client for retrieving historical data.
+        max_workers (int, optional): Maximum number of histories fetched concurrently.
+        bar_cache (BarCache, optional): Local bar store consulted before the API.
+        state_store (IndicatorStateStore, optional): Persisted per-symbol indicator states.
+        batch_size (int, optional): Maximum number of symbols per bars request.
+
+    Returns:
+        IndicatorTable: Latest indicators for every ticker with available history.
+    """
+    if state_store is not None:
+        return get_incremental_indicator_table(
+            tickers, stock_client, state_store, max_workers, bar_cache, batch_size
+        )
+
+    histories = get_histories(tickers, stock_client, max_workers, bar_cache, batch_size=batch_size)
+    return calculate_indicator_table(tickers, histories)
+
+
+def calculate_indicator_table(tickers, histories: List[pd.DataFrame]) -> IndicatorTable:
+    """
+    Compute the latest technical indicators for already retrieved histories.
+
+    Args:
+        tickers (list): Stock ticker symbols the table is sized for.
+        histories (list): Historical stock data, one DataFrame per ticker.
+
+    Returns:
+        IndicatorTable: Latest indicators for every history.
+    """
+    table = IndicatorTable(tickers)
+    valid = []
+    for history in histories:
+        if "close" not in history:
+            logger.warning(f"KeyError processing indicators. Columns: {list(history.columns)}")
             continue
+        valid.append(history)
 
-    if df_tech:
-        df_tech = pd.concat([x for x in df_tech if not x.empty], axis=0)
-    else:
-        df_tech = pd.DataFrame()
+    if valid:
+        indicators = calculate_latest_indicators(align_closes([h["close"] for h in valid]))
+        table.extend([history["symbol"].iloc[-1] for history in valid], indicators)
 
-    return df_tech
+    return table
 
 
-def send_position_messages(positions: list, pos_type: str):
+def get_incremental_indicator_table(
+    tickers,
+    stock_client: Stock,
+    state_store: IndicatorStateStore,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    bar_cache: Optional[BarCache] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> IndicatorTable:
     """
-    Sends position messages based on the type of position.
+    Compute the latest technical indicators by advancing persisted per-symbol states.
+
+    Symbols with a stored state only request bars from the state's last bar onwards, so a
+    daily update applies a single new bar per symbol. Symbols without a state, or whose new
+    bars do not start at the state's last bar, are seeded from a year of history.
+
+    Args:
+        tickers (list): List of stock ticker symbols.
+        stock_client (Stock): Stock client for retrieving historical data.
+        state_store (IndicatorStateStore): Persisted per-symbol indicator states.
+        max_workers (int, optional): Maximum number of histories fetched concurrently.
+        bar_cache (BarCache, optional): Local bar store consulted before the API.
+        batch_size (int, optional): Maximum number of symbols per bars request.
+
+    Returns:
+        IndicatorTable: Latest indicators for every ticker with available history.
+    """
+    states = state_store.get_many(tickers)
+    start_dates = {symbol: state.last_date for symbol, state in states.items()}
+    histories = {
+        history["symbol"].iloc[-1]: history
+        for history in get_histories(
+            tickers, stock_client, max_workers, bar_cache, start_dates, batch_size
+        )
+    }
+
+    # A state whose last bar does not start the new bars cannot be advanced from them, so
+    # the symbol is seeded again from a year of history.
+    stale = [
+        symbol
+        for symbol, history in histories.items()
+        if symbol in states
+        and history["date"].iloc[0].strftime("%Y-%m-%d") != states[symbol].last_date
+    ]
+    if stale:
+        logger.info(f"Reseeding indicator states of {stale} from a year of history")
+        for symbol in stale:
+            del histories[symbol], states[symbol]
+        for history in get_histories(stale, stock_client, max_workers, bar_cache, None, batch_size):
+            histories[history["symbol"].iloc[-1]] = history
+
+    table = IndicatorTable(tickers)
+    updated = []
+    for symbol in [symbol for symbol in tickers if symbol in histories]:
+        history = histories[symbol]
+        state = states.get(symbol) or IndicatorState(symbol)
+        state.update_from_history(history)
+        updated.append(state)
+        table.append(symbol, state.indicators())
+
+    state_store.put_many(updated)
+    return table
+
+
+def format_position_message(positions: list, pos_type: str) -> str:
+    """
+    Builds the message reporting the positions of an order stage.
 
     Args:
         positions (list): List of position dictionaries.
         pos_type (str): Type of position ("buy", "sell", or "liquidate").
 
     Returns:
-        bool: True if message was sent successfully, False otherwise.
+        str: The message text.
     """
     position_names = {
         "sell": "sold",
@@ -141,7 +490,21 @@ def send_position_messages(positions: list, pos_type: str):
             else:
                 position_message += f"{position_name} {qty} shares of {symbol}\n"
 
-    return send_message(position_message)
+    return position_message
+
+
+def send_position_messages(positions: list, pos_type: str):
+    """
+    Sends position messages based on the type of position.
+
+    Args:
+        positions (list): List of position dictionaries.
+        pos_type (str): Type of position ("buy", "sell", or "liquidate").
+
+    Returns:
+        bool: True if message was sent successfully, False otherwise.
+    """
+    return send_message(format_position_message(positions, pos_type))
 
 
 def send_message(message: str):
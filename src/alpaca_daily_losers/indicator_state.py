@@ -0,0 +1,269 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from alpaca_daily_losers.indicators import BOLLINGER_WINDOW_DEV, INDICATOR_WINDOWS
+
+# Rolling sums are recomputed from the ring buffer this often to bound floating point drift.
+RESYNC_INTERVAL = 250
+# Stay below SQLite's limit on the number of query parameters.
+QUERY_CHUNK_SIZE = 500
+
+
+class IndicatorState:
+    """
+    Incremental RSI and Bollinger Band state for a single symbol.
+
+    Each call to `update` advances Wilder's average gain/loss and the rolling sums of every
+    window in O(1). The last `max(windows)` closes are kept in a ring buffer so values can be
+    dropped from the rolling windows. Values match a full recomputation from the first bar
+    the state has seen.
+
+    Attributes:
+        symbol (str): Stock ticker symbol.
+        windows (list): Indicator windows.
+        last_date (str): Date of the newest bar applied, as "YYYY-MM-DD".
+        count (int): Number of bars applied.
+    """
+
+    def __init__(self, symbol: str, windows: List[int] = INDICATOR_WINDOWS):
+        self.symbol = symbol
+        self.windows = list(windows)
+        self.last_date = None
+        self.last_close = None
+        self.count = 0
+        self.avg_gain = {window: 0.0 for window in self.windows}
+        self.avg_loss = {window: 0.0 for window in self.windows}
+        self.sums = {window: 0.0 for window in self.windows}
+        self.squares = {window: 0.0 for window in self.windows}
+        self.closes = deque(maxlen=max(self.windows))
+
+    def update(self, close: float, date: Optional[str] = None) -> None:
+        """
+        Apply a new bar to the state.
+
+        Args:
+            close (float): Close price of the bar.
+            date (str, optional): Date of the bar as "YYYY-MM-DD".
+        """
+        change = close - self.last_close if self.last_close is not None else 0.0
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+
+        for window in self.windows:
+            alpha = 1.0 / window
+            if self.count == 0:
+                self.avg_gain[window] = gain
+                self.avg_loss[window] = loss
+            else:
+                self.avg_gain[window] = (1 - alpha) * self.avg_gain[window] + alpha * gain
+                self.avg_loss[window] = (1 - alpha) * self.avg_loss[window] + alpha * loss
+
+            self.sums[window] += close
+            self.squares[window] += close * close
+            if len(self.closes) >= window:
+                dropped = self.closes[-window]
+                self.sums[window] -= dropped
+                self.squares[window] -= dropped * dropped
+
+        self.closes.append(close)
+        self.last_close = close
+        self.count += 1
+        if date is not None:
+            self.last_date = date
+
+        if self.count % RESYNC_INTERVAL == 0:
+            self._resync()
+
+    def _resync(self) -> None:
+        closes = list(self.closes)
+        for window in self.windows:
+            values = closes[-window:]
+            self.sums[window] = math.fsum(values)
+            self.squares[window] = math.fsum(value * value for value in values)
+
+    def update_from_history(self, history: pd.DataFrame) -> int:
+        """
+        Apply every bar of a history that is newer than the state's last bar.
+
+        Args:
+            history (pd.DataFrame): Historical stock data with `date` and `close` columns.
+
+        Returns:
+            int: Number of bars applied.
+        """
+        dates = pd.to_datetime(history["date"]).dt.strftime("%Y-%m-%d")
+        applied = 0
+        for date, close in zip(dates, history["close"]):
+            if self.last_date is not None and date <= self.last_date:
+                continue
+            self.update(float(close), date)
+            applied += 1
+        return applied
+
+    def rsi(self, window: int) -> float:
+        """
+        Get the current RSI for a window.
+
+        Args:
+            window (int): RSI window.
+
+        Returns:
+            float: The RSI, or NaN during warm-up.
+        """
+        if self.count < window:
+            return math.nan
+        if self.avg_loss[window] == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain[window] / self.avg_loss[window])
+
+    def bollinger(self, window: int, window_dev: float = BOLLINGER_WINDOW_DEV) -> tuple:
+        """
+        Get the current Bollinger Band high and low indicators for a window.
+
+        Args:
+            window (int): Bollinger window.
+            window_dev (float, optional): Number of standard deviations for the bands.
+
+        Returns:
+            tuple: High and low band indicators, 1.0 when the last close is outside the band.
+        """
+        if self.count < window:
+            return 0.0, 0.0
+        mean = self.sums[window] / window
+        std = math.sqrt(max(self.squares[window] / window - mean * mean, 0.0))
+        hband = 1.0 if self.last_close > mean + window_dev * std else 0.0
+        lband = 1.0 if self.last_close < mean - window_dev * std else 0.0
+        return hband, lband
+
+    def indicators(self) -> Dict[str, float]:
+        """
+        Get the current indicator values.
+
+        Returns:
+            dict: Values keyed by `rsi{window}`, `bbhi{window}` and `bblo{window}`.
+        """
+        values = {}
+        for window in self.windows:
+            hband, lband = self.bollinger(window)
+            values[f"rsi{window}"] = self.rsi(window)
+            values[f"bbhi{window}"] = hband
+            values[f"bblo{window}"] = lband
+        return values
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the state to a JSON compatible dictionary.
+        """
+        return {
+            "symbol": self.symbol,
+            "windows": self.windows,
+            "last_date": self.last_date,
+            "last_close": self.last_close,
+            "count": self.count,
+            "avg_gain": [self.avg_gain[window] for window in self.windows],
+            "avg_loss": [self.avg_loss[window] for window in self.windows],
+            "closes": list(self.closes),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IndicatorState":
+        """
+        Restore a state serialized with `to_dict`.
+        """
+        state = cls(data["symbol"], data["windows"])
+        state.last_date = data["last_date"]
+        state.last_close = data["last_close"]
+        state.count = data["count"]
+        state.avg_gain = dict(zip(state.windows, data["avg_gain"]))
+        state.avg_loss = dict(zip(state.windows, data["avg_loss"]))
+        state.closes.extend(data["closes"])
+        state._resync()
+        return state
+
+
+class IndicatorStateStore:
+    """
+    A local SQLite store of `IndicatorState` objects keyed by symbol.
+
+    Attributes:
+        path (str): Path to the SQLite database file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the store and creates the database schema if needed.
+
+        Args:
+            path (str): Path to the SQLite database file. Parent directories are created.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS indicator_state (
+                    symbol TEXT PRIMARY KEY,
+                    last_date TEXT,
+                    state TEXT NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            conn = sqlite3.connect(self.path)
+            try:
+                yield conn
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_many(self, symbols: Iterable[str]) -> Dict[str, IndicatorState]:
+        """
+        Load the stored states for the given symbols.
+
+        Args:
+            symbols (list): Stock ticker symbols.
+
+        Returns:
+            dict: States keyed by symbol. Symbols without a stored state are omitted.
+        """
+        symbols = list(symbols)
+        rows = []
+        with self._connection() as conn:
+            for start in range(0, len(symbols), QUERY_CHUNK_SIZE):
+                chunk = symbols[start : start + QUERY_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows += conn.execute(
+                    f"SELECT symbol, state FROM indicator_state WHERE symbol IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+        return {symbol: IndicatorState.from_dict(json.loads(state)) for symbol, state in rows}
+
+    def put_many(self, states: Iterable[IndicatorState]) -> None:
+        """
+        Insert or replace the given states.
+
+        Args:
+            states (list): States to persist.
+        """
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO indicator_state (symbol, last_date, state) "
+                "VALUES (?, ?, ?)",
+                [(state.symbol, state.last_date, json.dumps(state.to_dict())) for state in states],
+            )
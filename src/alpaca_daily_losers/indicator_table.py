@@ -0,0 +1,99 @@
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from alpaca_daily_losers.indicators import INDICATOR_WINDOWS
+
+
+class IndicatorTable:
+    """
+    Compact columnar container for the latest indicator values of a ticker list.
+
+    Columns are preallocated NumPy arrays sized to the ticker count: float32 RSI values,
+    int8 Bollinger Band flags and an int32 index into `symbols` for each filled row. Rows are
+    filled in place, in any order, and `to_pandas` returns them in ticker order.
+
+    Attributes:
+        symbols (list): Ticker symbols the table was sized for.
+        windows (list): Indicator windows.
+        size (int): Number of filled rows.
+    """
+
+    def __init__(self, symbols: Sequence[str], windows: List[int] = INDICATOR_WINDOWS):
+        self.symbols = list(symbols)
+        self.windows = list(windows)
+        self.size = 0
+        self._positions = {symbol: position for position, symbol in enumerate(self.symbols)}
+
+        capacity = len(self.symbols)
+        self.symbol_index = np.empty(capacity, dtype=np.int32)
+        self.rsi = np.empty((len(self.windows), capacity), dtype=np.float32)
+        self.bbhi = np.empty((len(self.windows), capacity), dtype=np.int8)
+        self.bblo = np.empty((len(self.windows), capacity), dtype=np.int8)
+
+    def append(self, symbol: str, values: Dict[str, float]) -> None:
+        """
+        Fill the next row with the indicator values of one symbol.
+
+        Args:
+            symbol (str): Ticker symbol, must be one of `symbols`.
+            values (dict): Values keyed by `rsi{window}`, `bbhi{window}` and `bblo{window}`.
+        """
+        row = self.size
+        self.symbol_index[row] = self._positions[symbol]
+        for position, window in enumerate(self.windows):
+            self.rsi[position, row] = values[f"rsi{window}"]
+            self.bbhi[position, row] = values[f"bbhi{window}"]
+            self.bblo[position, row] = values[f"bblo{window}"]
+        self.size += 1
+
+    def extend(self, symbols: Sequence[str], indicators: Dict[str, np.ndarray]) -> None:
+        """
+        Fill the next rows with indicator arrays for several symbols at once.
+
+        Args:
+            symbols (list): Ticker symbols, each one of `symbols`.
+            indicators (dict): Arrays aligned with `symbols`, as returned by
+                `calculate_latest_indicators`.
+        """
+        rows = slice(self.size, self.size + len(symbols))
+        self.symbol_index[rows] = [self._positions[symbol] for symbol in symbols]
+        for position, window in enumerate(self.windows):
+            self.rsi[position, rows] = indicators[f"rsi{window}"]
+            self.bbhi[position, rows] = indicators[f"bbhi{window}"]
+            self.bblo[position, rows] = indicators[f"bblo{window}"]
+        self.size += len(symbols)
+
+    def rows(self) -> Iterator[Tuple[str, Dict[str, float]]]:
+        """
+        Iterate over the filled rows in ticker order.
+
+        Yields:
+            tuple: The symbol and its indicator values.
+        """
+        for row in np.argsort(self.symbol_index[: self.size], kind="stable"):
+            values = {}
+            for position, window in enumerate(self.windows):
+                values[f"rsi{window}"] = float(self.rsi[position, row])
+                values[f"bbhi{window}"] = int(self.bbhi[position, row])
+                values[f"bblo{window}"] = int(self.bblo[position, row])
+            yield self.symbols[self.symbol_index[row]], values
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        Build a DataFrame of the filled rows for the buy and sell filters.
+
+        Returns:
+            pd.DataFrame: A `symbol` column followed by the indicator columns, in ticker order.
+        """
+        if not self.size:
+            return pd.DataFrame()
+
+        order = np.argsort(self.symbol_index[: self.size], kind="stable")
+        data = {"symbol": np.asarray(self.symbols, dtype=object)[self.symbol_index[order]]}
+        for position, window in enumerate(self.windows):
+            data[f"rsi{window}"] = self.rsi[position, order]
+            data[f"bbhi{window}"] = self.bbhi[position, order]
+            data[f"bblo{window}"] = self.bblo[position, order]
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,253 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+INDICATOR_WINDOWS = [14, 30, 50, 200]
+BOLLINGER_WINDOW_DEV = 2
+
+
+def align_closes(closes: Sequence[pd.Series]) -> np.ndarray:
+    """
+    Align close series of different lengths into one 2-D panel.
+
+    Each series is right-aligned so that the last column holds every ticker's latest close,
+    and shorter series are padded with NaN on the left.
+
+    Args:
+        closes (list): Close price series, one per ticker, in chronological order.
+
+    Returns:
+        np.ndarray: Array of shape (tickers, bars).
+    """
+    length = max((len(close) for close in closes), default=0)
+    panel = np.full((len(closes), length), np.nan)
+    for row, close in enumerate(closes):
+        if len(close):
+            panel[row, length - len(close) :] = np.asarray(close, dtype=float)
+    return panel
+
+
+def _first_valid_index(closes: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(closes)
+    return np.where(valid.any(axis=1), valid.argmax(axis=1), closes.shape[1])
+
+
+def rsi_panel(closes: np.ndarray, windows: Sequence[int] = INDICATOR_WINDOWS) -> np.ndarray:
+    """
+    Calculate Wilder's RSI for every ticker and window in one pass over the bars.
+
+    Matches `ta.momentum.RSIIndicator` with `fillna=False`: the first `window - 1` bars of
+    each ticker are NaN.
+
+    Args:
+        closes (np.ndarray): Close panel of shape (tickers, bars), see `align_closes`.
+        windows (list, optional): RSI windows.
+
+    Returns:
+        np.ndarray: RSI values of shape (windows, tickers, bars).
+    """
+    tickers, bars = closes.shape
+    diff = np.diff(closes, axis=1, prepend=np.nan)
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+
+    alpha = 1.0 / np.asarray(windows, dtype=float)[:, None]
+    avg_up = np.empty((len(windows), tickers, bars))
+    avg_down = np.empty((len(windows), tickers, bars))
+    if bars:
+        avg_up[:, :, 0] = up[:, 0]
+        avg_down[:, :, 0] = down[:, 0]
+    for bar in range(1, bars):
+        avg_up[:, :, bar] = (1 - alpha) * avg_up[:, :, bar - 1] + alpha * up[:, bar]
+        avg_down[:, :, bar] = (1 - alpha) * avg_down[:, :, bar - 1] + alpha * down[:, bar]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_down == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_up / avg_down))
+
+    observed = np.arange(bars) - _first_valid_index(closes)[:, None] + 1
+    warm = observed[None, :, :] >= np.asarray(windows)[:, None, None]
+    return np.where(warm, rsi, np.nan)
+
+
+def rolling_mean_std(closes: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the rolling mean and population standard deviation along the bar axis.
+
+    Windows that contain a NaN produce NaN, like a pandas rolling window with
+    `min_periods=window`.
+
+    Args:
+        closes (np.ndarray): Close panel of shape (tickers, bars).
+        window (int): Rolling window length.
+
+    Returns:
+        tuple: Rolling mean and standard deviation, each of shape (tickers, bars).
+    """
+    tickers, bars = closes.shape
+    mean = np.full((tickers, bars), np.nan)
+    std = np.full((tickers, bars), np.nan)
+    if bars < window:
+        return mean, std
+
+    # Shift each row by its latest close to keep the running sums well conditioned.
+    shift = closes[:, -1:]
+    shift = np.where(np.isnan(shift), 0.0, shift)
+    valid = ~np.isnan(closes)
+    centered = np.where(valid, closes - shift, 0.0)
+
+    def window_sums(values):
+        cumulative = np.cumsum(values, axis=1)
+        cumulative = np.concatenate([np.zeros((tickers, 1)), cumulative], axis=1)
+        return cumulative[:, window:] - cumulative[:, :-window]
+
+    counts = window_sums(valid.astype(float))
+    sums = window_sums(centered)
+    squares = window_sums(centered**2)
+
+    window_mean = sums / window
+    variance = np.maximum(squares / window - window_mean**2, 0.0)
+    full = counts == window
+    mean[:, window - 1 :] = np.where(full, window_mean + shift, np.nan)
+    std[:, window - 1 :] = np.where(full, np.sqrt(variance), np.nan)
+    return mean, std
+
+
+def bollinger_panel(
+    closes: np.ndarray, window: int, window_dev: float = BOLLINGER_WINDOW_DEV
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate Bollinger Band high and low indicators for every ticker.
+
+    Matches `ta.volatility.BollingerBands.bollinger_hband_indicator` and
+    `bollinger_lband_indicator`: 1.0 when the close is outside the band, else 0.0.
+
+    Args:
+        closes (np.ndarray): Close panel of shape (tickers, bars).
+        window (int): Bollinger window.
+        window_dev (float, optional): Number of standard deviations for the bands.
+
+    Returns:
+        tuple: High and low band indicators, each of shape (tickers, bars).
+    """
+    mean, std = rolling_mean_std(closes, window)
+    with np.errstate(invalid="ignore"):
+        hband = np.where(closes > mean + window_dev * std, 1.0, 0.0)
+        lband = np.where(closes < mean - window_dev * std, 1.0, 0.0)
+    return hband, lband
+
+
+def calculate_panel_indicators(
+    closes: np.ndarray, windows: List[int] = INDICATOR_WINDOWS
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate RSI and Bollinger Band indicators for all tickers and windows.
+
+    Args:
+        closes (np.ndarray): Close panel of shape (tickers, bars), see `align_closes`.
+        windows (list, optional): Indicator windows.
+
+    Returns:
+        dict: Arrays of shape (tickers, bars) keyed by `rsi{window}`, `bbhi{window}` and
+        `bblo{window}`, in the column order used by `calculate_indicators`.
+    """
+    rsi = rsi_panel(closes, windows)
+    indicators = {}
+    for position, window in enumerate(windows):
+        hband, lband = bollinger_panel(closes, window)
+        indicators[f"rsi{window}"] = rsi[position]
+        indicators[f"bbhi{window}"] = hband
+        indicators[f"bblo{window}"] = lband
+    return indicators
+
+
+def latest_rsi(closes: np.ndarray, windows: Sequence[int] = INDICATOR_WINDOWS) -> np.ndarray:
+    """
+    Calculate only the final Wilder's RSI value for every ticker and window.
+
+    The averages are advanced over the whole history for warm-up, but only the running
+    averages are kept instead of the full series.
+
+    Args:
+        closes (np.ndarray): Close panel of shape (tickers, bars), see `align_closes`.
+        windows (list, optional): RSI windows.
+
+    Returns:
+        np.ndarray: RSI values of shape (windows, tickers).
+    """
+    tickers, bars = closes.shape
+    if not bars:
+        return np.full((len(windows), tickers), np.nan)
+
+    diff = np.diff(closes, axis=1, prepend=np.nan)
+    up = np.where(diff > 0, diff, 0.0)
+    down = np.where(diff < 0, -diff, 0.0)
+
+    alpha = 1.0 / np.asarray(windows, dtype=float)[:, None]
+    avg_up = np.repeat(up[None, :, 0], len(windows), axis=0)
+    avg_down = np.repeat(down[None, :, 0], len(windows), axis=0)
+    for bar in range(1, bars):
+        avg_up = (1 - alpha) * avg_up + alpha * up[:, bar]
+        avg_down = (1 - alpha) * avg_down + alpha * down[:, bar]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_down == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_up / avg_down))
+
+    observed = bars - _first_valid_index(closes)
+    warm = observed[None, :] >= np.asarray(windows)[:, None]
+    return np.where(warm, rsi, np.nan)
+
+
+def latest_bollinger(
+    closes: np.ndarray, window: int, window_dev: float = BOLLINGER_WINDOW_DEV
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate only the final Bollinger Band high and low indicators for every ticker.
+
+    Args:
+        closes (np.ndarray): Close panel of shape (tickers, bars), see `align_closes`.
+        window (int): Bollinger window.
+        window_dev (float, optional): Number of standard deviations for the bands.
+
+    Returns:
+        tuple: High and low band indicators, each of shape (tickers,).
+    """
+    tickers, bars = closes.shape
+    if bars < window:
+        return np.zeros(tickers), np.zeros(tickers)
+
+    recent = closes[:, -window:]
+    mean = recent.mean(axis=1)
+    std = recent.std(axis=1)
+    last = closes[:, -1]
+    with np.errstate(invalid="ignore"):
+        hband = np.where(last > mean + window_dev * std, 1.0, 0.0)
+        lband = np.where(last < mean - window_dev * std, 1.0, 0.0)
+    return hband, lband
+
+
+def calculate_latest_indicators(
+    closes: np.ndarray, windows: List[int] = INDICATOR_WINDOWS
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate the latest RSI and Bollinger Band indicators for all tickers and windows.
+
+    This is the screening path: it returns the same values as the last column of
+    `calculate_panel_indicators` without materializing the full indicator series.
+
+    Args:
+        closes (np.ndarray): Close panel of shape (tickers, bars), see `align_closes`.
+        windows (list, optional): Indicator windows.
+
+    Returns:
+        dict: Arrays of shape (tickers,) keyed by `rsi{window}`, `bbhi{window}` and
+        `bblo{window}`.
+    """
+    rsi = latest_rsi(closes, windows)
+    indicators = {}
+    for position, window in enumerate(windows):
+        hband, lband = latest_bollinger(closes, window)
+        indicators[f"rsi{window}"] = rsi[position]
+        indicators[f"bbhi{window}"] = hband
+        indicators[f"bblo{window}"] = lband
+    return indicators
@@ -0,0 +1,192 @@
+import re
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+# Financial terms that signal the direction of a news story. Terms are matched as whole,
+# lower-cased words; ambiguous words such as "risk" or "record" are left out on purpose.
+POSITIVE_TERMS = (
+    "beat",
+    "beats",
+    "surge",
+    "surges",
+    "surged",
+    "soar",
+    "soars",
+    "soared",
+    "rally",
+    "rallies",
+    "rallied",
+    "upgrade",
+    "upgraded",
+    "upgrades",
+    "outperform",
+    "outperforms",
+    "bullish",
+    "raises",
+    "raised",
+    "exceeds",
+    "exceeded",
+    "strong",
+    "growth",
+    "profit",
+    "profitable",
+    "gain",
+    "gains",
+    "jump",
+    "jumps",
+    "jumped",
+    "buyback",
+    "approval",
+    "approved",
+    "breakthrough",
+    "expands",
+    "expansion",
+    "upside",
+    "overweight",
+)
+NEGATIVE_TERMS = (
+    "miss",
+    "misses",
+    "missed",
+    "plunge",
+    "plunges",
+    "plunged",
+    "tumble",
+    "tumbles",
+    "tumbled",
+    "slump",
+    "slumps",
+    "downgrade",
+    "downgraded",
+    "downgrades",
+    "underperform",
+    "bearish",
+    "cuts",
+    "lowered",
+    "weak",
+    "loss",
+    "losses",
+    "decline",
+    "declines",
+    "declined",
+    "fall",
+    "falls",
+    "fell",
+    "lawsuit",
+    "investigation",
+    "fraud",
+    "bankruptcy",
+    "layoffs",
+    "recall",
+    "halted",
+    "downside",
+    "underweight",
+    "warning",
+)
+# Titles of announcements with no bearing on the outlook of the stock.
+BOILERPLATE_PATTERNS = (
+    "to present at",
+    "to participate in",
+    "conference call",
+    "webcast",
+    "annual meeting",
+    "declares quarterly dividend",
+    "to report",
+    "to announce",
+)
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+class LexiconClassifier:
+    """
+    A local financial-lexicon sentiment classifier used before the LLM.
+
+    Each article is scored by counting positive and negative terms in its title and content:
+    the score is `(positive - negative) / (positive + negative)`. Only articles with enough
+    term hits and a clear score are labelled, and articles without any term whose title
+    announces an earnings date or a conference appearance are labelled NEUTRAL. Every other
+    article is left unresolved so it can be escalated to the LLM.
+
+    Attributes:
+        threshold (float): Minimum absolute score of a BULLISH or BEARISH label.
+        min_hits (int): Minimum number of term hits of a BULLISH or BEARISH label.
+    """
+
+    def __init__(
+        self,
+        positive: Iterable[str] = POSITIVE_TERMS,
+        negative: Iterable[str] = NEGATIVE_TERMS,
+        threshold: float = 0.6,
+        min_hits: int = 4,
+        boilerplate: Iterable[str] = BOILERPLATE_PATTERNS,
+    ):
+        positive, negative = set(positive), set(negative)
+        self.vocabulary = {term: index for index, term in enumerate(sorted(positive | negative))}
+        self.weights = np.array(
+            [
+                (term in positive) - (term in negative)
+                for term in sorted(self.vocabulary, key=self.vocabulary.get)
+            ],
+            dtype=np.int64,
+        )
+        self.threshold = threshold
+        self.min_hits = min_hits
+        self.boilerplate = tuple(pattern.lower() for pattern in boilerplate)
+
+    def score(self, texts: List[str]) -> tuple:
+        """
+        Score texts against the lexicon.
+
+        Args:
+            texts (list): Texts to score.
+
+        Returns:
+            tuple: Arrays of the score in [-1, 1] and of the number of term hits per text.
+        """
+        rows, columns = [], []
+        for row, text in enumerate(texts):
+            for word in WORD_PATTERN.findall(text.lower()):
+                column = self.vocabulary.get(word)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+
+        counts = np.zeros((len(texts), len(self.vocabulary)), dtype=np.int64)
+        np.add.at(counts, (np.array(rows, dtype=np.int64), np.array(columns, dtype=np.int64)), 1)
+        signed = counts * self.weights
+        hits = np.abs(signed).sum(axis=1)
+        scores = np.divide(
+            signed.sum(axis=1), hits, out=np.zeros(len(texts), dtype=float), where=hits > 0
+        )
+        return scores, hits
+
+    def classify(self, articles: List[dict]) -> List[Optional[str]]:
+        """
+        Label the articles the lexicon is confident about.
+
+        Args:
+            articles (list): Articles with `title` and `content` keys.
+
+        Returns:
+            list: "BULLISH", "BEARISH" or "NEUTRAL" per article, or None where the article
+            is ambiguous and should be classified by the LLM.
+        """
+        texts = [f"{a.get('title') or ''}\n{a.get('content') or ''}" for a in articles]
+        scores, hits = self.score(texts)
+
+        labels = []
+        for article, score, hit_count in zip(articles, scores, hits):
+            if hit_count >= self.min_hits and score >= self.threshold:
+                labels.append("BULLISH")
+            elif hit_count >= self.min_hits and score <= -self.threshold:
+                labels.append("BEARISH")
+            elif hit_count == 0 and self._is_boilerplate(article.get("title") or ""):
+                labels.append("NEUTRAL")
+            else:
+                labels.append(None)
+        return labels
+
+    def _is_boilerplate(self, title: str) -> bool:
+        title = title.lower()
+        return any(pattern in title for pattern in self.boilerplate)
@@ -1,18 +1,83 @@
 import logging
+from typing import Callable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from py_alpaca_api.trading import Trading
 
+from alpaca_daily_losers.async_adapters import AsyncAlpaca, AsyncSlack
+from alpaca_daily_losers.fill_tracker import FillTracker
 from alpaca_daily_losers.global_functions import send_message, send_position_messages
+from alpaca_daily_losers.order_executor import OrderExecutor
+from alpaca_daily_losers.portfolio import PortfolioSnapshot
 
 LIQUIDATE_PERCENTAGE = 1.0
+# Smallest notional order the broker accepts.
+MIN_ORDER_NOTIONAL = 1.0
+
+
+def allocate_cash(
+    market_values: np.ndarray, cash_needed: float, min_notional: float = MIN_ORDER_NOTIONAL
+) -> np.ndarray:
+    """
+    Split the cash needed across positions in proportion to their market value.
+
+    The allocation is made in cents with the largest remainder method, so the amounts add up
+    to the cash needed exactly. No position is allocated more than its market value, and
+    positions whose share would be below `min_notional` are left out, the smallest first,
+    with their share going to the larger positions. The amounts fall short of the cash needed
+    only if the positions cannot raise it.
+
+    Args:
+        market_values (np.ndarray): Market value of each position.
+        cash_needed (float): Amount of cash to raise.
+        min_notional (float, optional): Smallest amount sold of a position.
+
+    Returns:
+        np.ndarray: Amount to sell of each position, in dollars rounded to cents, 0 for
+        positions not sold.
+    """
+    values = np.round(np.clip(np.asarray(market_values, dtype=float), 0, None) * 100)
+    amounts = np.zeros(len(values))
+    target = round(max(cash_needed, 0.0) * 100)
+    if not len(values) or target < min_notional * 100:
+        return amounts
+
+    # Positions from the largest: with the k largest sold, the smallest of them gets the
+    # smallest share, which decreases with k.
+    order = np.argsort(-values, kind="stable")
+    sorted_values = values[order]
+    totals = np.cumsum(sorted_values)
+    targets = np.minimum(target, totals)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        smallest_shares = np.where(totals > 0, targets * sorted_values / totals, 0.0)
+    count = int(np.count_nonzero(smallest_shares >= min_notional * 100))
+    if not count:
+        return amounts
+
+    selected = order[:count]
+    target = min(target, totals[count - 1])
+    shares = target * values[selected] / totals[count - 1]
+    cents = np.minimum(np.floor(shares), values[selected])
+    shortfall = int(target - cents.sum())
+    remainders = np.where(cents < values[selected], shares - cents, -1.0)
+    cents[np.argsort(-remainders, kind="stable")[:shortfall]] += 1
+
+    amounts[selected] = cents / 100
+    return amounts
 
 
 class Liquidate:
 
-    def __init__(self, trading_client: Trading, py_logger: logging.Logger):
+    def __init__(
+        self,
+        trading_client: Trading,
+        py_logger: logging.Logger,
+        fill_tracker: Optional[FillTracker] = None,
+    ):
         self.trade = trading_client
         self.py_logger = py_logger
+        self.fill_tracker = fill_tracker
 
     @staticmethod
     def calculate_cash_needed(total_holdings: float, cash_row: pd.DataFrame) -> float:
@@ -46,7 +111,7 @@ class Liquidate:
 
         return non_cash_positions.iloc[: len(non_cash_positions)]
 
-    def liquidate_positions(self) -> None:
+    def liquidate_positions(self, portfolio: Optional[PortfolioSnapshot] = None) -> None:
         """
         Liquidates positions to make cash 10% of the portfolio.
 
@@ -55,61 +120,163 @@ class Liquidate:
         in the current positions and calculates the amount of cash needed to meet the
         requirement. It then sells the necessary amount of shares for each top performer.
 
+        Parameters:
+            portfolio (PortfolioSnapshot, optional): Run-scoped portfolio, updated with the
+                liquidation orders. Fetched for this call if not given.
+
         Returns:
             None
         """
-        current_positions = self.trade.positions.get_all()
+        portfolio = portfolio or PortfolioSnapshot(self.trade, self.py_logger)
+        targets = self._get_liquidation_targets(portfolio.positions, self._send_liquidation_message)
+        if targets is None:
+            return
 
-        if current_positions[current_positions["symbol"] != "Cash"].empty:
-            self._send_liquidation_message("No positions available to liquidate for capital")
+        sold_positions = self._sell_top_performers(*targets, portfolio=portfolio)
+        send_position_messages(sold_positions, "liquidate")
+
+    async def aliquidate_positions(
+        self,
+        alpaca: AsyncAlpaca,
+        slack: AsyncSlack,
+        portfolio: Optional[PortfolioSnapshot] = None,
+    ) -> None:
+        """
+        Asynchronous variant of `liquidate_positions`.
+
+        The liquidation orders are submitted concurrently by an `OrderExecutor` on a worker
+        thread, and the Slack messages are posted in the background.
+
+        Args:
+            alpaca (AsyncAlpaca): Async adapter around the Alpaca client.
+            slack (AsyncSlack): Async adapter used for Slack messages.
+            portfolio (PortfolioSnapshot, optional): Run-scoped portfolio, updated with the
+                liquidation orders. Fetched for this call if not given.
+        """
+        portfolio = portfolio or await alpaca.get_portfolio()
+        targets = self._get_liquidation_targets(portfolio.positions, slack.post)
+        if targets is None:
             return
 
+        sold_positions, errors = await alpaca.call(
+            self._submit_liquidation, *targets, portfolio=portfolio
+        )
+        for error in errors:
+            slack.post(error)
+        slack.post_positions(sold_positions, "liquidate")
+
+    def _get_liquidation_targets(
+        self, current_positions: pd.DataFrame, notify: Callable[[str], object]
+    ) -> Optional[Tuple[pd.DataFrame, float]]:
+        """
+        Determine which top performers to sell and how much cash is needed.
+
+        Parameters:
+            current_positions (pd.DataFrame): DataFrame containing the current positions.
+            notify (callable): Called with a message when there is nothing to liquidate.
+
+        Returns:
+            tuple: The top performers and the cash needed, or None if no liquidation is
+            required or possible.
+        """
+        if current_positions[current_positions["symbol"] != "Cash"].empty:
+            notify("No positions available to liquidate for capital")
+            return None
+
         cash_row = current_positions[current_positions["symbol"] == "Cash"]
         total_holdings = current_positions["market_value"].sum()
 
         # Check if cash is less than 10% of total holdings
-        if cash_row["market_value"].iloc[0] / total_holdings < 0.1:
-            top_performers = self.get_top_performers(current_positions)
-            if top_performers.empty:
-                self._send_liquidation_message("No top performers found to liquidate for capital")
-                return
-            top_performers_market_value = top_performers["market_value"].sum()
-            cash_needed = self.calculate_cash_needed(total_holdings, cash_row)
-            sold_positions = self._sell_top_performers(
-                top_performers, top_performers_market_value, cash_needed
-            )
-            send_position_messages(sold_positions, "liquidate")
+        if cash_row["market_value"].iloc[0] / total_holdings >= 0.1:
+            return None
+
+        top_performers = self.get_top_performers(current_positions)
+        if top_performers.empty:
+            notify("No top performers found to liquidate for capital")
+            return None
+
+        cash_needed = self.calculate_cash_needed(total_holdings, cash_row)
+        return top_performers, cash_needed
+
+    @staticmethod
+    def _liquidation_amounts(
+        top_performers: pd.DataFrame, cash_needed: float
+    ) -> Iterator[Tuple[str, float]]:
+        """
+        Split the cash needed across the top performers by market value, see `allocate_cash`.
+
+        Yields:
+            tuple: The symbol and the amount to sell, skipping positions not sold.
+        """
+        amounts = allocate_cash(top_performers["market_value"].to_numpy(dtype=float), cash_needed)
+        sold = amounts > 0
+        yield from zip(top_performers["symbol"].to_numpy()[sold].tolist(), amounts[sold].tolist())
 
     def _sell_top_performers(
-        self, top_performers: pd.DataFrame, top_performers_market_value: float, cash_needed: float
+        self,
+        top_performers: pd.DataFrame,
+        cash_needed: float,
+        portfolio: Optional[PortfolioSnapshot] = None,
     ) -> list:
         """
-        Sells positions of top performers to liquidate the required cash.
+        Sells positions of top performers to liquidate the required cash, submitting the
+        orders concurrently.
 
         Parameters:
             top_performers (pd.DataFrame): DataFrame containing top performer positions.
-            top_performers_market_value (float): The total market value of top performers.
             cash_needed (float): The amount of cash needed to be liquidated.
+            portfolio (PortfolioSnapshot, optional): Portfolio updated with the sold amounts.
 
         Returns:
             list: List of sold positions with their details.
         """
-        sold_positions = []
-        for _, row in top_performers.iterrows():
-            amount_to_sell = int((row["market_value"] / top_performers_market_value) * cash_needed)
-            if amount_to_sell == 0:
-                continue
+        sold_positions, errors = self._submit_liquidation(top_performers, cash_needed, portfolio)
+        for error in errors:
+            self._send_liquidation_message(error)
+        return sold_positions
+
+    def _submit_liquidation(
+        self,
+        top_performers: pd.DataFrame,
+        cash_needed: float,
+        portfolio: Optional[PortfolioSnapshot] = None,
+    ) -> Tuple[list, List[str]]:
+        """
+        Submit the liquidation orders through an `OrderExecutor`.
 
-            try:
-                self.trade.orders.market(symbol=row["symbol"], notional=amount_to_sell, side="sell")
+        Returns:
+            tuple: The sold positions and the error messages of the orders not accepted.
+        """
+        prices = {}
+        if "current_price" in top_performers.columns:
+            prices = dict(zip(top_performers["symbol"], top_performers["current_price"]))
+        orders = [
+            {
+                "symbol": symbol,
+                "notional": amount_to_sell,
+                "side": "sell",
+                "price": prices.get(symbol),
+            }
+            for symbol, amount_to_sell in self._liquidation_amounts(top_performers, cash_needed)
+        ]
+        executor = OrderExecutor(self.trade, self.py_logger, fill_tracker=self.fill_tracker)
+        results = executor.submit_market_orders(orders, stage="liquidate")
+
+        sold_positions, errors = [], []
+        for order, result in zip(orders, results):
+            if result.ok:
                 sold_positions.append(
-                    {"symbol": row["symbol"], "notional": round(amount_to_sell, 2)}
+                    {"symbol": order["symbol"], "notional": round(order["notional"], 2)}
                 )
-            except Exception as e:
-                self.py_logger.warning(f"Error liquidating position {row['symbol']}. Error: {e}")
-                self._send_liquidation_message(f"Error selling {row['symbol']}: {e}")
+                if portfolio is not None:
+                    portfolio.apply_market_order(order["symbol"], order["notional"], "sell")
+            else:
+                self.py_logger.warning(
+                    f"Error liquidating position {order['symbol']}. Error: {result.error}"
+                )
+                errors.append(f"Error selling {order['symbol']}: {result.error}")
 
-        return sold_positions
+        return sold_positions, errors
 
     @staticmethod
     def _send_liquidation_message(message: str):
@@ -0,0 +1,152 @@
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+from py_alpaca_api import Stock
+
+from alpaca_daily_losers.bar_cache import BarCache
+from alpaca_daily_losers.global_functions import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_WORKERS,
+    calculate_indicator_table,
+    get_histories,
+    get_incremental_indicator_table,
+)
+from alpaca_daily_losers.indicator_state import IndicatorStateStore
+from alpaca_daily_losers.indicator_table import IndicatorTable
+
+
+class MarketData:
+    """
+    Run-scoped market data context shared by the sell and buy stages.
+
+    Histories and latest indicator rows are memoized per symbol for the lifetime of the
+    object, so a symbol that is both held and a daily loser is only downloaded and evaluated
+    once per run. Hit and miss counts are tracked for both.
+
+    Attributes:
+        stock (Stock): Stock client for retrieving historical data.
+        py_logger (logging.Logger): Logger for logging information.
+        bar_cache (BarCache): Optional local bar store consulted before the API.
+        state_store (IndicatorStateStore): Optional persisted per-symbol indicator states.
+    """
+
+    def __init__(
+        self,
+        stock_client: Stock,
+        py_logger: logging.Logger,
+        bar_cache: Optional[BarCache] = None,
+        state_store: Optional[IndicatorStateStore] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.stock = stock_client
+        self.py_logger = py_logger
+        self.bar_cache = bar_cache
+        self.state_store = state_store
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self._histories: Dict[str, pd.DataFrame] = {}
+        self._rows: Dict[str, Optional[Dict[str, float]]] = {}
+        self._counts = {"history_hits": 0, "history_misses": 0, "row_hits": 0, "row_misses": 0}
+        self._lock = threading.Lock()
+
+    def _split(self, tickers: List[str], memo: dict, kind: str) -> List[str]:
+        unique = list(dict.fromkeys(tickers))
+        missing = [ticker for ticker in unique if ticker not in memo]
+        self._counts[f"{kind}_hits"] += len(unique) - len(missing)
+        self._counts[f"{kind}_misses"] += len(missing)
+        return missing
+
+    def get_histories(self, tickers: List[str]) -> List[pd.DataFrame]:
+        """
+        Get a year of historical data for the given tickers, fetching only unseen symbols.
+
+        Args:
+            tickers (list): List of stock ticker symbols.
+
+        Returns:
+            histories (list): Non-empty histories in the same order as `tickers`.
+        """
+        with self._lock:
+            missing = self._split(tickers, self._histories, "history")
+            if missing:
+                fetched = get_histories(
+                    missing,
+                    self.stock,
+                    self.max_workers,
+                    self.bar_cache,
+                    batch_size=self.batch_size,
+                )
+                by_symbol = {history["symbol"].iloc[-1]: history for history in fetched}
+                for ticker in missing:
+                    self._histories[ticker] = by_symbol.get(ticker, pd.DataFrame())
+            return [
+                self._histories[ticker] for ticker in tickers if not self._histories[ticker].empty
+            ]
+
+    def get_indicator_table(self, tickers: List[str]) -> IndicatorTable:
+        """
+        Get the latest technical indicators for the given tickers.
+
+        Only symbols not seen earlier in the run are evaluated.
+
+        Args:
+            tickers (list): List of stock ticker symbols.
+
+        Returns:
+            IndicatorTable: Latest indicators for every ticker with available history.
+        """
+        with self._lock:
+            missing = self._split(tickers, self._rows, "row")
+
+        if missing:
+            if self.state_store is not None:
+                evaluated = get_incremental_indicator_table(
+                    missing,
+                    self.stock,
+                    self.state_store,
+                    self.max_workers,
+                    self.bar_cache,
+                    self.batch_size,
+                )
+            else:
+                evaluated = calculate_indicator_table(missing, self.get_histories(missing))
+
+            with self._lock:
+                self._rows.update(dict.fromkeys(missing))
+                self._rows.update(evaluated.rows())
+
+        table = IndicatorTable(tickers)
+        with self._lock:
+            for ticker in dict.fromkeys(tickers):
+                if self._rows[ticker] is not None:
+                    table.append(ticker, self._rows[ticker])
+        return table
+
+    def get_ticker_data(self, tickers: List[str]) -> pd.DataFrame:
+        """
+        Get the latest technical indicators for the given tickers as a DataFrame.
+
+        Drop-in replacement for `global_functions.get_ticker_data` that only evaluates
+        symbols not seen earlier in the run.
+
+        Args:
+            tickers (list): List of stock ticker symbols.
+
+        Returns:
+            df_tech (pd.DataFrame): DataFrame with the symbol and latest technical indicators
+            for each ticker, in the same order as `tickers`.
+        """
+        return self.get_indicator_table(tickers).to_pandas()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the memoization hit and miss counts.
+
+        Returns:
+            dict: Counts keyed by `history_hits`, `history_misses`, `row_hits` and `row_misses`.
+        """
+        with self._lock:
+            return dict(self._counts)
@@ -0,0 +1,165 @@
+import hashlib
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 5
+# Estimated Jaccard similarity from which two articles are treated as the same story.
+DEFAULT_SIMILARITY_THRESHOLD = 0.7
+MERSENNE_PRIME = (1 << 31) - 1
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def article_text(article: dict) -> str:
+    """
+    Get the text compared between articles: the content, or the title if there is none.
+    """
+    return article.get("content") or article.get("title") or ""
+
+
+class MinHasher:
+    """
+    Computes MinHash signatures of word shingles and their LSH band keys.
+
+    Two signatures agree in a position with a probability equal to the Jaccard similarity of
+    the shingle sets. Signatures are split into `bands` bands; articles sharing a band key
+    are candidates for a near-duplicate, which is confirmed by comparing the signatures.
+
+    Attributes:
+        num_perm (int): Number of hash permutations, i.e. the signature length.
+        bands (int): Number of LSH bands, must divide `num_perm`.
+        shingle_size (int): Number of consecutive words per shingle.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 1,
+    ):
+        if num_perm % bands:
+            raise ValueError("The number of bands must divide the number of permutations.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, MERSENNE_PRIME, num_perm, dtype=np.int64)
+        self._b = generator.integers(0, MERSENNE_PRIME, num_perm, dtype=np.int64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Get the MinHash signature of a text.
+
+        Args:
+            text (str): Text to hash.
+
+        Returns:
+            np.ndarray: The signature, or None if the text has no words.
+        """
+        words = WORD_PATTERN.findall(text.lower())
+        if not words:
+            return None
+        size = min(self.shingle_size, len(words))
+        shingles = {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.int64,
+            count=len(shingles),
+        )
+        hashes %= MERSENNE_PRIME
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def band_keys(self, signature: np.ndarray) -> List[str]:
+        """
+        Get the LSH band keys of a signature.
+        """
+        rows = self.num_perm // self.bands
+        keys = []
+        for band in range(self.bands):
+            digest = hashlib.sha1(signature[band * rows : (band + 1) * rows].tobytes())
+            keys.append(f"{band}:{digest.hexdigest()}")
+        return keys
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """
+        Estimate the Jaccard similarity of the texts of two signatures.
+        """
+        return float(np.mean(first == second))
+
+
+class NearDuplicateIndex:
+    """
+    An in-memory LSH index clustering near-duplicate articles, such as syndicated copies of
+    one wire story published under different ids and titles.
+
+    Each article is assigned to the cluster of the first indexed article it is similar to,
+    and that article's key represents the cluster.
+
+    Attributes:
+        hasher (MinHasher): Computes signatures and band keys.
+        threshold (float): Minimum estimated similarity of two articles in one cluster.
+    """
+
+    def __init__(
+        self,
+        hasher: Optional[MinHasher] = None,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ):
+        self.hasher = hasher or MinHasher()
+        self.threshold = threshold
+        self._representatives: Dict[str, str] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def representative(self, key: str, text: str) -> str:
+        """
+        Index an article and get the key representing its cluster.
+
+        Args:
+            key (str): Id of the article.
+            text (str): Text of the article.
+
+        Returns:
+            str: Key of the first indexed article of the cluster.
+        """
+        with self._lock:
+            if key in self._representatives:
+                return self._representatives[key]
+
+        signature = self.hasher.signature(text)
+        if signature is None:
+            with self._lock:
+                return self._representatives.setdefault(key, key)
+        band_keys = self.hasher.band_keys(signature)
+
+        with self._lock:
+            if key in self._representatives:
+                return self._representatives[key]
+            match = self._find_similar(signature, band_keys)
+            representative = match[0] if match else key
+            self._representatives[key] = representative
+            if representative == key:
+                self._signatures[key] = signature
+                for band_key in band_keys:
+                    self._buckets.setdefault(band_key, []).append(key)
+            return representative
+
+    def _find_similar(
+        self, signature: np.ndarray, band_keys: List[str]
+    ) -> Optional[Tuple[str, float]]:
+        best = None
+        for band_key in band_keys:
+            for candidate in self._buckets.get(band_key, []):
+                similarity = self.hasher.similarity(signature, self._signatures[candidate])
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (candidate, similarity)
+        return best
@@ -0,0 +1,165 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+DEFAULT_REFRESH_INTERVAL = 15 * 60
+DEFAULT_RETENTION = 7 * 24 * 60 * 60
+ARTICLE_FIELDS = ("url", "title", "source", "content", "publish_date")
+
+
+class NewsCache:
+    """
+    A local SQLite store of news articles keyed by symbol.
+
+    The articles of a symbol's last fetch are served from the cache for `refresh_interval`
+    seconds. After that window the symbol is fetched again and the newly published articles
+    are added. Articles not returned by any fetch for `retention` seconds are removed.
+
+    Attributes:
+        path (str): Path to the SQLite database file.
+        refresh_interval (float): Seconds during which a fetch is served from the cache.
+        retention (float): Seconds an article is kept after it was last fetched.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        retention: float = DEFAULT_RETENTION,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initializes the cache and creates the database schema if needed.
+
+        Args:
+            path (str): Path to the SQLite database file. Parent directories are created.
+            refresh_interval (float, optional): Seconds during which a fetch is served from
+                the cache. Defaults to 15 minutes.
+            retention (float, optional): Seconds an article is kept. Defaults to 7 days.
+            clock (callable, optional): Returns the current time in seconds.
+        """
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.retention = retention
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    symbol TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    title TEXT,
+                    source TEXT,
+                    content TEXT,
+                    publish_date TEXT,
+                    seen_at REAL NOT NULL,
+                    rank INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (symbol, url)
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fetches (
+                    symbol TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL,
+                    article_limit INTEGER NOT NULL,
+                    content_length INTEGER NOT NULL
+                )
+                """
+            )
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            conn = sqlite3.connect(self.path)
+            try:
+                yield conn
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get(self, symbol: str, limit: int, content_length: int) -> Optional[List[dict]]:
+        """
+        Get the articles of a symbol's last fetch if it is fresh enough for the request.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            limit (int): Maximum number of articles.
+            content_length (int): Maximum length of each article's content.
+
+        Returns:
+            list: The articles in the order they were fetched, or None if the symbol has to
+            be fetched.
+        """
+        with self._connection() as conn:
+            fetch = conn.execute(
+                "SELECT fetched_at, article_limit, content_length FROM fetches WHERE symbol = ?",
+                (symbol,),
+            ).fetchone()
+            if (
+                fetch is None
+                or self._clock() - fetch[0] > self.refresh_interval
+                or fetch[1] < limit
+                or fetch[2] < content_length
+            ):
+                return None
+            rows = conn.execute(
+                f"SELECT {', '.join(ARTICLE_FIELDS)} FROM articles "
+                "WHERE symbol = ? AND seen_at = ? ORDER BY rank LIMIT ?",
+                (symbol, fetch[0], limit),
+            ).fetchall()
+
+        articles = [dict(zip(ARTICLE_FIELDS, row), symbol=symbol) for row in rows]
+        for article in articles:
+            article["content"] = (article["content"] or "")[:content_length]
+        return articles
+
+    def put(self, symbol: str, articles: List[dict], limit: int, content_length: int) -> int:
+        """
+        Store the result of a fetch.
+
+        The fetch is only recorded as servable if every article has a URL.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            articles (list): Fetched articles with a `url` key.
+            limit (int): Number of articles requested.
+            content_length (int): Content length requested.
+
+        Returns:
+            int: Number of articles not stored before.
+        """
+        now = self._clock()
+        rows = [
+            (symbol, *(article.get(field) for field in ARTICLE_FIELDS), now, rank)
+            for rank, article in enumerate(articles)
+            if article.get("url")
+        ]
+        with self._connection() as conn:
+            known = {
+                row[0]
+                for row in conn.execute("SELECT url FROM articles WHERE symbol = ?", (symbol,))
+            }
+            conn.executemany(
+                f"INSERT OR REPLACE INTO articles (symbol, {', '.join(ARTICLE_FIELDS)}, "
+                "seen_at, rank) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if len(rows) == len(articles):
+                conn.execute(
+                    "INSERT OR REPLACE INTO fetches "
+                    "(symbol, fetched_at, article_limit, content_length) VALUES (?, ?, ?, ?)",
+                    (symbol, now, limit, content_length),
+                )
+            conn.execute("DELETE FROM articles WHERE seen_at < ?", (now - self.retention,))
+        return len({row[1] for row in rows} - known)
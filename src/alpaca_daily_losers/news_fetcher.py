@@ -0,0 +1,132 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from py_alpaca_api.trading.news import News
+
+from alpaca_daily_losers.news_cache import NewsCache
+
+DEFAULT_NEWS_WORKERS = 8
+DEFAULT_CONTENT_LENGTH = 4000
+
+
+class NewsFetcher:
+    """
+    Retrieves news articles through an optional on-disk cache, fetching several symbols
+    concurrently.
+
+    `get_news` has the signature of `News.get_news`, so a fetcher can be used wherever the
+    news client is. `prefetch` starts downloading symbols in the background; a later
+    `get_news` for the same request picks up the download instead of starting another one.
+    A fetcher is meant to live for one run.
+
+    Attributes:
+        news (News): News client used to fetch articles.
+        cache (NewsCache): Cache of fetched articles, or None to always fetch.
+        py_logger (logging.Logger): Logger for logging information.
+        max_workers (int): Maximum number of symbols fetched concurrently.
+    """
+
+    def __init__(
+        self,
+        news_client: News,
+        cache: Optional[NewsCache] = None,
+        py_logger: Optional[logging.Logger] = None,
+        max_workers: int = DEFAULT_NEWS_WORKERS,
+    ):
+        self.news = news_client
+        self.cache = cache
+        self.py_logger = py_logger or logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Tuple[str, int, int], Future] = {}
+        self._lock = threading.Lock()
+
+    def get_news(
+        self, symbol: str, limit: int, content_length: int = DEFAULT_CONTENT_LENGTH
+    ) -> List[dict]:
+        """
+        Get recent news articles for a symbol.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            limit (int): Maximum number of articles.
+            content_length (int, optional): Maximum length of each article's content.
+
+        Returns:
+            list: Articles with `title`, `symbol` and `content` keys.
+        """
+        with self._lock:
+            future = self._pending.pop((symbol, limit, content_length), None)
+        if future is not None:
+            return future.result()
+        return self._fetch(symbol, limit, content_length)
+
+    def prefetch(
+        self, symbols: List[str], limit: int, content_length: int = DEFAULT_CONTENT_LENGTH
+    ) -> None:
+        """
+        Start fetching news for symbols in the background.
+
+        Args:
+            symbols (list): Stock ticker symbols.
+            limit (int): Maximum number of articles per symbol.
+            content_length (int, optional): Maximum length of each article's content.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            for symbol in symbols:
+                key = (symbol, limit, content_length)
+                if key not in self._pending:
+                    self._pending[key] = self._executor.submit(
+                        self._fetch, symbol, limit, content_length
+                    )
+
+    def get_news_many(
+        self, symbols: List[str], limit: int, content_length: int = DEFAULT_CONTENT_LENGTH
+    ) -> Dict[str, List[dict]]:
+        """
+        Get recent news articles for several symbols, fetched concurrently.
+
+        A symbol whose news cannot be fetched is logged and mapped to an empty list.
+
+        Args:
+            symbols (list): Stock ticker symbols.
+            limit (int): Maximum number of articles per symbol.
+            content_length (int, optional): Maximum length of each article's content.
+
+        Returns:
+            dict: Articles keyed by symbol.
+        """
+        self.prefetch(symbols, limit, content_length)
+        news = {}
+        for symbol in symbols:
+            try:
+                news[symbol] = self.get_news(symbol, limit, content_length)
+            except Exception as e:
+                self.py_logger.warning(f"Error fetching news for {symbol}: {e}")
+                news[symbol] = []
+        return news
+
+    def close(self) -> None:
+        """
+        Cancel pending downloads and release the worker threads.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch(self, symbol: str, limit: int, content_length: int) -> List[dict]:
+        if self.cache is not None:
+            articles = self.cache.get(symbol, limit, content_length)
+            if articles is not None:
+                return articles
+
+        articles = self.news.get_news(symbol=symbol, limit=limit, content_length=content_length)
+        if self.cache is not None:
+            self.cache.put(symbol, articles, limit, content_length)
+        return articles
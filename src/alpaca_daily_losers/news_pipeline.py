@@ -0,0 +1,168 @@
+import queue
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from alpaca_daily_losers.news_sentiment import NewsSentimentEvaluator
+
+# Number of tickers whose news is fetched ahead of the tickers being classified.
+DEFAULT_NEWS_LOOKAHEAD = 4
+POLL_INTERVAL = 0.05
+
+
+class NewsPipeline:
+    """
+    A streaming pipeline selecting the first tickers whose news sentiment is bullish.
+
+    Tickers flow through the stages news fetch -> article dedupe -> sentiment, connected by
+    bounded queues, and the vote stage collects the verdicts in priority order on the calling
+    thread. The stages run concurrently, so the news of the next tickers downloads while
+    earlier tickers are classified. At most `max_workers + lookahead` tickers are in flight;
+    a full queue blocks the stage feeding it. Once a ticker can no longer be among the first
+    `filter_ticker_limit` passing tickers, the work outstanding for it is skipped at every
+    stage. A pipeline is created for a single run.
+
+    Attributes:
+        evaluator (NewsSentimentEvaluator): Fetches and classifies the news of a ticker.
+        max_workers (int): Number of fetch and of sentiment workers.
+        lookahead (int): Number of tickers admitted beyond the sentiment workers.
+    """
+
+    def __init__(
+        self,
+        evaluator: "NewsSentimentEvaluator",
+        max_workers: int,
+        lookahead: int = DEFAULT_NEWS_LOOKAHEAD,
+    ):
+        self.evaluator = evaluator
+        self.max_workers = max_workers
+        self.lookahead = lookahead
+
+    def run(self, tickers: List[str], filter_ticker_limit: int) -> List[str]:
+        """
+        Get the first tickers, in priority order, whose news sentiment is bullish.
+
+        Args:
+            tickers (list): Candidate tickers in priority order.
+            filter_ticker_limit (int): Maximum number of tickers to return.
+
+        Returns:
+            list: Up to `filter_ticker_limit` bullish tickers in the order of `tickers`.
+        """
+        self._tickers = tickers
+        self._cutoff = len(tickers)
+        self._stop = threading.Event()
+        self._admitted: queue.Queue = queue.Queue()
+        self._fetched: queue.Queue = queue.Queue(maxsize=self.max_workers)
+        self._deduped: queue.Queue = queue.Queue(maxsize=self.max_workers)
+        self._results: queue.Queue = queue.Queue()
+
+        workers = [self._fetch_stage] * self.max_workers + [self._dedupe_stage]
+        workers += [self._sentiment_stage] * self.max_workers
+        for worker in workers:
+            threading.Thread(target=worker, daemon=True).start()
+        try:
+            return self._vote_stage(filter_ticker_limit)
+        finally:
+            self._stop.set()
+
+    def _vote_stage(self, filter_ticker_limit: int) -> List[str]:
+        results: Dict[int, bool] = {}
+        next_index = in_flight = 0
+        while True:
+            self._cutoff = self._cutoff_index(results, filter_ticker_limit, len(self._tickers))
+            while in_flight < self.max_workers + self.lookahead and next_index < self._cutoff:
+                self._admitted.put((next_index, self._tickers[next_index]))
+                next_index += 1
+                in_flight += 1
+            if not in_flight:
+                break
+
+            index, bullish = self._results.get()
+            in_flight -= 1
+            if bullish is not None:
+                results[index] = bullish
+
+        passing = [self._tickers[index] for index in sorted(results) if results[index]]
+        return passing[:filter_ticker_limit]
+
+    def _fetch_stage(self) -> None:
+        evaluator = self.evaluator
+        self._run_stage(
+            self._admitted,
+            self._fetched,
+            lambda ticker: evaluator.news.get_news(
+                symbol=ticker,
+                limit=evaluator.article_limit,
+                content_length=evaluator.content_length,
+            ),
+        )
+
+    def _dedupe_stage(self) -> None:
+        evaluator = self.evaluator
+
+        def dedupe(articles):
+            if len(articles) < evaluator.article_limit:
+                return None
+            return evaluator.distinct_stories(articles)
+
+        self._run_stage(self._fetched, self._deduped, dedupe)
+
+    def _sentiment_stage(self) -> None:
+        self._run_stage(
+            self._deduped,
+            None,
+            self.evaluator.is_majority_bullish,
+        )
+
+    def _run_stage(
+        self,
+        source: queue.Queue,
+        target: Optional[queue.Queue],
+        process: Callable[[object], object],
+    ) -> None:
+        """
+        Process the `(index, payload)` items of a stage until the pipeline stops.
+
+        Items past the cutoff are skipped. An item whose processing fails or returns None is
+        reported to the vote stage as not bullish; a skipped item is reported as cancelled.
+        """
+        while not self._stop.is_set():
+            try:
+                index, payload = source.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if index >= self._cutoff:
+                self._results.put((index, None))
+                continue
+
+            try:
+                output = process(payload)
+            except Exception as e:
+                self.evaluator.py_logger.warning(
+                    f"Error evaluating news sentiment for {self._tickers[index]}: {e}"
+                )
+                output = False
+
+            if target is None or output is None or output is False:
+                self._results.put((index, bool(output)))
+            else:
+                self._put(target, (index, output))
+
+    def _put(self, target: queue.Queue, item) -> None:
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    @staticmethod
+    def _cutoff_index(results: Dict[int, bool], filter_ticker_limit: int, count: int) -> int:
+        """
+        Get the index from which a ticker can no longer be among the first passing tickers.
+        """
+        passing = sorted(index for index, bullish in results.items() if bullish)
+        if len(passing) < filter_ticker_limit:
+            return count
+        return passing[filter_ticker_limit - 1] + 1 if filter_ticker_limit > 0 else 0
@@ -0,0 +1,217 @@
+import logging
+from typing import List, Optional, Union
+
+from py_alpaca_api.trading.news import News
+
+from alpaca_daily_losers.article_registry import ArticleRegistry
+from alpaca_daily_losers.news_fetcher import NewsFetcher
+from alpaca_daily_losers.news_pipeline import DEFAULT_NEWS_LOOKAHEAD, NewsPipeline
+from alpaca_daily_losers.openai import OpenAIAPI
+
+DEFAULT_SENTIMENT_WORKERS = 4
+ARTICLE_CONTENT_LENGTH = 4000
+# Orders in which articles can be classified: newest first, or shortest (cheapest) first.
+ARTICLE_ORDERS = {
+    "recency": lambda articles: sorted(
+        articles, key=lambda article: article.get("publish_date") or "", reverse=True
+    ),
+    "length": lambda articles: sorted(
+        articles, key=lambda article: len(article.get("content") or "")
+    ),
+}
+
+
+class MajorityVote:
+    """
+    Tallies bullish votes over a fixed number of articles until the majority is decided.
+
+    A ticker is bullish when more than half of its articles are bullish. The outcome is
+    decided as soon as enough bullish votes are counted, or as soon as enough other votes
+    are counted that a bullish majority is no longer possible.
+
+    Attributes:
+        total (int): Number of articles voting.
+        bullish (int): Number of bullish votes counted.
+        counted (int): Number of votes counted.
+    """
+
+    def __init__(self, total: int):
+        self.total = total
+        self.bullish = 0
+        self.counted = 0
+
+    def add(self, sentiment: str) -> None:
+        """
+        Count the sentiment of one article.
+        """
+        self.counted += 1
+        if sentiment == "BULLISH":
+            self.bullish += 1
+
+    @property
+    def needed_bullish(self) -> int:
+        """
+        Number of further bullish votes that decide the outcome as bullish.
+        """
+        return self.total // 2 + 1 - self.bullish
+
+    @property
+    def needed_other(self) -> int:
+        """
+        Number of further non-bullish votes that decide the outcome as not bullish.
+        """
+        return self.total - self.total // 2 - (self.counted - self.bullish)
+
+    @property
+    def decision(self) -> Optional[bool]:
+        """
+        The outcome, or None while it is still open.
+        """
+        if self.needed_bullish <= 0:
+            return True
+        if self.needed_other <= 0:
+            return False
+        return None
+
+    def next_batch_size(self) -> int:
+        """
+        Number of votes to request next: the fewest that could decide the outcome.
+        """
+        return max(min(self.needed_bullish, self.needed_other), 0)
+
+
+class NewsSentimentEvaluator:
+    """
+    Evaluates the news sentiment of candidate tickers concurrently.
+
+    Tickers are streamed in priority order through a `NewsPipeline` that fetches the news of
+    upcoming tickers while earlier ones are classified. A ticker is only admitted while it
+    can still be among the first `filter_ticker_limit` passing tickers, and outstanding work
+    for tickers that can no longer make the cut is skipped. Articles are classified in the
+    smallest batches that could decide the ticker's majority vote, so classification stops
+    once the outcome is determined either way.
+
+    Attributes:
+        news (News): News client or `NewsFetcher` used to fetch articles.
+        openai (OpenAIAPI): OpenAI client used to classify articles.
+        py_logger (logging.Logger): Logger for logging information.
+        article_limit (int): Number of articles required and evaluated per ticker.
+        max_workers (int): Maximum number of tickers evaluated concurrently.
+        lookahead (int): Number of tickers whose news is fetched ahead of classification.
+        content_length (int): Maximum length of each article's content.
+        article_order (str): Order in which articles are classified, one of
+            `ARTICLE_ORDERS`, or None to keep the order returned by the news client.
+        article_registry (ArticleRegistry): Registry sharing the classification of an
+            article across the tickers it is fetched for, or None to classify per ticker.
+    """
+
+    def __init__(
+        self,
+        news_client: Union[News, NewsFetcher],
+        openai: OpenAIAPI,
+        py_logger: logging.Logger,
+        article_limit: int,
+        max_workers: int = DEFAULT_SENTIMENT_WORKERS,
+        article_order: Optional[str] = None,
+        article_registry: Optional[ArticleRegistry] = None,
+        lookahead: int = DEFAULT_NEWS_LOOKAHEAD,
+        content_length: int = ARTICLE_CONTENT_LENGTH,
+    ):
+        if article_order is not None and article_order not in ARTICLE_ORDERS:
+            raise ValueError(f"Unknown article order: {article_order}")
+        self.news = news_client
+        self.openai = openai
+        self.article_limit = article_limit
+        self.max_workers = max_workers
+        self.py_logger = py_logger
+        self.article_order = article_order
+        self.article_registry = article_registry
+        self.lookahead = lookahead
+        self.content_length = content_length
+
+    def is_majority_bullish(self, articles: List[dict]) -> bool:
+        """
+        Check whether more than half of the articles are bullish, classifying as few as
+        possible.
+
+        The articles are expected to be distinct stories, see `distinct_stories`.
+        Sentiments resolved locally, from the article registry, the cache or the
+        pre-classifier, are counted first. The remaining articles are then classified by the
+        LLM, in `article_order`, in the smallest batches that could decide the vote.
+
+        Args:
+            articles (list): Articles with `title`, `symbol` and `content` keys.
+
+        Returns:
+            bool: True if a majority of the articles is bullish.
+        """
+        vote = MajorityVote(len(articles))
+        local = self._local_sentiments(articles)
+        for sentiment in local:
+            if sentiment is not None:
+                vote.add(sentiment)
+
+        pending = [article for article, sentiment in zip(articles, local) if sentiment is None]
+        if self.article_order is not None:
+            pending = ARTICLE_ORDERS[self.article_order](pending)
+
+        while vote.decision is None:
+            batch_size = vote.next_batch_size()
+            batch, pending = pending[:batch_size], pending[batch_size:]
+            for sentiment in self._classify(batch):
+                vote.add(sentiment)
+        return vote.decision
+
+    def distinct_stories(self, articles: List[dict]) -> List[dict]:
+        """
+        Keep one article per story, as identified by the article registry, so copies of the
+        same story count as a single vote.
+        """
+        if self.article_registry is None:
+            return articles
+        seen, stories = set(), []
+        for article in articles:
+            key = self.article_registry.key(article)
+            if key is None or key not in seen:
+                stories.append(article)
+            if key is not None:
+                seen.add(key)
+        return stories
+
+    def _local_sentiments(self, articles: List[dict]) -> List[Optional[str]]:
+        """
+        Get the sentiments known without a new LLM call.
+        """
+        if self.article_registry is None:
+            return self.openai.get_local_sentiments(articles)
+
+        self.article_registry.register(articles)
+        sentiments = self.article_registry.known_sentiments(articles)
+        self.openai.metrics.record("registry", sentiments)
+        pending = [position for position, sentiment in enumerate(sentiments) if sentiment is None]
+        local = self.openai.get_local_sentiments([articles[position] for position in pending])
+        for position, sentiment in zip(pending, local):
+            sentiments[position] = sentiment
+        return sentiments
+
+    def _classify(self, articles: List[dict]) -> List[str]:
+        if self.article_registry is None:
+            return self.openai.classify_articles(articles)
+        return self.article_registry.classify(articles, self.openai.classify_articles)
+
+    def filter_tickers(self, tickers: List[str], filter_ticker_limit: int) -> List[str]:
+        """
+        Get the first tickers, in priority order, whose news sentiment is bullish.
+
+        Tickers are streamed through a `NewsPipeline`, so fetching the news of upcoming
+        tickers overlaps with classifying earlier ones.
+
+        Args:
+            tickers (list): Candidate tickers in priority order.
+            filter_ticker_limit (int): Maximum number of tickers to return.
+
+        Returns:
+            list: Up to `filter_ticker_limit` bullish tickers in the order of `tickers`.
+        """
+        pipeline = NewsPipeline(self, self.max_workers, self.lookahead)
+        return pipeline.run(tickers, filter_ticker_limit)
@@ -1,26 +1,125 @@
+import json
 import os
 import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
 
-from openai import OpenAI, OpenAIError
-from tenacity import retry, stop_after_attempt, wait_random_exponential
+import numpy as np
+from openai import OpenAIError
+from tenacity import RetryCallState, retry, stop_after_attempt, wait_random_exponential
 
+from alpaca_daily_losers.lexicon import LexiconClassifier
+from alpaca_daily_losers.near_duplicates import (
+    DEFAULT_SIMILARITY_THRESHOLD,
+    MinHasher,
+    article_text,
+)
+from alpaca_daily_losers.openai_client import OpenAIClientManager
+from alpaca_daily_losers.prompt_compaction import PromptCompactor
+from alpaca_daily_losers.rate_limiter import RateLimiter, parse_retry_after
+from alpaca_daily_losers.sentiment_cache import SentimentCache, make_sentiment_key
+
+SENTIMENTS = {"BEARISH", "BULLISH", "NEUTRAL"}
+BATCH_SYSTEM_MESSAGE = (
+    "You will work as a Sentiment Analysis for Financial news. "
+    "I will share numbered news articles, each with a headline, stock symbol and article. "
+    "Classify every article as BEARISH, BULLISH or NEUTRAL. "
+    'Answer only with JSON of the form {"sentiments": [{"index": 0, "sentiment": "BULLISH"}]} '
+    "containing one entry per article."
+)
+
+exponential_wait = wait_random_exponential(min=1, max=60)
+
+
+def wait_for_retry(retry_state: RetryCallState) -> float:
+    """
+    Wait as long as a failed response asks through its `retry-after` header, and back off
+    exponentially when it does not.
+    """
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    if response is not None:
+        retry_after = parse_retry_after(response.headers)
+        if retry_after is not None:
+            return retry_after
+    return exponential_wait(retry_state)
+
+
+class TierMetrics:
+    """
+    Counts, per tier of the sentiment cascade, the articles that reached the tier and the
+    articles it resolved.
+    """
 
-class OpenAIAPI:
     def __init__(self):
+        self.attempts = Counter()
+        self.hits = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, tier: str, labels: List[Optional[str]]) -> None:
+        """
+        Record the labels a tier produced, None for each article it could not resolve.
+        """
+        with self._lock:
+            self.attempts[tier] += len(labels)
+            self.hits[tier] += sum(1 for label in labels if label is not None)
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Get the attempts, hits and hit rate of every tier.
+
+        Returns:
+            dict: Counts keyed by tier name.
+        """
+        with self._lock:
+            return {
+                tier: {
+                    "attempts": attempts,
+                    "hits": self.hits[tier],
+                    "hit_rate": round(self.hits[tier] / attempts, 4) if attempts else 0.0,
+                }
+                for tier, attempts in self.attempts.items()
+            }
+
+
+class OpenAIAPI:
+    def __init__(
+        self,
+        sentiment_cache: Optional[SentimentCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        client_manager: Optional[OpenAIClientManager] = None,
+        pre_classifier: Optional[LexiconClassifier] = None,
+        prompt_compactor: Optional[PromptCompactor] = None,
+        minhasher: Optional[MinHasher] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ):
         self.api_key = os.environ.get("OPENAI_API_KEY")
         self.model = "gpt-4o"
+        self.sentiment_cache = sentiment_cache
+        self.rate_limiter = rate_limiter
+        self.client_manager = client_manager
+        self.pre_classifier = pre_classifier
+        self.prompt_compactor = prompt_compactor
+        self.minhasher = minhasher
+        self.similarity_threshold = similarity_threshold
+        self.metrics = TierMetrics()
 
-    @retry(wait=wait_random_exponential(min=1, max=60), stop=stop_after_attempt(6))
+    @retry(wait=wait_for_retry, stop=stop_after_attempt(6))
     def completion_with_backoff(self, **kwargs):
         """
         Makes a completion call to the OpenAI API with exponential backoff in case of failures.
 
+        Requests go through the process-wide `OpenAIClientManager`, which reuses one pooled
+        client. Requests are held to the manager's base rate limit, and further paced from the
+        rate limit headers of earlier responses.
+
         Returns:
             response (openai.Completion): The response object from the OpenAI API.
         """
         try:
-            openai = OpenAI(api_key=self.api_key)
-            return openai.chat.completions.create(**kwargs)
+            if self.client_manager is None:
+                self.client_manager = OpenAIClientManager.shared(self.api_key, self.rate_limiter)
+            return self.client_manager.create_chat_completion(**kwargs)
         except OpenAIError as e:
             print(f"OpenAI API error: {e}")
             raise
@@ -38,18 +137,114 @@ class OpenAIAPI:
         response = self.completion_with_backoff(model=self.model, messages=msgs)
         return response
 
-    def get_sentiment_analysis(self, title, symbol, article):
+    def get_sentiment_analysis(self, title, symbol, article, article_id=None):
         """
         Get the sentiment analysis for financial news.
 
+        The sentiment cache and the local pre-classifier are consulted before calling the
+        API, and new classifications are stored in the cache.
+
         Args:
             title (str): The title of the news.
             symbol (str): The stock symbol associated with the news.
             article (str): The content of the news article.
+            article_id (str, optional): The id or URL of the article, used as cache key.
 
         Returns:
             signal (str): The sentiment analysis result - "BEARISH", "BULLISH", or "NEUTRAL".
         """
+        article_data = {"title": title, "symbol": symbol, "content": article, "id": article_id}
+        sentiment = self.get_local_sentiments([article_data])[0]
+        if sentiment is not None:
+            return sentiment
+        return self._classify_single(article_data)
+
+    def get_sentiment_analyses(self, articles: List[dict]) -> List[str]:
+        """
+        Get the sentiment analysis for several financial news articles.
+
+        Articles resolved by the sentiment cache or the local pre-classifier are not sent to
+        the API, and the remaining ones are classified together, see `classify_articles`.
+
+        Args:
+            articles (list): Articles with `title`, `symbol` and `content` keys, and
+                optionally `id` or `url`.
+
+        Returns:
+            list: The sentiment of each article, in the same order as `articles`.
+        """
+        sentiments = self.get_local_sentiments(articles)
+        pending = [position for position, sentiment in enumerate(sentiments) if sentiment is None]
+        labels = self.classify_articles([articles[position] for position in pending])
+        for position, label in zip(pending, labels):
+            sentiments[position] = label
+        return sentiments
+
+    def get_local_sentiments(self, articles: List[dict]) -> List[Optional[str]]:
+        """
+        Get the sentiments that can be resolved without calling the API.
+
+        The sentiment cache is consulted first, then the pre-classifier for the articles the
+        cache could not resolve. When a MinHasher is configured, an article missing from the
+        cache reuses the cached sentiment of a near-duplicate classified on an earlier run.
+
+        Args:
+            articles (list): Articles with `title`, `symbol` and `content` keys, and
+                optionally `id` or `url`.
+
+        Returns:
+            list: The sentiment of each article, or None where it has to be classified by
+            the API.
+        """
+        sentiments = [None] * len(articles)
+        if self.sentiment_cache is not None:
+            sentiments = [self._cached_sentiment(article) for article in articles]
+            self.metrics.record("cache", sentiments)
+
+        pending = [position for position, sentiment in enumerate(sentiments) if sentiment is None]
+        if self.pre_classifier is not None and pending:
+            labels = self.pre_classifier.classify([articles[position] for position in pending])
+            self.metrics.record("lexicon", labels)
+            for position, label in zip(pending, labels):
+                sentiments[position] = label
+        return sentiments
+
+    def classify_articles(self, articles: List[dict]) -> List[str]:
+        """
+        Classify articles with the API, in one completion where possible.
+
+        Several articles are sent in a single request that asks for a JSON list of
+        per-article labels. Any article whose label is missing or cannot be parsed is
+        classified on its own. If the batch request itself fails, after its retries, the
+        articles are labelled NEUTRAL rather than retried one by one. New classifications
+        are stored in the sentiment cache.
+
+        Args:
+            articles (list): Articles with `title`, `symbol` and `content` keys, and
+                optionally `id` or `url`.
+
+        Returns:
+            list: The sentiment of each article, in the same order as `articles`.
+        """
+        labels = self._classify_batch(articles) if len(articles) > 1 else [None] * len(articles)
+        if labels is None:
+            self.metrics.record("llm", [None] * len(articles))
+            return ["NEUTRAL"] * len(articles)
+
+        sentiments = []
+        for article, label in zip(articles, labels):
+            if label is None:
+                sentiments.append(self._classify_single(article))
+                continue
+            self.metrics.record("llm", [label])
+            self._remember(article, label)
+            sentiments.append(label)
+        return sentiments
+
+    def _classify_single(self, article: dict) -> str:
+        """
+        Classify one article with its own completion.
+        """
         try:
             system_message = (
                 "You will work as a Sentiment Analysis for Financial news. "
@@ -60,18 +255,148 @@ class OpenAIAPI:
 
             message_history = [
                 {"content": system_message, "role": "user"},
-                {"content": f"{title}\n{symbol}\n{article}", "role": "user"},
+                {
+                    "content": f"{article['title']}\n{article['symbol']}\n"
+                    f"{self._prompt_content(article)}",
+                    "role": "user",
+                },
             ]
 
             response = self.chat(message_history)
 
-            sentiment = re.sub("[^a-zA-Z]", "", response.choices[0].message.content.strip().upper())
+            sentiment = self._normalize_sentiment(response.choices[0].message.content)
 
-            if sentiment not in {"BEARISH", "BULLISH", "NEUTRAL"}:
+            if sentiment not in SENTIMENTS:
                 raise ValueError(f"Unexpected sentiment response: {sentiment}")
 
-            return sentiment
-
         except (OpenAIError, ValueError) as e:
             print(f"Error in get_sentiment_analysis: {e}")
+            self.metrics.record("llm", [None])
             return "NEUTRAL"
+
+        self.metrics.record("llm", [sentiment])
+        self._remember(article, sentiment)
+        return sentiment
+
+    def _prompt_content(self, article: dict) -> str:
+        """
+        Get the article content sent to the API, compacted when a compactor is configured.
+        """
+        if self.prompt_compactor is None:
+            return article["content"]
+        return self.prompt_compactor.compact(article)["content"]
+
+    def _cached_sentiment(self, article: dict) -> Optional[str]:
+        """
+        Get the cached sentiment of an article or, failing that, of a near-duplicate.
+        """
+        key = self._cache_key(article)
+        sentiment = self.sentiment_cache.get(key)
+        if sentiment is not None or self.minhasher is None:
+            return sentiment
+
+        signature = self.minhasher.signature(article_text(article))
+        if signature is None:
+            return None
+        candidates = self.sentiment_cache.similar_candidates(self.minhasher.band_keys(signature))
+        for candidate, candidate_signature in candidates:
+            similarity = self.minhasher.similarity(
+                signature, np.frombuffer(candidate_signature, dtype=signature.dtype)
+            )
+            if candidate != key and similarity >= self.similarity_threshold:
+                sentiment = self.sentiment_cache.get(candidate)
+                if sentiment is not None:
+                    return sentiment
+        return None
+
+    def _remember(self, article: dict, sentiment: str) -> None:
+        """
+        Store a new classification, and the article's signature, in the sentiment cache.
+        """
+        if self.sentiment_cache is None:
+            return
+        key = self._cache_key(article)
+        self.sentiment_cache.put(key, sentiment)
+        if self.minhasher is not None:
+            signature = self.minhasher.signature(article_text(article))
+            if signature is not None:
+                self.sentiment_cache.put_signature(
+                    key, signature.tobytes(), self.minhasher.band_keys(signature)
+                )
+
+    def _cache_key(self, article: dict) -> str:
+        return make_sentiment_key(
+            self._article_id(article), article["title"], article["content"], self.model
+        )
+
+    def _classify_batch(self, articles: List[dict]) -> Optional[List[Optional[str]]]:
+        """
+        Classify several articles with one completion.
+
+        Returns:
+            list: The sentiment of each article, or None where no valid label was returned.
+            None if the request failed.
+        """
+        numbered = "\n\n".join(
+            f"Article {index}:\n{article['title']}\n{article['symbol']}\n"
+            f"{self._prompt_content(article)}"
+            for index, article in enumerate(articles)
+        )
+        message_history = [
+            {"content": BATCH_SYSTEM_MESSAGE, "role": "user"},
+            {"content": numbered, "role": "user"},
+        ]
+
+        try:
+            response = self.completion_with_backoff(
+                model=self.model,
+                messages=message_history,
+                response_format={"type": "json_object"},
+            )
+            return self._parse_batch_response(response.choices[0].message.content, len(articles))
+        except Exception as e:
+            print(f"Error in batch sentiment analysis: {e}")
+            return None
+
+    @classmethod
+    def _parse_batch_response(cls, content: str, count: int) -> List[Optional[str]]:
+        """
+        Parse the JSON labels of a batch completion.
+
+        Both `{"sentiments": [{"index": 0, "sentiment": "BULLISH"}, ...]}` and a plain list of
+        labels in article order are accepted.
+
+        Args:
+            content (str): Message content of the completion.
+            count (int): Number of articles in the batch.
+
+        Returns:
+            list: The sentiment of each article, or None where no valid label was returned.
+        """
+        labels = [None] * count
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError):
+            return labels
+
+        entries = data.get("sentiments", []) if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            return labels
+
+        for position, entry in enumerate(entries):
+            if isinstance(entry, dict):
+                position, entry = entry.get("index"), entry.get("sentiment")
+            if not isinstance(position, int) or not 0 <= position < count:
+                continue
+            sentiment = cls._normalize_sentiment(entry) if isinstance(entry, str) else None
+            if sentiment in SENTIMENTS:
+                labels[position] = sentiment
+        return labels
+
+    @staticmethod
+    def _normalize_sentiment(text: str) -> str:
+        return re.sub("[^a-zA-Z]", "", text.strip().upper())
+
+    @staticmethod
+    def _article_id(article: dict) -> Optional[str]:
+        return article.get("id") or article.get("url")
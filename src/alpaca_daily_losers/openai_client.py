@@ -0,0 +1,92 @@
+import threading
+from typing import Dict, Optional
+
+from openai import OpenAI
+
+from alpaca_daily_losers.rate_limiter import (
+    RateLimiter,
+    RateLimitPacer,
+    estimate_tokens,
+)
+
+
+class OpenAIClientManager:
+    """
+    A long-lived OpenAI client with rate limit pacing, shared per API key.
+
+    The client keeps its HTTP connection pool and TLS sessions across calls. Every request
+    first takes its share of the configured requests and tokens per minute from a
+    `RateLimiter`, which paces requests before any response has been seen. It then waits on a
+    `RateLimitPacer` fed from the rate limit headers of each response, which holds requests
+    back further once the API reports that the window is running out. The client's own
+    retries are disabled; callers decide how to retry.
+
+    Attributes:
+        client (OpenAI): The pooled OpenAI client.
+        pacer (RateLimitPacer): Pacer fed from the response headers.
+        rate_limiter (RateLimiter): Base requests and tokens per minute limit, or None.
+    """
+
+    _shared: Dict[Optional[str], "OpenAIClientManager"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        client: OpenAI,
+        pacer: Optional[RateLimitPacer] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.client = client
+        self.pacer = pacer or RateLimitPacer()
+        self.rate_limiter = rate_limiter
+
+    @classmethod
+    def shared(
+        cls, api_key: Optional[str], rate_limiter: Optional[RateLimiter] = None
+    ) -> "OpenAIClientManager":
+        """
+        Get the process-wide manager for an API key, creating it on first use.
+
+        Args:
+            api_key (str): OpenAI API key, or None to read it from the environment.
+            rate_limiter (RateLimiter, optional): Base limit of a newly created manager.
+
+        Returns:
+            OpenAIClientManager: The shared manager.
+        """
+        with cls._shared_lock:
+            manager = cls._shared.get(api_key)
+            if manager is None:
+                manager = cls(OpenAI(api_key=api_key, max_retries=0), rate_limiter=rate_limiter)
+                cls._shared[api_key] = manager
+            return manager
+
+    def create_chat_completion(self, **kwargs):
+        """
+        Create a chat completion once the rate limits allow it.
+
+        Args:
+            **kwargs: Arguments of `chat.completions.create`.
+
+        Returns:
+            openai.types.chat.ChatCompletion: The parsed completion.
+        """
+        tokens = estimate_tokens(kwargs.get("messages", []))
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(tokens)
+        self.pacer.wait(tokens)
+        try:
+            response = self.client.chat.completions.with_raw_response.create(**kwargs)
+        except Exception as e:
+            self.update_from_error(e)
+            raise
+        self.pacer.update(response.headers)
+        return response.parse()
+
+    def update_from_error(self, error: Exception) -> None:
+        """
+        Record the rate limit state reported by a failed request, if any.
+        """
+        response = getattr(error, "response", None)
+        if response is not None:
+            self.pacer.update(response.headers)
@@ -0,0 +1,296 @@
+import hashlib
+import inspect
+import json
+import logging
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import requests
+from py_alpaca_api.http.requests import Requests
+from py_alpaca_api.trading import Trading
+
+from alpaca_daily_losers.fill_tracker import FillTracker
+from alpaca_daily_losers.global_functions import tz
+
+DEFAULT_ORDER_WORKERS = 4
+# Attempts per order. Only connection errors are retried: the order may have reached the
+# broker, and its client order id makes the retry safe.
+ORDER_ATTEMPTS = 3
+RETRY_DELAY = 0.5
+CLIENT_ORDER_ID_PREFIX = "daily-losers"
+RETRIABLE_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+# Statuses of an order the broker did not execute.
+UNEXECUTED_STATUSES = {"canceled", "expired", "rejected"}
+
+
+def make_client_order_id(
+    stage: str, symbol: str, side: str, nonce: str, session: Optional[str] = None
+) -> str:
+    """
+    Build the client order id of an order.
+
+    The id depends on the trading session, the stage of the strategy, the symbol, the side
+    and the nonce of the batch submitting the order. Retries of the order reuse the id, so a
+    resubmission is rejected by the broker as a duplicate instead of filling twice, while a
+    later batch gets new ids.
+
+    Args:
+        stage (str): Stage of the strategy submitting the order, e.g. "buy" or "liquidate".
+        symbol (str): Stock ticker symbol.
+        side (str): "buy" or "sell".
+        nonce (str): Unique value of the batch of orders.
+        session (str, optional): Trading session, defaults to today's date in US/Eastern.
+
+    Returns:
+        str: The client order id.
+    """
+    session = session or datetime.now(tz).date().isoformat()
+    key = f"{session}|{stage}|{symbol}|{side}|{nonce}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return f"{CLIENT_ORDER_ID_PREFIX}-{stage}-{symbol}-{digest[:12]}"
+
+
+def is_duplicate_order_error(error: Exception) -> bool:
+    """
+    Check whether an order was rejected because its client order id was already used.
+    """
+    message = str(error).lower()
+    return "client_order_id" in message and ("unique" in message or "duplicate" in message)
+
+
+class OrderResult:
+    """
+    The outcome of one order submitted by an `OrderExecutor`.
+
+    Attributes:
+        symbol (str): Stock ticker symbol.
+        client_order_id (str): Client order id of the order, None for position closes.
+        latency (float): Seconds from the first submission attempt to the broker's answer.
+        attempts (int): Number of submission attempts.
+        error (Exception): The error of a failed order, None if it was accepted.
+        duplicate (bool): Whether the broker already had the order from an earlier attempt.
+        fill (Future): Resolves to the `Fill` of an accepted order if fills are tracked.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        client_order_id: Optional[str],
+        latency: float,
+        attempts: int,
+        error: Optional[Exception] = None,
+        duplicate: bool = False,
+    ):
+        self.symbol = symbol
+        self.client_order_id = client_order_id
+        self.latency = latency
+        self.attempts = attempts
+        self.error = error
+        self.duplicate = duplicate
+        self.fill: Optional[Future] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class OrderExecutor:
+    """
+    Submits a batch of orders concurrently with bounded parallelism.
+
+    Market orders carry a client order id unique to their batch, see `make_client_order_id`, and
+    connection errors are retried with the same id. Each result records the latency of its
+    order, and a summary of the batch is logged. Accepted market orders are handed to the
+    fill tracker, if any.
+
+    Attributes:
+        trade (Trading): Alpaca trading client.
+        py_logger (logging.Logger): Logger for logging information.
+        max_workers (int): Maximum number of orders in flight.
+        fill_tracker (FillTracker): Tracks the fills of accepted market orders, or None.
+    """
+
+    def __init__(
+        self,
+        trading_client: Trading,
+        py_logger: logging.Logger,
+        max_workers: int = DEFAULT_ORDER_WORKERS,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+        fill_tracker: Optional[FillTracker] = None,
+    ):
+        self.trade = trading_client
+        self.py_logger = py_logger
+        self.max_workers = max_workers
+        self.fill_tracker = fill_tracker
+        self._clock = clock
+        self._sleep = sleep
+
+    def submit_market_orders(
+        self,
+        orders: List[dict],
+        stage: str,
+        session: Optional[str] = None,
+        nonce: Optional[str] = None,
+    ) -> List[OrderResult]:
+        """
+        Submit notional market orders concurrently.
+
+        Args:
+            orders (list): Orders with `symbol`, `notional` and `side` keys, and optionally
+                the expected fill `price`.
+            stage (str): Stage of the strategy, part of the client order ids.
+            session (str, optional): Trading session, defaults to today's date.
+            nonce (str, optional): Unique value of the batch, part of the client order ids.
+                A random one is generated by default.
+
+        Returns:
+            list: The result of each order, in the order of `orders`.
+        """
+        nonce = nonce or uuid.uuid4().hex
+        return self._run(
+            orders,
+            lambda order: self._submit_market_order(
+                order,
+                make_client_order_id(stage, order["symbol"], order["side"], nonce, session),
+            ),
+            stage,
+        )
+
+    def close_positions(self, positions: List[dict]) -> List[OrderResult]:
+        """
+        Close quantities of positions concurrently.
+
+        The close position endpoint takes no client order id, so closes are not retried.
+
+        Args:
+            positions (list): Positions with `symbol` and `qty` keys.
+
+        Returns:
+            list: The result of each close, in the order of `positions`.
+        """
+        return self._run(positions, self._close_position, "close")
+
+    def _run(self, items: List[dict], submit: Callable, stage: str) -> List[OrderResult]:
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(submit, items))
+        self.log_latency(results, stage)
+        return results
+
+    def _submit_market_order(self, order: dict, client_order_id: str) -> OrderResult:
+        result = self._attempt_market_order(order, client_order_id)
+        if result.ok and self.fill_tracker is not None:
+            result.fill = self.fill_tracker.track(
+                client_order_id, order["symbol"], order["side"], order.get("price")
+            )
+        return result
+
+    def _attempt_market_order(self, order: dict, client_order_id: str) -> OrderResult:
+        start = self._clock()
+        for attempt in range(1, ORDER_ATTEMPTS + 1):
+            try:
+                self._post_market_order(order, client_order_id)
+                return OrderResult(order["symbol"], client_order_id, self._clock() - start, attempt)
+            except RETRIABLE_ERRORS as e:
+                if attempt == ORDER_ATTEMPTS:
+                    return self._failed(order["symbol"], client_order_id, start, attempt, e)
+                self.py_logger.info(f"Retrying order {client_order_id} after error: {e}")
+                self._sleep(RETRY_DELAY * attempt)
+            except Exception as e:
+                if is_duplicate_order_error(e) and self._order_exists(order, client_order_id):
+                    return OrderResult(
+                        order["symbol"], client_order_id, self._clock() - start, attempt, None, True
+                    )
+                return self._failed(order["symbol"], client_order_id, start, attempt, e)
+
+    def _order_exists(self, order: dict, client_order_id: str) -> bool:
+        """
+        Check whether the broker holds an executable order with the client order id, placed
+        by an earlier attempt whose response was lost.
+        """
+        try:
+            existing = self._get_order(client_order_id)
+        except Exception as e:
+            self.py_logger.warning(f"Could not look up order {client_order_id}: {e}")
+            return False
+        return (
+            existing is not None
+            and existing.get("symbol") == order["symbol"]
+            and existing.get("side") == order["side"]
+            and existing.get("status") not in UNEXECUTED_STATUSES
+        )
+
+    def _get_order(self, client_order_id: str) -> Optional[dict]:
+        orders = self.trade.orders
+        if not isinstance(getattr(orders, "base_url", None), str):
+            return None
+        response = Requests().request(
+            method="GET",
+            url=f"{orders.base_url}/orders:by_client_order_id",
+            headers=orders.headers,
+            params={"client_order_id": client_order_id},
+        )
+        return json.loads(response.text)
+
+    def _post_market_order(self, order: dict, client_order_id: str):
+        """
+        Submit a market order with its client order id.
+
+        `Orders.market` is used when it accepts a client order id. Otherwise the order is
+        posted to the orders endpoint of the client directly; clients without an endpoint
+        get the order without an id.
+        """
+        orders = self.trade.orders
+        if "client_order_id" in inspect.signature(orders.market).parameters:
+            return orders.market(
+                symbol=order["symbol"],
+                notional=order["notional"],
+                side=order["side"],
+                client_order_id=client_order_id,
+            )
+        if not isinstance(getattr(orders, "base_url", None), str):
+            return orders.market(
+                symbol=order["symbol"], notional=order["notional"], side=order["side"]
+            )
+
+        payload = {
+            "symbol": order["symbol"],
+            "notional": round(order["notional"], 2),
+            "side": order["side"],
+            "type": "market",
+            "time_in_force": "day",
+            "client_order_id": client_order_id,
+        }
+        response = Requests().request(
+            method="POST", url=f"{orders.base_url}/orders", headers=orders.headers, json=payload
+        )
+        return json.loads(response.text)
+
+    def _close_position(self, position: dict) -> OrderResult:
+        start = self._clock()
+        try:
+            self.trade.positions.close(symbol_or_id=position["symbol"], qty=position["qty"])
+        except Exception as e:
+            return self._failed(position["symbol"], None, start, 1, e)
+        return OrderResult(position["symbol"], None, self._clock() - start, 1)
+
+    def _failed(
+        self, symbol: str, client_order_id: Optional[str], start: float, attempts: int, error
+    ) -> OrderResult:
+        return OrderResult(symbol, client_order_id, self._clock() - start, attempts, error)
+
+    def log_latency(self, results: List[OrderResult], stage: str) -> None:
+        """
+        Log the number of accepted orders and the median and maximum latency of a batch.
+        """
+        latencies = sorted(result.latency for result in results)
+        accepted = sum(result.ok for result in results)
+        self.py_logger.info(
+            f"Submitted {accepted}/{len(results)} {stage} orders, latency "
+            f"p50 {latencies[len(latencies) // 2]:.3f}s max {latencies[-1]:.3f}s"
+        )
@@ -0,0 +1,162 @@
+import logging
+from typing import Optional
+
+import pandas as pd
+from py_alpaca_api.trading import Trading
+
+CASH_SYMBOL = "Cash"
+
+
+class PortfolioSnapshot:
+    """
+    The positions of the account, fetched once per run and updated locally from the orders
+    the run submits.
+
+    The positions are those of `Positions.get_all`, including the cash row, so the stages of
+    a run see the same portfolio without fetching it again. Every update replaces the
+    positions with a new DataFrame and increments `version`; a DataFrame returned earlier is
+    never modified. Local updates estimate fills at the last market value, so `refresh`
+    fetches the positions again when the broker's view is needed, and `invalidate` makes the
+    next access fetch them, e.g. after an order whose outcome is unknown.
+
+    Attributes:
+        trade (Trading): Alpaca trading client.
+        py_logger (logging.Logger): Logger for logging information.
+        version (int): Incremented by every fetch and local update.
+    """
+
+    def __init__(
+        self,
+        trading_client: Trading,
+        py_logger: Optional[logging.Logger] = None,
+        positions: Optional[pd.DataFrame] = None,
+    ):
+        """
+        Initializes the snapshot. The positions are fetched on first access unless given.
+
+        Args:
+            trading_client (Trading): Alpaca trading client.
+            py_logger (logging.Logger, optional): Logger for logging information.
+            positions (pd.DataFrame, optional): Positions already fetched for the run.
+        """
+        self.trade = trading_client
+        self.py_logger = py_logger or logging.getLogger(__name__)
+        self.version = 0 if positions is None else 1
+        self._positions = positions
+
+    @property
+    def positions(self) -> pd.DataFrame:
+        """
+        The current positions, including the cash row. Must not be modified.
+        """
+        if self._positions is None:
+            self.refresh()
+        return self._positions
+
+    @property
+    def cash(self) -> float:
+        """
+        The cash of the account, i.e. the market value of the cash row.
+        """
+        positions = self.positions
+        return float(positions.loc[positions["symbol"] == CASH_SYMBOL, "market_value"].iloc[0])
+
+    def refresh(self) -> pd.DataFrame:
+        """
+        Fetch the positions from the broker, discarding local updates.
+
+        Returns:
+            pd.DataFrame: The fetched positions.
+        """
+        self._positions = self.trade.positions.get_all()
+        self.version += 1
+        self.py_logger.info(f"Fetched portfolio snapshot version {self.version}")
+        return self._positions
+
+    def invalidate(self) -> None:
+        """
+        Discard the positions, so the next access fetches them from the broker.
+        """
+        self._positions = None
+
+    def apply_close(self, symbol: str, qty: float) -> None:
+        """
+        Record that a quantity of a position was closed at its last price.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            qty (float): Quantity closed.
+        """
+        row = self._row(symbol)
+        if row is None:
+            return
+        held = self.positions.at[row, "qty"]
+        fraction = min(float(qty) / float(held), 1.0) if held else 1.0
+        self._sell(row, fraction)
+
+    def apply_market_order(self, symbol: str, notional: float, side: str) -> None:
+        """
+        Record a notional market order filled at the last price.
+
+        Args:
+            symbol (str): Stock ticker symbol.
+            notional (float): Dollar amount of the order.
+            side (str): "buy" or "sell".
+        """
+        if side == "sell":
+            row = self._row(symbol)
+            if row is not None:
+                market_value = self.positions.at[row, "market_value"]
+                self._sell(row, min(notional / market_value, 1.0) if market_value else 1.0)
+            return
+        self._buy(symbol, notional)
+
+    def _row(self, symbol: str) -> Optional[int]:
+        rows = self.positions.index[self.positions["symbol"] == symbol]
+        if rows.empty:
+            self.py_logger.warning(f"No position in {symbol} in the portfolio snapshot")
+            return None
+        return rows[0]
+
+    def _sell(self, row: int, fraction: float) -> None:
+        positions = self.positions.copy()
+        has_values = "market_value" in positions.columns
+        proceeds = positions.at[row, "market_value"] * fraction if has_values else 0.0
+        if fraction >= 1.0:
+            positions = positions.drop(index=row)
+        else:
+            for column in ("qty", "qty_available", "market_value", "cost_basis", "profit_dol"):
+                if column in positions.columns:
+                    positions.at[row, column] *= 1 - fraction
+        self._update(positions, proceeds)
+
+    def _buy(self, symbol: str, notional: float) -> None:
+        positions = self.positions.copy()
+        rows = positions.index[positions["symbol"] == symbol]
+        if rows.empty:
+            new_row = {column: 0.0 for column in positions.select_dtypes("number").columns}
+            new_row.update(symbol=symbol, market_value=0.0)
+            positions = pd.concat([positions, pd.DataFrame([new_row])], ignore_index=True)
+            rows = positions.index[positions["symbol"] == symbol]
+        row = rows[0]
+        price = positions.at[row, "current_price"] if "current_price" in positions.columns else 0
+        if price:
+            for column in ("qty", "qty_available"):
+                if column in positions.columns:
+                    positions.at[row, column] += notional / price
+        for column in ("market_value", "cost_basis"):
+            if column in positions.columns:
+                positions.at[row, column] += notional
+        self._update(positions, -notional)
+
+    def _update(self, positions: pd.DataFrame, cash_change: float) -> None:
+        if "market_value" in positions.columns:
+            positions.loc[positions["symbol"] == CASH_SYMBOL, "market_value"] += cash_change
+        if "portfolio_pct" in positions.columns:
+            # Keep the units of the client, a fraction or a percentage of the portfolio.
+            scale = round(self.positions["portfolio_pct"].sum()) or 1
+            positions["portfolio_pct"] = (
+                positions["market_value"] / positions["market_value"].sum() * scale
+            )
+        self._positions = positions.reset_index(drop=True)
+        self.version += 1
@@ -0,0 +1,124 @@
+import re
+from typing import Callable, List, Optional
+
+from alpaca_daily_losers.rate_limiter import CHARS_PER_TOKEN
+
+DEFAULT_ARTICLE_TOKEN_BUDGET = 256
+# Lead sentences usually carry the story, so they are preferred over later ones.
+LEAD_SENTENCES = 3
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n+")
+# Phrases are matched as whole words, so e.g. "subscribers" or "redesign update" are kept.
+BOILERPLATE_PATTERN = re.compile(
+    r"\b(?:not (?:intended as )?investment advice|forward-looking statements"
+    r"|all rights reserved|click here|subscribe|sign up|newsletter|the views and opinions"
+    r"|this article (?:was|is) (?:originally )?(?:published|written)|read more"
+    r"|see also|zacks rank|free report|motley fool|copyright)\b|\bdisclosure:|©",
+    re.IGNORECASE,
+)
+
+
+def estimate_text_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens of a text from its number of characters.
+
+    The estimate is the intended counter: it only has to keep articles within a budget, so
+    no tokenizer dependency is needed.
+    """
+    return len(text) // CHARS_PER_TOKEN
+
+
+class PromptCompactor:
+    """
+    Shrinks article content to a per-article token budget before it is sent to the LLM.
+
+    The content is split into sentences. Boilerplate such as disclaimers and sign-up prompts,
+    sentences repeating the headline and duplicate sentences are dropped. The remaining
+    sentences are ranked by how often they mention the symbol, with lead sentences preferred,
+    and the best ones that fit the budget are kept in their original order.
+
+    Attributes:
+        token_budget (int): Maximum number of content tokens per article.
+        count_tokens (callable): Function returning the token count of a text, defaults to
+            `estimate_text_tokens`.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_ARTICLE_TOKEN_BUDGET,
+        count_tokens: Optional[Callable[[str], int]] = None,
+    ):
+        self.token_budget = token_budget
+        self.count_tokens = count_tokens or estimate_text_tokens
+
+    def compact(self, article: dict) -> dict:
+        """
+        Get a copy of an article with its content compacted.
+
+        Args:
+            article (dict): Article with `title`, `symbol` and `content` keys.
+
+        Returns:
+            dict: The article with compacted `content`.
+        """
+        content = self.compact_text(
+            article.get("content") or "", article.get("symbol") or "", article.get("title") or ""
+        )
+        return {**article, "content": content}
+
+    def compact_text(self, content: str, symbol: str, title: str = "") -> str:
+        """
+        Compact text to the token budget, keeping the most symbol-relevant sentences.
+
+        Args:
+            content (str): Text of the article.
+            symbol (str): Stock symbol the article is evaluated for, or several separated
+                by commas.
+            title (str, optional): Headline of the article, not repeated in the content.
+
+        Returns:
+            str: The compacted text.
+        """
+        sentences = self._split_sentences(content, title)
+        if self.count_tokens(" ".join(sentences)) <= self.token_budget:
+            return " ".join(sentences)
+
+        symbols = [re.escape(name.strip()) for name in symbol.split(",") if name.strip()]
+        symbol_pattern = (
+            re.compile(rf"\b(?:{'|'.join(symbols)})\b", re.IGNORECASE) if symbols else None
+        )
+        ranked = sorted(
+            range(len(sentences)),
+            key=lambda index: (
+                -(len(symbol_pattern.findall(sentences[index])) if symbol_pattern else 0),
+                index >= LEAD_SENTENCES,
+                index,
+            ),
+        )
+
+        kept, used = [], 0
+        for index in ranked:
+            tokens = self.count_tokens(sentences[index])
+            if used + tokens <= self.token_budget:
+                kept.append(index)
+                used += tokens
+        return " ".join(sentences[index] for index in sorted(kept))
+
+    @classmethod
+    def _split_sentences(cls, content: str, title: str) -> List[str]:
+        """
+        Split text into sentences without boilerplate, headline repeats or duplicates.
+        """
+        seen = {cls._normalize(title)} if title else set()
+        sentences = []
+        for sentence in SENTENCE_PATTERN.split(content):
+            sentence = sentence.strip()
+            normalized = cls._normalize(sentence)
+            if not sentence or normalized in seen or BOILERPLATE_PATTERN.search(sentence):
+                continue
+            seen.add(normalized)
+            sentences.append(sentence)
+        return sentences
+
+    @staticmethod
+    def _normalize(sentence: str) -> str:
+        return " ".join(sentence.lower().split()).rstrip(".!?")
@@ -0,0 +1,260 @@
+import re
+import threading
+import time
+from typing import Callable, Iterable, Mapping, Optional
+
+# Limits of the OpenAI usage tier the strategy is run with by default.
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 30000
+# Rough number of characters per token for English text.
+CHARS_PER_TOKEN = 4
+# Allowance per message for role and formatting tokens.
+TOKENS_PER_MESSAGE = 4
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def estimate_tokens(messages: Iterable[dict]) -> int:
+    """
+    Estimate the number of prompt tokens of chat messages.
+
+    Args:
+        messages (list): Chat messages with a `content` key.
+
+    Returns:
+        int: Estimated token count.
+    """
+    return sum(
+        len(message.get("content") or "") // CHARS_PER_TOKEN + TOKENS_PER_MESSAGE
+        for message in messages
+    )
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that refills continuously at a fixed rate per minute.
+
+    Attributes:
+        rate (float): Tokens added per minute.
+        capacity (float): Maximum number of tokens held, defaults to one minute of tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("Rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate / 60)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1) -> float:
+        """
+        Take tokens from the bucket if enough are available.
+
+        Args:
+            amount (float, optional): Number of tokens, capped at the bucket's capacity.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds until they are available.
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return 0.0
+            return (amount - self._tokens) * 60 / self.rate
+
+    def acquire(self, amount: float = 1) -> float:
+        """
+        Take tokens from the bucket, waiting until enough are available.
+
+        Args:
+            amount (float, optional): Number of tokens, capped at the bucket's capacity.
+
+        Returns:
+            float: Total seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(amount)
+            if not delay:
+                return waited
+            self._sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    """
+    Paces API requests under a requests per minute and a tokens per minute limit.
+
+    Attributes:
+        requests (TokenBucket): Bucket of requests per minute.
+        tokens (TokenBucket): Bucket of tokens per minute.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock=clock, sleep=sleep)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock, sleep=sleep)
+
+    def acquire(self, tokens: int) -> float:
+        """
+        Wait until a request using the given number of tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens of the request.
+
+        Returns:
+            float: Total seconds spent waiting.
+        """
+        return self.requests.acquire(1) + self.tokens.acquire(tokens)
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate limit reset duration such as "1s", "6m0s", "1h2m3.5s" or "20ms".
+
+    Args:
+        value (str): Duration from an `x-ratelimit-reset-*` header.
+
+    Returns:
+        float: The duration in seconds, or None if it cannot be parsed.
+    """
+    if not value:
+        return None
+    matches = DURATION_PATTERN.findall(value.strip())
+    if not matches or "".join(number + unit for number, unit in matches) != value.strip():
+        return None
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in matches)
+
+
+class RateLimitPacer:
+    """
+    Paces requests from the rate limit headers of previous responses.
+
+    Each response reports the remaining requests and tokens of the current window and when
+    the window resets. Requests are held back until the reset once the remaining requests
+    run out or the next request needs more tokens than remain. Remaining counts are
+    decremented locally so that concurrent callers are paced before the next response
+    arrives.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.remaining_requests: Optional[float] = None
+        self.remaining_tokens: Optional[float] = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """
+        Record the rate limit state reported by a response.
+
+        Args:
+            headers (dict): Response headers.
+        """
+        now = self._clock()
+        with self._lock:
+            requests = self._header_number(headers, "x-ratelimit-remaining-requests")
+            if requests is not None:
+                self.remaining_requests = requests
+                reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+                self.requests_reset_at = now + (reset or 0.0)
+
+            tokens = self._header_number(headers, "x-ratelimit-remaining-tokens")
+            if tokens is not None:
+                self.remaining_tokens = tokens
+                reset = parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+                self.tokens_reset_at = now + (reset or 0.0)
+
+    def delay(self, tokens: int = 0) -> float:
+        """
+        Get the seconds to wait before a request with the given tokens may be sent.
+        """
+        now = self._clock()
+        with self._lock:
+            delay = 0.0
+            if self.remaining_requests is not None and self.remaining_requests < 1:
+                delay = max(delay, self.requests_reset_at - now)
+            if self.remaining_tokens is not None and self.remaining_tokens < tokens:
+                delay = max(delay, self.tokens_reset_at - now)
+            return max(delay, 0.0)
+
+    def wait(self, tokens: int = 0) -> float:
+        """
+        Wait until the rate limits allow a request and reserve its share of the window.
+
+        Args:
+            tokens (int, optional): Estimated tokens of the request.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        delay = self.delay(tokens)
+        if delay:
+            self._sleep(delay)
+
+        now = self._clock()
+        with self._lock:
+            if self.remaining_requests is not None:
+                if now >= self.requests_reset_at:
+                    self.remaining_requests = None
+                else:
+                    self.remaining_requests -= 1
+            if self.remaining_tokens is not None:
+                if now >= self.tokens_reset_at:
+                    self.remaining_tokens = None
+                else:
+                    self.remaining_tokens -= tokens
+        return delay
+
+    @staticmethod
+    def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+        try:
+            return float(headers[name])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Get the delay requested by the `retry-after-ms` or `retry-after` header.
+
+    Args:
+        headers (dict): Response headers.
+
+    Returns:
+        float: The delay in seconds, or None if no numeric delay is given.
+    """
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            return max(float(headers[name]) * scale, 0.0)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
@@ -0,0 +1,225 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def make_sentiment_key(article_id: Optional[str], title: str, content: str, model: str) -> str:
+    """
+    Build the cache key of an article's sentiment.
+
+    The key combines the article id or URL, a hash of the title and content, and the model
+    name, so an edited article or a model change is classified again.
+
+    Args:
+        article_id (str): Article id or URL, may be None.
+        title (str): Title of the article.
+        content (str): Content of the article.
+        model (str): Name of the model producing the sentiment.
+
+    Returns:
+        str: The cache key.
+    """
+    content_hash = hashlib.sha256(f"{title}\n{content}".encode("utf-8")).hexdigest()
+    return f"{model}|{article_id or ''}|{content_hash}"
+
+
+class SentimentCache:
+    """
+    A local SQLite store of article sentiments with a TTL and LRU eviction.
+
+    Entries older than `ttl` seconds are ignored and removed. When the cache holds more than
+    `max_entries` entries, the least recently used ones are evicted.
+
+    Attributes:
+        path (str): Path to the SQLite database file.
+        ttl (float): Time to live of an entry in seconds.
+        max_entries (int): Maximum number of stored entries.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initializes the cache and creates the database schema if needed.
+
+        Args:
+            path (str): Path to the SQLite database file. Parent directories are created.
+            ttl (float, optional): Time to live of an entry in seconds. Defaults to 7 days.
+            max_entries (int, optional): Maximum number of stored entries.
+            clock (callable, optional): Returns the current time in seconds.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sentiment (
+                    key TEXT PRIMARY KEY,
+                    sentiment TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS sentiment_accessed_at ON sentiment (accessed_at)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signature (
+                    key TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS signature_band (
+                    band TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (band, key)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            conn = sqlite3.connect(self.path)
+            try:
+                yield conn
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached sentiment and mark it as recently used.
+
+        Args:
+            key (str): Cache key, see `make_sentiment_key`.
+
+        Returns:
+            str: The sentiment, or None if it is not cached or has expired.
+        """
+        now = self._clock()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT sentiment, created_at FROM sentiment WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._delete(conn, [key])
+                return None
+            conn.execute("UPDATE sentiment SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def put(self, key: str, sentiment: str) -> None:
+        """
+        Insert or replace a sentiment and evict entries beyond `max_entries`, together with
+        their signatures.
+
+        Args:
+            key (str): Cache key, see `make_sentiment_key`.
+            sentiment (str): The sentiment to store.
+        """
+        now = self._clock()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sentiment (key, sentiment, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, sentiment, now, now),
+            )
+            evicted = conn.execute(
+                "SELECT key FROM sentiment ORDER BY accessed_at DESC LIMIT -1 OFFSET ?",
+                (self.max_entries,),
+            ).fetchall()
+            self._delete(conn, [row[0] for row in evicted])
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, keys: List[str]) -> None:
+        """
+        Delete entries together with their signatures and band keys.
+        """
+        rows = [(key,) for key in keys]
+        for table in ("sentiment", "signature", "signature_band"):
+            conn.executemany(f"DELETE FROM {table} WHERE key = ?", rows)
+
+    def put_signature(self, key: str, signature: bytes, band_keys: List[str]) -> None:
+        """
+        Store the MinHash signature of a cached article so that near-duplicates published
+        later under another id can reuse its sentiment.
+
+        Args:
+            key (str): Cache key of the article's sentiment.
+            signature (bytes): Serialized MinHash signature.
+            band_keys (list): LSH band keys of the signature.
+        """
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO signature (key, signature) VALUES (?, ?)", (key, signature)
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO signature_band (band, key) VALUES (?, ?)",
+                [(band_key, key) for band_key in band_keys],
+            )
+
+    def similar_candidates(self, band_keys: List[str]) -> List[Tuple[str, bytes]]:
+        """
+        Get the stored signatures sharing at least one LSH band key.
+
+        Args:
+            band_keys (list): LSH band keys of an article.
+
+        Returns:
+            list: Tuples of the cache key and serialized signature of each candidate.
+        """
+        if not band_keys:
+            return []
+        placeholders = ", ".join("?" * len(band_keys))
+        with self._connection() as conn:
+            return conn.execute(
+                "SELECT DISTINCT signature.key, signature.signature FROM signature_band "
+                "JOIN signature ON signature.key = signature_band.key "
+                f"WHERE signature_band.band IN ({placeholders})",
+                band_keys,
+            ).fetchall()
+
+    def purge_expired(self) -> int:
+        """
+        Remove all expired entries and the signatures of entries no longer cached.
+
+        Returns:
+            int: Number of removed entries.
+        """
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM sentiment WHERE created_at < ?", (self._clock() - self.ttl,)
+            )
+            conn.execute("DELETE FROM signature WHERE key NOT IN (SELECT key FROM sentiment)")
+            conn.execute("DELETE FROM signature_band WHERE key NOT IN (SELECT key FROM signature)")
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
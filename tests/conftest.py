@@ -0,0 +1,71 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def _make_history(symbol, periods=260, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    return pd.DataFrame(
+        {
+            "symbol": symbol,
+            "date": pd.bdate_range("2023-01-02", periods=periods),
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": 1000,
+            "trade_count": 10,
+            "vwap": close,
+        }
+    )
+
+
+class FakeHistory:
+    def __init__(self, delay=0.0, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get_stock_data(self, symbol, start, end):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if symbol in self.failing:
+                raise Exception(f"No historical data found for {symbol}")
+            return _make_history(symbol, seed=len(symbol))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class FakeStock:
+    def __init__(self, history):
+        self.history = history
+
+
+@pytest.fixture
+def make_history():
+    """
+    Factory of synthetic daily bars with the layout of `History.get_stock_data`.
+    """
+    return _make_history
+
+
+@pytest.fixture
+def fake_stock():
+    """
+    Factory of stock clients serving synthetic bars, optionally slow or failing per symbol.
+    """
+
+    def make(delay=0.0, failing=()):
+        return FakeStock(FakeHistory(delay, failing))
+
+    return make
@@ -0,0 +1,105 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from alpaca_daily_losers.article_registry import ArticleRegistry
+from alpaca_daily_losers.news_sentiment import NewsSentimentEvaluator
+
+
+def make_article(url, symbol):
+    return {"title": f"Title {url}", "symbol": symbol, "content": "Body", "url": url}
+
+
+def test_shared_article_is_classified_once_with_all_symbols():
+    registry = ArticleRegistry()
+    registry.register([make_article("a", "AAPL")])
+    registry.register([make_article("a", "MSFT"), make_article("b", "MSFT")])
+    classify = MagicMock(side_effect=lambda articles: ["BULLISH"] * len(articles))
+
+    assert registry.classify([make_article("a", "AAPL")], classify) == ["BULLISH"]
+    assert registry.classify([make_article("a", "MSFT"), make_article("b", "MSFT")], classify) == [
+        "BULLISH",
+        "BULLISH",
+    ]
+
+    assert [article["symbol"] for article in classify.call_args_list[0].args[0]] == ["AAPL, MSFT"]
+    assert [article["url"] for article in classify.call_args_list[1].args[0]] == ["b"]
+
+
+def test_known_sentiments_only_returns_finished_classifications():
+    registry = ArticleRegistry()
+    registry.classify([make_article("a", "AAPL")], lambda articles: ["BEARISH"])
+
+    assert registry.known_sentiments([make_article("a", "MSFT"), make_article("b", "MSFT")]) == [
+        "BEARISH",
+        None,
+    ]
+
+
+def test_articles_without_id_are_not_shared():
+    registry = ArticleRegistry()
+    article = {"title": "t", "symbol": "AAPL", "content": "c"}
+    classify = MagicMock(side_effect=lambda articles: ["NEUTRAL"] * len(articles))
+
+    registry.classify([article], classify)
+    registry.classify([article], classify)
+
+    assert classify.call_count == 2
+
+
+def test_waiting_ticker_receives_owner_result():
+    registry = ArticleRegistry()
+    started, release = threading.Event(), threading.Event()
+    classify = MagicMock()
+
+    def slow_classify(articles):
+        started.set()
+        release.wait(1)
+        return ["BULLISH"]
+
+    owner = threading.Thread(
+        target=registry.classify, args=([make_article("a", "AAPL")], slow_classify)
+    )
+    owner.start()
+    started.wait(1)
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(registry.classify([make_article("a", "MSFT")], classify))
+    )
+    waiter.start()
+    release.set()
+    owner.join(1)
+    waiter.join(1)
+
+    assert results == [["BULLISH"]]
+    classify.assert_not_called()
+
+
+def test_failed_classification_is_raised_to_waiters():
+    registry = ArticleRegistry()
+
+    with pytest.raises(RuntimeError):
+        registry.classify([make_article("a", "AAPL")], MagicMock(side_effect=RuntimeError))
+    with pytest.raises(RuntimeError):
+        registry.classify([make_article("a", "MSFT")], MagicMock())
+
+
+def test_evaluator_shares_articles_across_tickers():
+    shared = [make_article(url, None) for url in ("a", "b", "c")]
+
+    def get_news(symbol, limit, content_length):
+        return [{**article, "symbol": symbol} for article in shared]
+
+    news = MagicMock()
+    news.get_news.side_effect = get_news
+    openai = MagicMock()
+    openai.get_local_sentiments.side_effect = lambda articles: [None] * len(articles)
+    openai.classify_articles.side_effect = lambda articles: ["BULLISH"] * len(articles)
+    evaluator = NewsSentimentEvaluator(
+        news, openai, MagicMock(), 3, max_workers=1, article_registry=ArticleRegistry()
+    )
+
+    assert evaluator.filter_tickers(["AAPL", "MSFT", "GOOG"], 3) == ["AAPL", "MSFT", "GOOG"]
+    classified = sum(len(call.args[0]) for call in openai.classify_articles.call_args_list)
+    assert classified == 2
@@ -0,0 +1,257 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from alpaca_daily_losers.async_adapters import (
+    AsyncAlpaca,
+    AsyncOpenAIAPI,
+    AsyncService,
+    AsyncSlack,
+)
+from alpaca_daily_losers.close_positions import ClosePositions
+from alpaca_daily_losers.daily_losers import BUY_FILL_TIMEOUT, DailyLosers
+from alpaca_daily_losers.liquidate import Liquidate
+
+
+def make_daily_losers():
+    with patch.object(DailyLosers, "__init__", lambda x: None):
+        inst = DailyLosers()
+    inst.alpaca = MagicMock()
+    inst.openai = MagicMock()
+    inst.fill_tracker = None
+    return inst
+
+
+def test_service_rejects_invalid_limit():
+    with pytest.raises(ValueError):
+        AsyncService("alpaca", 0)
+
+
+def test_service_limits_concurrent_calls():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def blocking_call(value):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return value
+
+    async def main():
+        service = AsyncService("alpaca", 2)
+        return await asyncio.gather(*(service.call(blocking_call, i) for i in range(6)))
+
+    assert asyncio.run(main()) == list(range(6))
+    assert peak == 2
+
+
+def test_slack_post_and_drain_keeps_message_order():
+    sent = []
+
+    async def main():
+        slack = AsyncSlack()
+        slack.post("first")
+        slack.post_positions([{"symbol": "AAPL", "qty": 1}], "sell")
+        await slack.drain()
+
+    with patch(
+        "alpaca_daily_losers.async_adapters.send_message", side_effect=sent.append
+    ) as mock_send:
+        asyncio.run(main())
+
+    assert mock_send.call_count == 2
+    assert sent == ["first", "Successfully sold the following positions:\nsold 1 shares of AAPL\n"]
+
+
+def test_afilter_tickers_with_news_matches_sequential_selection():
+    inst = make_daily_losers()
+    sentiments = {"AAA": "BEARISH", "BBB": "BULLISH", "CCC": "BULLISH", "DDD": "BULLISH"}
+    inst.alpaca.trading.news.get_news.side_effect = (
+        lambda symbol, limit, content_length: [{"title": "t", "symbol": symbol, "content": "c"}]
+        * limit
+    )
+    inst.openai.get_local_sentiments.side_effect = lambda articles: [None] * len(articles)
+    inst.openai.classify_articles.side_effect = lambda articles: [
+        sentiments[article["symbol"]] for article in articles
+    ]
+    inst.alpaca.trading.watchlists.get_assets.return_value = ["BBB", "CCC"]
+
+    async def main():
+        return await inst.afilter_tickers_with_news(
+            AsyncAlpaca(inst.alpaca),
+            AsyncOpenAIAPI(inst.openai),
+            ["AAA", "BBB", "CCC", "DDD"],
+            article_limit=3,
+            filter_ticker_limit=2,
+        )
+
+    assert asyncio.run(main()) == ["BBB", "CCC"]
+    inst.alpaca.trading.watchlists.update.assert_called_once_with(
+        watchlist_name="DailyLosers", symbols=["BBB", "CCC"]
+    )
+    # The shared news pipeline may fetch the news of one ticker ahead of the cutoff.
+    fetched = [call.kwargs["symbol"] for call in inst.alpaca.trading.news.get_news.call_args_list]
+    assert {"AAA", "BBB", "CCC"} <= set(fetched) <= {"AAA", "BBB", "CCC", "DDD"}
+
+
+def test_afilter_tickers_with_news_runs_the_shared_evaluator():
+    inst = make_daily_losers()
+    inst.alpaca.trading.watchlists.get_assets.return_value = ["BBB"]
+    openai = AsyncOpenAIAPI(inst.openai, limit=3)
+    alpaca = AsyncAlpaca(inst.alpaca)
+
+    with patch("alpaca_daily_losers.daily_losers.NewsSentimentEvaluator") as mock_evaluator:
+        mock_evaluator.return_value.filter_tickers.return_value = ["BBB"]
+        result = asyncio.run(inst.afilter_tickers_with_news(alpaca, openai, ["AAA", "BBB"], 3, 2))
+
+    assert result == ["BBB"]
+    mock_evaluator.return_value.filter_tickers.assert_called_once_with(["AAA", "BBB"], 2)
+    assert mock_evaluator.call_args.kwargs["max_workers"] == 3
+    assert mock_evaluator.call_args.kwargs["news_client"] is alpaca.news
+
+
+def test_aopen_positions_submits_all_orders():
+    inst = make_daily_losers()
+    inst.alpaca.trading.account.get.return_value.cash = 301.0
+
+    def market(symbol, notional, side):
+        if symbol == "BBB":
+            raise Exception("rejected")
+
+    inst.alpaca.trading.orders.market.side_effect = market
+
+    async def main():
+        slack = AsyncSlack()
+        await inst.aopen_positions(
+            AsyncAlpaca(inst.alpaca), slack, tickers=["AAA", "BBB", "CCC", "DDD"], ticker_limit=3
+        )
+        await slack.drain()
+
+    with patch("alpaca_daily_losers.async_adapters.send_message") as mock_send:
+        asyncio.run(main())
+
+    assert inst.alpaca.trading.orders.market.call_count == 3
+    messages = [call.args[0] for call in mock_send.call_args_list]
+    assert any(message.startswith("Error buying") for message in messages)
+    assert "of AAA bought" in messages[-1] and "of CCC bought" in messages[-1]
+    assert "BBB" not in messages[-1]
+
+
+def test_asell_positions_from_criteria_closes_positions():
+    trading = MagicMock()
+    trading.positions.get_all.return_value = pd.DataFrame(
+        {"symbol": ["AAPL", "MSFT", "Cash"], "qty": [5, 7, 0]}
+    )
+    alpaca = MagicMock()
+    alpaca.trading = trading
+    close = ClosePositions(trading, MagicMock(), MagicMock())
+
+    async def main():
+        slack = AsyncSlack()
+        with patch.object(close, "get_stocks_to_sell", return_value=["AAPL", "MSFT"]):
+            await close.asell_positions_from_criteria(AsyncAlpaca(alpaca), slack)
+        await slack.drain()
+
+    with patch("alpaca_daily_losers.async_adapters.send_message") as mock_send:
+        asyncio.run(main())
+
+    trading.positions.close.assert_any_call(symbol_or_id="AAPL", qty=5)
+    trading.positions.close.assert_any_call(symbol_or_id="MSFT", qty=7)
+    assert "sold 5 shares of AAPL" in mock_send.call_args.args[0]
+
+
+def test_aliquidate_positions_matches_sync_amounts():
+    trading = MagicMock()
+    trading.positions.get_all.return_value = pd.DataFrame(
+        {
+            "symbol": ["AAPL", "MSFT", "Cash"],
+            "market_value": [500.0, 1000.0, 10.0],
+            "profit_pct": [5.0, 3.0, 0.0],
+        }
+    )
+    alpaca = MagicMock()
+    alpaca.trading = trading
+    liquidate = Liquidate(trading, MagicMock())
+
+    async def main():
+        slack = AsyncSlack()
+        await liquidate.aliquidate_positions(AsyncAlpaca(alpaca), slack)
+        await slack.drain()
+
+    with patch("alpaca_daily_losers.async_adapters.send_message"):
+        asyncio.run(main())
+
+    trading.orders.market.assert_any_call(symbol="AAPL", notional=47, side="sell")
+    trading.orders.market.assert_any_call(symbol="MSFT", notional=94, side="sell")
+
+
+def test_aopen_positions_submits_through_order_executor():
+    inst = make_daily_losers()
+    inst.alpaca.trading.account.get.return_value.cash = 201.0
+
+    async def main():
+        slack = AsyncSlack()
+        await inst.aopen_positions(AsyncAlpaca(inst.alpaca), slack, tickers=["AAA", "BBB"])
+        await slack.drain()
+
+    with patch("alpaca_daily_losers.daily_losers.OrderExecutor") as mock_executor, patch(
+        "alpaca_daily_losers.async_adapters.send_message"
+    ):
+        mock_executor.return_value.submit_market_orders.return_value = []
+        asyncio.run(main())
+
+    orders = mock_executor.return_value.submit_market_orders.call_args.args[0]
+    assert [order["symbol"] for order in orders] == ["AAA", "BBB"]
+    assert mock_executor.return_value.submit_market_orders.call_args.kwargs["stage"] == "buy"
+
+
+def test_submit_buys_expects_ask_prices_and_waits_for_fills():
+    inst = make_daily_losers()
+    inst.fill_tracker = MagicMock()
+    inst.alpaca.stock.latest_quote.get.return_value = [
+        MagicMock(symbol="AAA", ask=10.5),
+        MagicMock(symbol="BBB", ask=0.0),
+    ]
+
+    with patch("alpaca_daily_losers.daily_losers.OrderExecutor") as mock_executor:
+        mock_executor.return_value.submit_market_orders.return_value = []
+        inst._submit_buys(["AAA", "BBB"], 100.0)
+
+    inst.alpaca.stock.latest_quote.get.assert_called_once_with(["AAA", "BBB"])
+    orders = mock_executor.return_value.submit_market_orders.call_args.args[0]
+    assert [order["price"] for order in orders] == [10.5, None]
+    inst.fill_tracker.wait.assert_called_once_with(BUY_FILL_TIMEOUT)
+
+
+def test_arun_settles_liquidations_before_buying_and_stops_tracker():
+    inst = make_daily_losers()
+    inst.fill_tracker = MagicMock()
+    inst.fill_tracker.stats.return_value = {}
+    inst.bar_cache = inst.state_store = None
+    inst.close = MagicMock()
+    inst.liquidate = MagicMock()
+    calls = []
+
+    async def record(name, *args, **kwargs):
+        calls.append(name)
+
+    inst.close.asell_positions_from_criteria = lambda *a, **k: record("sell")
+    inst.liquidate.aliquidate_positions = lambda *a, **k: record("liquidate")
+    inst.acheck_for_buy_opportunities = lambda *a, **k: record("buy")
+    inst._settle_orders = lambda portfolio: calls.append("settle")
+    inst.has_cash_for_new_positions = lambda positions: True
+
+    with patch.object(DailyLosers, "_news_fetcher", return_value=MagicMock()):
+        asyncio.run(inst.arun())
+
+    assert calls == ["sell", "liquidate", "settle", "buy"]
+    inst.fill_tracker.stop.assert_called_once()
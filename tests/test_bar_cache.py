@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from alpaca_daily_losers.bar_cache import BarCache
+from alpaca_daily_losers.global_functions import get_historical_data
+
+
+def make_bars(symbol, start, periods):
+    dates = pd.bdate_range(start, periods=periods) + pd.Timedelta(hours=5)
+    close = [100.0 + i for i in range(periods)]
+    return pd.DataFrame(
+        {
+            "symbol": symbol,
+            "date": dates,
+            "open": close,
+            "high": close,
+            "low": close,
+            "close": close,
+            "volume": 1000,
+            "trade_count": 10,
+            "vwap": close,
+        }
+    )
+
+
+@pytest.fixture
+def bar_cache(tmp_path):
+    return BarCache(str(tmp_path / "cache" / "bars.sqlite"))
+
+
+def test_store_and_load_round_trip(bar_cache):
+    bars = make_bars("AAPL", "2024-01-01", 5)
+    bar_cache.store("AAPL", bars, "2024-01-01")
+
+    loaded = bar_cache.load("AAPL", "2024-01-01", "2024-01-05")
+
+    pd.testing.assert_frame_equal(loaded, bars.astype(loaded.dtypes.to_dict()))
+    assert bar_cache.get_coverage("AAPL") == ("2024-01-01", "2024-01-05")
+
+
+def test_missing_range(bar_cache):
+    assert bar_cache.missing_range("AAPL", "2024-01-01", "2024-01-10") == (
+        "2024-01-01",
+        "2024-01-10",
+    )
+
+    bar_cache.store("AAPL", make_bars("AAPL", "2024-01-01", 5), "2024-01-01")
+
+    assert bar_cache.missing_range("AAPL", "2024-01-02", "2024-01-10") == (
+        "2024-01-06",
+        "2024-01-10",
+    )
+    assert bar_cache.missing_range("AAPL", "2024-01-02", "2024-01-05") is None
+    assert bar_cache.missing_range("AAPL", "2023-12-01", "2024-01-05") == (
+        "2023-12-01",
+        "2024-01-05",
+    )
+
+
+def test_get_historical_data_only_requests_missing_bars(bar_cache):
+    stock_client = MagicMock()
+    stock_client.history.get_stock_data.return_value = make_bars("AAPL", "2024-01-01", 5)
+
+    first = get_historical_data(stock_client, "AAPL", "2024-01-01", "2024-01-05", bar_cache)
+
+    stock_client.history.get_stock_data.return_value = make_bars("AAPL", "2024-01-08", 1)
+    second = get_historical_data(stock_client, "AAPL", "2024-01-02", "2024-01-08", bar_cache)
+
+    assert stock_client.history.get_stock_data.call_args_list[1].kwargs == {
+        "symbol": "AAPL",
+        "start": "2024-01-06",
+        "end": "2024-01-08",
+    }
+    assert len(first) == 5
+    assert second["close"].tolist() == [101.0, 102.0, 103.0, 104.0, 100.0]
+
+
+def test_get_historical_data_serves_cache_when_no_new_bars(bar_cache):
+    stock_client = MagicMock()
+    stock_client.history.get_stock_data.return_value = make_bars("AAPL", "2024-01-01", 5)
+    get_historical_data(stock_client, "AAPL", "2024-01-01", "2024-01-05", bar_cache)
+
+    stock_client.history.get_stock_data.side_effect = Exception("No historical data found")
+    history = get_historical_data(stock_client, "AAPL", "2024-01-01", "2024-01-07", bar_cache)
+
+    assert len(history) == 5
+
+
+def test_get_historical_data_without_cache_returns_empty_on_error():
+    stock_client = MagicMock()
+    stock_client.history.get_stock_data.side_effect = Exception("boom")
+
+    history = get_historical_data(stock_client, "AAPL", "2024-01-01", "2024-01-05")
+
+    assert history.empty
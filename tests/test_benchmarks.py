@@ -0,0 +1,53 @@
+import json
+from unittest.mock import patch
+
+from alpaca_daily_losers.global_functions import get_batched_historical_data
+from benchmarks.bench_screening import FakeBarsEndpoint, FakeStock, bench_case, main
+
+STAGES = [
+    "get_ticker_data",
+    "get_ticker_data_batched",
+    "calculate_indicators",
+    "buy_criteria",
+    "get_stocks_to_sell",
+    "get_stocks_to_sell_batched",
+]
+
+
+def test_fake_stock_returns_requested_bars():
+    history = FakeStock(bars=300).history.get_stock_data("AAPL", start="", end="")
+    assert len(history) == 300
+    assert history["date"].is_monotonic_increasing
+
+
+def test_fake_bars_endpoint_pages_match_per_symbol_bars():
+    stock = FakeStock(bars=300)
+    endpoint = FakeBarsEndpoint(stock.history)
+
+    with patch("alpaca_daily_losers.global_functions.BATCH_BAR_LIMIT", 250), patch(
+        "alpaca_daily_losers.global_functions.Requests", lambda: endpoint
+    ):
+        histories = get_batched_historical_data(stock, ["AAPL", "MSFT"], "", "")
+
+    for symbol in ["AAPL", "MSFT"]:
+        expected = stock.history.get_stock_data(symbol, start="", end="")
+        assert histories[symbol]["close"].tolist() == expected["close"].tolist()
+        assert histories[symbol]["date"].tolist() == expected["date"].tolist()
+
+
+def test_bench_case_reports_every_stage():
+    results = bench_case(ticker_count=3, years=1)
+    assert list(results) == STAGES
+    for stage in results.values():
+        assert stage["seconds"] >= 0
+        assert stage["peak_bytes"] > 0
+
+
+def test_main_writes_json(tmp_path):
+    output = tmp_path / "results.json"
+    main(["--tickers", "2", "--years", "1", "--output", str(output)])
+
+    results = json.loads(output.read_text())
+    assert results["cases"][0]["tickers"] == 2
+    assert results["cases"][0]["years"] == 1
+    assert list(results["cases"][0]["stages"]) == STAGES
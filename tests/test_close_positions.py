@@ -39,7 +39,9 @@ class TestSellPositionsFromCriteria:
 
         instance.sell_positions_from_criteria()
 
-        instance._sell_positions.assert_called_once_with(stocks_to_sell_mock, positions_mock)
+        instance._sell_positions.assert_called_once_with(
+            stocks_to_sell_mock, positions_mock, mocker.ANY
+        )
         send_position_messages_mock.assert_called_once_with(positions_mock, "sell")
 
 
@@ -0,0 +1,123 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from alpaca_daily_losers.fill_tracker import (
+    Fill,
+    FillTracker,
+    LocalTradeFeed,
+    OrderPollingFeed,
+)
+from alpaca_daily_losers.order_executor import OrderExecutor
+
+
+def make_order(client_order_id, status, **fields):
+    return {"client_order_id": client_order_id, "status": status, **fields}
+
+
+def make_tracker(feed):
+    return FillTracker(MagicMock(), MagicMock(), feed=feed, poll_interval=0.01)
+
+
+def test_fill_resolves_future_with_latency_and_slippage():
+    feed = LocalTradeFeed()
+    tracker = make_tracker(feed)
+    future = tracker.track("id-1", "AAPL", "buy", expected_price=100.0)
+
+    feed.publish(make_order("id-1", "new"))
+    feed.publish(
+        make_order(
+            "id-1",
+            "filled",
+            filled_qty="2",
+            filled_avg_price="100.5",
+            submitted_at="2024-06-03T13:30:00.000000Z",
+            filled_at="2024-06-03T13:30:01.250000Z",
+        ),
+    )
+    fill = future.result(timeout=1)
+
+    assert fill.filled and fill.filled_qty == 2.0
+    assert fill.latency == 1.25
+    assert round(fill.slippage_bps, 6) == 50.0
+    assert tracker.stats() == {
+        "orders": 1,
+        "filled": 1,
+        "unresolved": 0,
+        "latency_p50": 1.25,
+        "latency_max": 1.25,
+        "slippage_bps": 50.0,
+    }
+
+
+def test_sell_slippage_is_positive_below_expected_price():
+    fill = Fill("AAPL", "id", "sell", "filled", 1.0, 99.0, expected_price=100.0, latency=0.1)
+
+    assert round(fill.slippage_bps, 6) == 100.0
+
+
+def test_wait_stops_tracking_orders_that_do_not_fill():
+    feed = LocalTradeFeed()
+    tracker = make_tracker(feed)
+    tracker.track("id-1", "AAPL", "sell")
+    tracker.track("id-2", "MSFT", "sell")
+    feed.publish(make_order("id-1", "filled", filled_qty="1", filled_avg_price="10"))
+    feed.publish(make_order("id-2", "accepted"))
+
+    fills = tracker.wait(timeout=0.2)
+
+    assert [(fill.symbol, fill.status) for fill in fills] == [
+        ("AAPL", "filled"),
+        ("MSFT", "accepted"),
+    ]
+    assert fills[1].latency is None
+    assert tracker.wait(timeout=0.2) == []
+
+
+def test_stop_resolves_pending_orders_without_waiting():
+    feed = LocalTradeFeed()
+    tracker = make_tracker(feed)
+    future = tracker.track("id-1", "AAPL", "buy")
+
+    fills = tracker.stop()
+
+    assert [(fill.symbol, fill.status) for fill in fills] == [("AAPL", "unknown")]
+    assert future.result(timeout=0) is fills[0]
+    assert tracker.stop() == []
+    assert tracker.stats()["orders"] == 0
+    assert tracker.stats()["unresolved"] == 1
+
+
+def test_polling_feed_lists_orders_in_one_request():
+    trading = MagicMock()
+    trading.orders.base_url = "https://paper-api.alpaca.markets/v2"
+    orders = [make_order("id-1", "filled"), make_order("other", "filled")]
+
+    with patch("alpaca_daily_losers.fill_tracker.Requests") as mock_requests:
+        mock_requests.return_value.request.return_value.text = json.dumps(orders)
+        feed = OrderPollingFeed(trading)
+        result = feed.poll({"id-1"}, since=MagicMock(isoformat=lambda: "2024-06-03T13:29:00"))
+
+    assert result == [orders[0]]
+    kwargs = mock_requests.return_value.request.call_args.kwargs
+    assert kwargs["url"] == "https://paper-api.alpaca.markets/v2/orders"
+    assert kwargs["params"]["status"] == "all"
+
+
+def test_executor_tracks_accepted_orders():
+    feed = LocalTradeFeed()
+    tracker = make_tracker(feed)
+    trading = MagicMock()
+    trading.orders.market.side_effect = [None, Exception("rejected")]
+
+    executor = OrderExecutor(trading, MagicMock(), max_workers=1, fill_tracker=tracker)
+    results = executor.submit_market_orders(
+        [
+            {"symbol": "AAPL", "notional": 10.0, "side": "sell", "price": 5.0},
+            {"symbol": "MSFT", "notional": 10.0, "side": "sell"},
+        ],
+        stage="liquidate",
+    )
+    feed.publish(make_order(results[0].client_order_id, "filled", filled_avg_price="5"))
+
+    assert results[0].fill.result(timeout=1).expected_price == 5.0
+    assert results[1].fill is None
@@ -1,8 +1,14 @@
+import json
 import os
 
+import pandas as pd
 import pytest
 
-from src.alpaca_daily_losers.global_functions import send_position_messages
+from src.alpaca_daily_losers.global_functions import (
+    get_batched_historical_data,
+    get_ticker_data,
+    send_position_messages,
+)
 
 production = os.environ.get("PRODUCTION", False)
 
@@ -76,3 +82,137 @@ def test_send_position_messages_no_positions():
     pos_type = "sell"
     result = send_position_messages(positions, pos_type)
     assert True if result else False
+
+
+def test_get_ticker_data_preserves_ticker_order(fake_stock):
+    tickers = ["MSFT", "A", "GOOGL", "TSLA"]
+    stock = fake_stock(delay=0.01)
+
+    result = get_ticker_data(tickers, stock, max_workers=4, batch_size=1)
+
+    assert result["symbol"].tolist() == tickers
+    for window in [14, 30, 50, 200]:
+        assert {f"rsi{window}", f"bbhi{window}", f"bblo{window}"} <= set(result.columns)
+
+
+def test_get_ticker_data_bounds_in_flight_requests(fake_stock):
+    stock = fake_stock(delay=0.02)
+    tickers = [f"T{i}" for i in range(12)]
+
+    result = get_ticker_data(tickers, stock, max_workers=3, batch_size=1)
+
+    assert len(result) == len(tickers)
+    assert 1 < stock.history.max_in_flight <= 3
+
+
+def test_get_ticker_data_isolates_ticker_errors(fake_stock):
+    result = get_ticker_data(
+        ["AAPL", "BAD", "MSFT"], fake_stock(failing=["BAD"]), max_workers=2, batch_size=1
+    )
+
+    assert result["symbol"].tolist() == ["AAPL", "MSFT"]
+
+
+def test_get_ticker_data_matches_sequential_fetch(fake_stock):
+    tickers = ["AAPL", "AMZN", "NVDA"]
+
+    concurrent = get_ticker_data(tickers, fake_stock(), max_workers=3, batch_size=1)
+    sequential = get_ticker_data(tickers, fake_stock(), max_workers=1, batch_size=1)
+
+    pd.testing.assert_frame_equal(concurrent, sequential)
+
+
+def api_bars(history):
+    return [
+        {
+            "t": date.strftime("%Y-%m-%dT05:00:00Z"),
+            "o": row.open,
+            "h": row.high,
+            "l": row.low,
+            "c": row.close,
+            "v": 1000,
+            "n": 10,
+            "vw": row.vwap,
+        }
+        for date, row in zip(history["date"], history.itertuples())
+    ]
+
+
+def mock_pages(mocker, pages):
+    responses = [mocker.Mock(text=json.dumps(page)) for page in pages]
+    requests = mocker.patch("src.alpaca_daily_losers.global_functions.Requests")
+    requests.return_value.request.side_effect = responses
+    return requests.return_value.request
+
+
+def test_get_batched_historical_data_merges_pages(mocker, make_history):
+    aapl = api_bars(make_history("AAPL", periods=5))
+    msft = api_bars(make_history("MSFT", periods=5))
+    request = mock_pages(
+        mocker,
+        [
+            {"bars": {"AAPL": aapl}, "next_page_token": "page2"},
+            {"bars": {"AAPL": [], "MSFT": msft[:2]}, "next_page_token": "page3"},
+            {"bars": {"MSFT": msft[2:]}, "next_page_token": None},
+        ],
+    )
+    stock_client = mocker.Mock()
+    stock_client.history.data_url = "https://data.example/v2"
+
+    result = get_batched_historical_data(
+        stock_client, ["AAPL", "MSFT", "NONE"], "2023-01-01", "2023-01-10"
+    )
+
+    assert request.call_count == 3
+    assert request.call_args.kwargs["url"] == "https://data.example/v2/stocks/bars"
+    assert request.call_args.kwargs["params"]["symbols"] == "AAPL,MSFT,NONE"
+    assert sorted(result) == ["AAPL", "MSFT"]
+    assert result["MSFT"]["close"].tolist() == [bar["c"] for bar in msft]
+    assert list(result["AAPL"].columns[:2]) == ["symbol", "date"]
+
+
+def test_get_ticker_data_batches_symbols(mocker, make_history):
+    tickers = [f"T{i}" for i in range(5)]
+    pages = [
+        {"bars": {ticker: api_bars(make_history(ticker)) for ticker in tickers[:2]}},
+        {"bars": {ticker: api_bars(make_history(ticker)) for ticker in tickers[2:4]}},
+        {"bars": {ticker: api_bars(make_history(ticker)) for ticker in tickers[4:]}},
+    ]
+    request = mock_pages(mocker, pages)
+
+    result = get_ticker_data(tickers, mocker.Mock(), max_workers=1, batch_size=2)
+
+    assert request.call_count == 3
+    assert result["symbol"].tolist() == tickers
+
+
+def test_get_ticker_data_requests_tickers_of_failed_batch_one_by_one(mocker, make_history):
+    tickers = [f"T{i}" for i in range(4)]
+    request = mock_pages(
+        mocker, [{"bars": {ticker: api_bars(make_history(ticker)) for ticker in tickers[:2]}}]
+    )
+    request.side_effect = [*request.side_effect, Exception("504 Gateway Timeout")]
+    stock_client = mocker.Mock()
+    stock_client.history.get_stock_data.side_effect = lambda symbol, start, end: make_history(
+        symbol
+    )
+
+    result = get_ticker_data(tickers, stock_client, max_workers=1, batch_size=2)
+
+    assert result["symbol"].tolist() == tickers
+    fetched = [call.kwargs["symbol"] for call in stock_client.history.get_stock_data.call_args_list]
+    assert fetched == ["T2", "T3"]
+
+
+def test_get_ticker_data_does_not_validate_batched_tickers(mocker, make_history):
+    request = mock_pages(
+        mocker, [{"bars": {ticker: api_bars(make_history(ticker)) for ticker in ["AAPL", "MSFT"]}}]
+    )
+    stock_client = mocker.Mock()
+
+    result = get_ticker_data(["AAPL", "BTCUSD", "MSFT"], stock_client, max_workers=1, batch_size=3)
+
+    assert request.call_count == 1
+    assert request.call_args.kwargs["params"]["symbols"] == "AAPL,BTCUSD,MSFT"
+    stock_client.history.check_if_stock.assert_not_called()
+    assert result["symbol"].tolist() == ["AAPL", "MSFT"]
@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from alpaca_daily_losers.global_functions import get_ticker_data
+from alpaca_daily_losers.indicator_state import IndicatorState, IndicatorStateStore
+from alpaca_daily_losers.indicators import align_closes, calculate_panel_indicators
+
+
+@pytest.fixture
+def state_store(tmp_path):
+    return IndicatorStateStore(str(tmp_path / "state.sqlite"))
+
+
+@pytest.mark.parametrize("periods", [20, 260, 600])
+def test_incremental_state_matches_panel(periods, make_history):
+    history = make_history("AAPL", periods, seed=periods)
+    state = IndicatorState("AAPL")
+
+    state.update_from_history(history)
+
+    expected = calculate_panel_indicators(align_closes([history["close"]]))
+    for column, value in state.indicators().items():
+        np.testing.assert_allclose(value, expected[column][0, -1], rtol=1e-9, equal_nan=True)
+
+
+def test_update_from_history_skips_applied_bars(make_history):
+    history = make_history("AAPL", 30)
+    state = IndicatorState("AAPL")
+
+    assert state.update_from_history(history.iloc[:20]) == 20
+    assert state.update_from_history(history.iloc[15:]) == 10
+    assert state.count == 30
+    assert state.last_date == history["date"].iloc[-1].strftime("%Y-%m-%d")
+
+
+def test_state_round_trips_through_store(state_store, make_history):
+    history = make_history("AAPL", 300)
+    uninterrupted = IndicatorState("AAPL")
+    uninterrupted.update_from_history(history)
+
+    state = IndicatorState("AAPL")
+    state.update_from_history(history.iloc[:299])
+    state_store.put_many([state])
+    restored = state_store.get_many(["AAPL", "MSFT"])["AAPL"]
+    restored.update_from_history(history)
+
+    assert restored.count == uninterrupted.count
+    for column, value in uninterrupted.indicators().items():
+        np.testing.assert_allclose(restored.indicators()[column], value, rtol=1e-9)
+
+
+def test_get_ticker_data_with_state_store_requests_only_new_bars(state_store, make_history):
+    history = make_history("AAPL", 260)
+    stock_client = MagicMock()
+    stock_client.history.get_stock_data.return_value = history.iloc[:259]
+
+    get_ticker_data(["AAPL"], stock_client, state_store=state_store, batch_size=1)
+
+    stock_client.history.get_stock_data.return_value = history.iloc[258:]
+    result = get_ticker_data(["AAPL"], stock_client, state_store=state_store, batch_size=1)
+
+    second_call = stock_client.history.get_stock_data.call_args_list[1].kwargs
+    assert second_call["start"] == history["date"].iloc[258].strftime("%Y-%m-%d")
+    expected = calculate_panel_indicators(align_closes([history["close"]]))
+    for column, values in expected.items():
+        np.testing.assert_allclose(result[column].iloc[0], values[0, -1], rtol=1e-6)
+
+
+def test_get_ticker_data_reseeds_state_when_new_bars_leave_a_gap(state_store, make_history):
+    history = make_history("AAPL", 300)
+    stock_client = MagicMock()
+    stock_client.history.get_stock_data.return_value = history.iloc[:200]
+    get_ticker_data(["AAPL"], stock_client, state_store=state_store, batch_size=1)
+
+    stock_client.history.get_stock_data.side_effect = [history.iloc[250:], history.iloc[40:]]
+    result = get_ticker_data(["AAPL"], stock_client, state_store=state_store, batch_size=1)
+
+    calls = stock_client.history.get_stock_data.call_args_list
+    assert calls[1].kwargs["start"] == history["date"].iloc[199].strftime("%Y-%m-%d")
+    assert calls[2].kwargs["start"] == calls[0].kwargs["start"]
+    expected = calculate_panel_indicators(align_closes([history["close"].iloc[40:]]))
+    for column, values in expected.items():
+        np.testing.assert_allclose(result[column].iloc[0], values[0, -1], rtol=1e-6)
+    last_date = history["date"].iloc[-1].strftime("%Y-%m-%d")
+    assert state_store.get_many(["AAPL"])["AAPL"].last_date == last_date
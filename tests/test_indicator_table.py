@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+from alpaca_daily_losers.indicator_table import IndicatorTable
+
+
+def indicator_values(rsi, bbhi=0, bblo=0, windows=(14, 30, 50, 200)):
+    values = {}
+    for window in windows:
+        values[f"rsi{window}"] = rsi
+        values[f"bbhi{window}"] = bbhi
+        values[f"bblo{window}"] = bblo
+    return values
+
+
+def test_to_pandas_returns_ticker_order_and_compact_dtypes():
+    table = IndicatorTable(["AAPL", "MSFT", "GOOG"])
+    table.append("GOOG", indicator_values(25.0, bblo=1))
+    table.append("AAPL", indicator_values(75.5, bbhi=1))
+
+    df = table.to_pandas()
+
+    assert df["symbol"].tolist() == ["AAPL", "GOOG"]
+    assert df.columns.tolist()[:4] == ["symbol", "rsi14", "bbhi14", "bblo14"]
+    assert df["rsi14"].dtype == np.float32
+    assert df["bbhi14"].dtype == np.int8
+    assert df["rsi200"].tolist() == [75.5, 25.0]
+    assert df["bblo50"].tolist() == [0, 1]
+
+
+def test_extend_fills_rows_from_indicator_arrays():
+    table = IndicatorTable(["A", "B", "C"], windows=[14])
+    table.extend(
+        ["C", "A"],
+        {
+            "rsi14": np.array([10.0, np.nan]),
+            "bbhi14": np.array([0.0, 1.0]),
+            "bblo14": np.array([1.0, 0.0]),
+        },
+    )
+
+    df = table.to_pandas()
+
+    assert table.size == 2
+    assert df["symbol"].tolist() == ["A", "C"]
+    assert np.isnan(df["rsi14"].iloc[0])
+    assert df["bbhi14"].tolist() == [1, 0]
+
+
+def test_rows_round_trip_through_append():
+    table = IndicatorTable(["A", "B"])
+    table.append("B", indicator_values(40.0))
+    table.append("A", indicator_values(60.0, bbhi=1))
+
+    rows = list(table.rows())
+
+    assert [symbol for symbol, _ in rows] == ["A", "B"]
+    assert rows[0][1] == indicator_values(60.0, bbhi=1)
+
+
+def test_to_pandas_on_empty_table():
+    df = IndicatorTable(["A"]).to_pandas()
+
+    assert isinstance(df, pd.DataFrame)
+    assert df.empty
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ta.momentum import RSIIndicator
+from ta.volatility import BollingerBands
+
+from alpaca_daily_losers.global_functions import calculate_indicators
+from alpaca_daily_losers.indicators import (
+    INDICATOR_WINDOWS,
+    align_closes,
+    calculate_latest_indicators,
+    calculate_panel_indicators,
+)
+
+
+def random_closes(length, seed):
+    rng = np.random.default_rng(seed)
+    return pd.Series(50 + np.cumsum(rng.normal(0, 1.5, length)))
+
+
+def ta_indicators(close, window):
+    bb = BollingerBands(close=close, window=window, window_dev=2)
+    return {
+        f"rsi{window}": RSIIndicator(close=close, window=window).rsi().to_numpy(),
+        f"bbhi{window}": bb.bollinger_hband_indicator().to_numpy(),
+        f"bblo{window}": bb.bollinger_lband_indicator().to_numpy(),
+    }
+
+
+def test_align_closes_right_aligns_and_pads():
+    panel = align_closes([pd.Series([1.0, 2.0, 3.0]), pd.Series([4.0])])
+
+    np.testing.assert_array_equal(panel[0], [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(panel[1], [np.nan, np.nan, 4.0])
+
+
+@pytest.mark.parametrize("lengths", [[252, 252, 252], [252, 180, 40, 13]])
+def test_panel_indicators_match_ta(lengths):
+    closes = [random_closes(length, seed) for seed, length in enumerate(lengths)]
+
+    indicators = calculate_panel_indicators(align_closes(closes))
+
+    for row, close in enumerate(closes):
+        for window in INDICATOR_WINDOWS:
+            for column, expected in ta_indicators(close, window).items():
+                actual = indicators[column][row, -len(close) :]
+                np.testing.assert_allclose(actual, expected, rtol=1e-9, equal_nan=True)
+
+
+def test_panel_rsi_is_100_without_losses():
+    close = pd.Series(np.arange(1.0, 31.0))
+
+    indicators = calculate_panel_indicators(align_closes([close]), [14])
+
+    assert np.isnan(indicators["rsi14"][0, 12])
+    assert (indicators["rsi14"][0, 13:] == 100.0).all()
+
+
+def test_calculate_indicators_adds_columns():
+    history = pd.DataFrame({"close": random_closes(100, 7)})
+
+    history = calculate_indicators(history, 30)
+
+    for column, expected in ta_indicators(history["close"], 30).items():
+        np.testing.assert_allclose(history[column], expected, rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("lengths", [[252, 252], [300, 199, 50, 10]])
+def test_latest_indicators_match_last_panel_column(lengths):
+    closes = align_closes([random_closes(length, seed) for seed, length in enumerate(lengths)])
+
+    panel = calculate_panel_indicators(closes)
+    latest = calculate_latest_indicators(closes)
+
+    assert list(latest) == list(panel)
+    for column, values in latest.items():
+        assert values.shape == (len(lengths),)
+        np.testing.assert_allclose(values, panel[column][:, -1], rtol=1e-9, equal_nan=True)
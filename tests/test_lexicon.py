@@ -0,0 +1,115 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from alpaca_daily_losers.lexicon import LexiconClassifier
+from alpaca_daily_losers.openai import OpenAIAPI, TierMetrics
+
+
+def make_article(title, content="", symbol="AAPL"):
+    return {"title": title, "symbol": symbol, "content": content, "url": title}
+
+
+def make_response(content):
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+def test_score_counts_lexicon_hits():
+    classifier = LexiconClassifier()
+    scores, hits = classifier.score(["Shares surge as profit beats", "Revenue fell", "Hello"])
+
+    assert list(hits) == [3, 1, 0]
+    assert list(scores) == [1.0, -1.0, 0.0]
+
+
+def test_classify_resolves_only_confident_articles():
+    classifier = LexiconClassifier()
+    articles = [
+        make_article("Apple beats estimates", "Shares surge on strong growth and record profit."),
+        make_article("Apple misses", "Shares plunge after weak guidance and a lawsuit."),
+        make_article("Apple to present at investor conference"),
+        make_article("Apple beats on revenue", "Margins decline."),
+        make_article("Apple launches a new phone"),
+    ]
+
+    assert classifier.classify(articles) == ["BULLISH", "BEARISH", "NEUTRAL", None, None]
+
+
+def test_mixed_articles_are_escalated():
+    classifier = LexiconClassifier()
+    article = make_article("Stock jumps then falls", "Gains and losses, upgrade and downgrade.")
+
+    assert classifier.classify([article]) == [None]
+
+
+def test_cascade_only_sends_ambiguous_articles_to_llm():
+    api = OpenAIAPI(pre_classifier=LexiconClassifier())
+    articles = [
+        make_article("Apple beats estimates", "Shares surge on strong growth and record profit."),
+        make_article("Apple launches a new phone"),
+        make_article("Apple unveils a new chip"),
+    ]
+    content = json.dumps(["BULLISH", "NEUTRAL"])
+
+    with patch.object(
+        api, "completion_with_backoff", return_value=make_response(content)
+    ) as mock_completion:
+        assert api.get_sentiment_analyses(articles) == ["BULLISH", "BULLISH", "NEUTRAL"]
+
+    prompt = mock_completion.call_args.kwargs["messages"][1]["content"]
+    assert "Apple beats estimates" not in prompt
+    assert api.metrics.stats() == {
+        "lexicon": {"attempts": 3, "hits": 1, "hit_rate": 0.3333},
+        "llm": {"attempts": 2, "hits": 2, "hit_rate": 1.0},
+    }
+
+
+def test_single_analysis_skips_llm_for_confident_article():
+    api = OpenAIAPI(pre_classifier=LexiconClassifier())
+
+    with patch.object(api, "completion_with_backoff") as mock_completion:
+        sentiment = api.get_sentiment_analysis(
+            "Apple misses", "AAPL", "Shares plunge after weak guidance and a lawsuit."
+        )
+
+    assert sentiment == "BEARISH"
+    mock_completion.assert_not_called()
+
+
+def test_tier_metrics_counts_unresolved_articles():
+    metrics = TierMetrics()
+    metrics.record("cache", [None, "BULLISH"])
+    metrics.record("cache", [None])
+
+    assert metrics.stats() == {"cache": {"attempts": 3, "hits": 1, "hit_rate": 0.3333}}
+
+
+def test_directional_articles_with_boilerplate_phrases_are_escalated():
+    classifier = LexiconClassifier()
+    articles = [
+        make_article(
+            "Apple cuts guidance, announces layoffs",
+            "Management discussed the outlook on a conference call with analysts.",
+        ),
+        make_article(
+            "Apple beats and raises outlook",
+            "The company will host a webcast to discuss the results.",
+        ),
+        make_article(
+            "SEC probes Apple",
+            "Regulators say the company failed to report related-party transactions.",
+        ),
+    ]
+
+    assert classifier.classify(articles) == [None, None, None]
+
+
+def test_boilerplate_is_matched_in_title_only():
+    classifier = LexiconClassifier()
+    articles = [
+        make_article("Apple to report second quarter results", "Details of the call follow."),
+        make_article("Apple launches a new phone", "Apple to present at investor conference."),
+    ]
+
+    assert classifier.classify(articles) == ["NEUTRAL", None]
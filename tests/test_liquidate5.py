@@ -1,11 +1,13 @@
 import logging
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from alpaca_daily_losers.liquidate import (
-    Liquidate,  # assuming the module name is liquidate.py
+from alpaca_daily_losers.liquidate import (  # assuming the module name is liquidate.py
+    Liquidate,
+    allocate_cash,
 )
 
 
@@ -86,9 +88,7 @@ def test_liquidate_positions_insufficient_cash(liquidate, mock_trading_client):
 def test_sell_top_performers(liquidate, mock_trading_client):
     top_performers = pd.DataFrame({"symbol": ["AAPL", "MSFT"], "market_value": [500.0, 1000.0]})
 
-    result = liquidate._sell_top_performers(
-        top_performers, top_performers["market_value"].sum(), 150.0
-    )
+    result = liquidate._sell_top_performers(top_performers, 150.0)
     expected_result = [{"symbol": "AAPL", "notional": 50}, {"symbol": "MSFT", "notional": 100}]
     assert result == expected_result
 
@@ -98,14 +98,74 @@ def test_sell_top_performers_with_zero_to_sell(liquidate, mock_trading_client):
 
     liquidate.trade.orders.market = MagicMock()
 
-    result = liquidate._sell_top_performers(
-        top_performers, top_performers["market_value"].sum(), 1.0
-    )
+    result = liquidate._sell_top_performers(top_performers, 1.0)
+    # A proportional split gives both positions less than the minimum order, so the whole
+    # amount is sold from the larger position.
+    assert result == [{"symbol": "MSFT", "notional": 1.0}]
+    assert liquidate.trade.orders.market.call_count == 1
+    assert liquidate.trade.orders.market.call_args.kwargs["symbol"] == "MSFT"
+
+
+def test_sell_top_performers_below_minimum_notional_sells_nothing(liquidate, mock_trading_client):
+    top_performers = pd.DataFrame({"symbol": ["AAPL", "MSFT"], "market_value": [500.0, 1000.0]})
+
+    liquidate.trade.orders.market = MagicMock()
+
+    result = liquidate._sell_top_performers(top_performers, 0.5)
     assert not result
     assert liquidate.trade.orders.market.call_count == 0
 
 
+def test_sell_top_performers_hits_cash_needed_exactly(liquidate, mock_trading_client):
+    top_performers = pd.DataFrame(
+        {"symbol": ["AAPL", "MSFT", "GOOG"], "market_value": [100.0, 100.0, 100.0]}
+    )
+
+    result = liquidate._sell_top_performers(top_performers, 100.0)
+
+    assert result == [
+        {"symbol": "AAPL", "notional": 33.34},
+        {"symbol": "MSFT", "notional": 33.33},
+        {"symbol": "GOOG", "notional": 33.33},
+    ]
+
+
+def test_sell_top_performers_skips_amounts_below_minimum(liquidate, mock_trading_client):
+    top_performers = pd.DataFrame({"symbol": ["AAPL", "MSFT"], "market_value": [500.0, 1000.0]})
+
+    result = liquidate._sell_top_performers(top_performers, 1.0)
+
+    assert result == [{"symbol": "MSFT", "notional": 1.0}]
+
+
 def test_send_liquidation_message():
     with patch("src.alpaca_daily_losers.global_functions.send_message") as mock_send_message:
         Liquidate._send_liquidation_message("Test Message")
         mock_send_message == "Test Message"
+
+
+def test_allocate_cash_is_capped_by_market_value():
+    market_values = np.array([99.5, 0.6, 40.0])
+
+    amounts = allocate_cash(market_values, 1000.0)
+
+    assert amounts.tolist() == [99.5, 0.0, 40.0]
+
+
+def test_allocate_cash_hits_target_for_large_portfolios():
+    market_values = np.random.default_rng(0).uniform(1.0, 100_000.0, 500)
+
+    amounts = allocate_cash(market_values, 123456.78)
+
+    assert round(amounts.sum(), 2) == 123456.78
+    assert (amounts <= market_values).all()
+    assert amounts[amounts > 0].min() >= 1.0
+
+
+def test_allocate_cash_keeps_cents_of_float_market_values():
+    market_values = np.array([294.15, 0.0])
+
+    amounts = allocate_cash(market_values, 500.0)
+
+    assert amounts.tolist() == [294.15, 0.0]
+    assert round(allocate_cash(np.array([294.15, 294.15]), 588.3).sum(), 2) == 588.3
@@ -0,0 +1,93 @@
+import logging
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from alpaca_daily_losers.close_positions import ClosePositions
+from alpaca_daily_losers.market_data import MarketData
+
+
+def make_history(symbol, periods=60, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, periods))
+    return pd.DataFrame(
+        {
+            "symbol": symbol,
+            "date": pd.bdate_range("2024-01-01", periods=periods),
+            "close": close,
+        }
+    )
+
+
+@pytest.fixture
+def mock_get_histories(mocker):
+    return mocker.patch(
+        "alpaca_daily_losers.market_data.get_histories",
+        side_effect=lambda tickers, *args, **kwargs: [
+            make_history(ticker) for ticker in tickers if ticker != "NODATA"
+        ],
+    )
+
+
+@pytest.fixture
+def market_data():
+    return MarketData(stock_client=MagicMock(), py_logger=logging.getLogger("test_logger"))
+
+
+def test_get_ticker_data_fetches_each_symbol_once(market_data, mock_get_histories):
+    first = market_data.get_ticker_data(["AAPL", "MSFT"])
+    second = market_data.get_ticker_data(["MSFT", "GOOG", "AAPL"])
+
+    assert mock_get_histories.call_count == 2
+    assert mock_get_histories.call_args_list[1].args[0] == ["GOOG"]
+    assert first["symbol"].tolist() == ["AAPL", "MSFT"]
+    assert second["symbol"].tolist() == ["MSFT", "GOOG", "AAPL"]
+    pd.testing.assert_series_equal(second.iloc[0], first.iloc[1], check_names=False)
+    assert market_data.stats() == {
+        "history_hits": 0,
+        "history_misses": 3,
+        "row_hits": 2,
+        "row_misses": 3,
+    }
+
+
+def test_get_ticker_data_memoizes_missing_symbols(market_data, mock_get_histories):
+    assert market_data.get_ticker_data(["NODATA"]).empty
+    assert market_data.get_ticker_data(["NODATA"]).empty
+
+    assert mock_get_histories.call_count == 1
+    assert market_data.stats()["row_hits"] == 1
+
+
+def test_get_histories_reuses_fetched_histories(market_data, mock_get_histories):
+    market_data.get_histories(["AAPL"])
+    histories = market_data.get_histories(["AAPL", "TSLA"])
+
+    assert [history["symbol"].iloc[0] for history in histories] == ["AAPL", "TSLA"]
+    assert market_data.stats()["history_hits"] == 1
+    assert market_data.stats()["history_misses"] == 2
+
+
+def test_get_stocks_to_sell_uses_market_data(mocker):
+    trade_mock = mocker.Mock()
+    trade_mock.positions.get_all.return_value = pd.DataFrame(
+        {"symbol": ["AAPL", "Cash"], "profit_pct": [1.0, 0.0]}
+    )
+    market_data = mocker.Mock()
+    market_data.get_ticker_data.return_value = pd.DataFrame(
+        {
+            "symbol": ["AAPL"],
+            **{f"rsi{window}": [75.0] for window in [14, 30, 50, 200]},
+            **{f"bbhi{window}": [0.0] for window in [14, 30, 50, 200]},
+        }
+    )
+    mock_get_ticker_data = mocker.patch("alpaca_daily_losers.close_positions.get_ticker_data")
+    instance = ClosePositions(trade_mock, stock_client=mocker.Mock(), py_logger=mocker.Mock())
+
+    result = instance.get_stocks_to_sell(market_data=market_data)
+
+    assert result == ["AAPL"]
+    market_data.get_ticker_data.assert_called_once_with(["AAPL"])
+    mock_get_ticker_data.assert_not_called()
@@ -0,0 +1,117 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from alpaca_daily_losers.article_registry import ArticleRegistry
+from alpaca_daily_losers.near_duplicates import MinHasher, NearDuplicateIndex
+from alpaca_daily_losers.news_sentiment import NewsSentimentEvaluator
+from alpaca_daily_losers.openai import OpenAIAPI
+from alpaca_daily_losers.sentiment_cache import SentimentCache
+
+STORY = (
+    "Acme Corp reported third quarter revenue of 4.2 billion dollars on Tuesday, ahead of "
+    "analyst expectations, as demand for its cloud software grew across every region. The "
+    "company also raised its full year outlook and announced a new share repurchase program "
+    "worth two billion dollars, sending the stock higher in extended trading."
+)
+SYNDICATED = STORY + " Reporting by a wire service; editing by the news desk."
+UNRELATED = (
+    "Regulators opened an inquiry into Widget Inc after a series of product failures were "
+    "reported by customers in several states, and the company said it would cooperate fully "
+    "with the investigation while pausing shipments of the affected models."
+)
+
+
+def make_article(url, content, symbol="ACME"):
+    return {"title": f"Headline {url}", "symbol": symbol, "content": content, "url": url}
+
+
+def make_response(content):
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+def test_similarity_of_near_duplicates_and_unrelated_texts():
+    hasher = MinHasher()
+
+    assert hasher.similarity(hasher.signature(STORY), hasher.signature(SYNDICATED)) > 0.7
+    assert hasher.similarity(hasher.signature(STORY), hasher.signature(UNRELATED)) < 0.2
+    assert hasher.signature("") is None
+
+
+def test_index_clusters_syndicated_copies():
+    index = NearDuplicateIndex()
+
+    assert index.representative("a", STORY) == "a"
+    assert index.representative("b", SYNDICATED) == "a"
+    assert index.representative("c", UNRELATED) == "c"
+    assert index.representative("b", UNRELATED) == "a"
+
+
+def test_registry_classifies_one_copy_per_story():
+    registry = ArticleRegistry(NearDuplicateIndex())
+    classify = MagicMock(side_effect=lambda articles: ["BULLISH"] * len(articles))
+
+    sentiments = registry.classify(
+        [make_article("a", STORY), make_article("b", SYNDICATED, "ACM")], classify
+    )
+
+    assert sentiments == ["BULLISH", "BULLISH"]
+    assert [article["url"] for article in classify.call_args.args[0]] == ["a"]
+
+
+def test_copies_of_a_story_count_as_one_vote():
+    openai = MagicMock()
+    openai.get_local_sentiments.side_effect = lambda articles: [None] * len(articles)
+    openai.classify_articles.side_effect = lambda articles: [
+        "BULLISH" if article["content"] == STORY else "BEARISH" for article in articles
+    ]
+    evaluator = NewsSentimentEvaluator(
+        MagicMock(), openai, MagicMock(), 3, article_registry=ArticleRegistry(NearDuplicateIndex())
+    )
+    articles = [
+        make_article("a", STORY),
+        make_article("b", SYNDICATED),
+        make_article("c", UNRELATED),
+    ]
+
+    assert not evaluator.is_majority_bullish(evaluator.distinct_stories(articles))
+
+
+def test_near_duplicate_reuses_sentiment_across_runs(tmp_path):
+    path = str(tmp_path / "sentiment.db")
+    first_run = OpenAIAPI(sentiment_cache=SentimentCache(path), minhasher=MinHasher())
+    with patch.object(first_run, "completion_with_backoff", return_value=make_response("BULLISH")):
+        first_run.get_sentiment_analysis("Acme beats", "ACME", STORY, article_id="a")
+
+    second_run = OpenAIAPI(sentiment_cache=SentimentCache(path), minhasher=MinHasher())
+    with patch.object(second_run, "completion_with_backoff") as mock_completion:
+        sentiments = second_run.get_local_sentiments(
+            [make_article("b", SYNDICATED), make_article("c", UNRELATED)]
+        )
+
+    assert sentiments == ["BULLISH", None]
+    mock_completion.assert_not_called()
+
+
+def test_purge_removes_orphaned_signatures(tmp_path):
+    cache = SentimentCache(str(tmp_path / "sentiment.db"), ttl=10, clock=lambda: 0)
+    cache.put_signature("missing", b"\x00", ["0:x"])
+
+    cache.purge_expired()
+
+    assert cache.similar_candidates(["0:x"]) == []
+
+
+def test_batch_results_store_signatures(tmp_path):
+    cache = SentimentCache(str(tmp_path / "sentiment.db"))
+    api = OpenAIAPI(sentiment_cache=cache, minhasher=MinHasher())
+    articles = [make_article("a", STORY), make_article("c", UNRELATED)]
+
+    with patch.object(
+        api, "completion_with_backoff", return_value=make_response(json.dumps(["BULLISH"] * 2))
+    ):
+        api.get_sentiment_analyses(articles)
+
+    band_keys = api.minhasher.band_keys(api.minhasher.signature(SYNDICATED))
+    assert len(cache.similar_candidates(band_keys)) == 1
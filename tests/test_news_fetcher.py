@@ -0,0 +1,119 @@
+import threading
+from unittest.mock import MagicMock
+
+from alpaca_daily_losers.news_cache import NewsCache
+from alpaca_daily_losers.news_fetcher import NewsFetcher
+from alpaca_daily_losers.news_sentiment import NewsSentimentEvaluator
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_articles(symbol, urls):
+    return [
+        {
+            "title": f"Title {url}",
+            "url": url,
+            "source": "benzinga",
+            "content": f"Content of {url}",
+            "publish_date": f"2024-06-0{index + 1}T00:00:00Z",
+            "symbol": symbol,
+        }
+        for index, url in enumerate(urls)
+    ]
+
+
+def test_cache_serves_last_fetch_until_refresh(tmp_path):
+    clock = Clock()
+    cache = NewsCache(str(tmp_path / "news.db"), refresh_interval=60, clock=clock)
+    articles = make_articles("AAPL", ["b", "a"])
+
+    assert cache.get("AAPL", 2, 100) is None
+    assert cache.put("AAPL", articles, 2, 100) == 2
+    assert cache.get("AAPL", 2, 100) == articles
+    assert [a["content"] for a in cache.get("AAPL", 1, 4)] == ["Cont"]
+    assert cache.get("AAPL", 3, 100) is None
+    assert cache.get("AAPL", 2, 200) is None
+
+    clock.now += 61
+    assert cache.get("AAPL", 2, 100) is None
+    assert cache.put("AAPL", make_articles("AAPL", ["c", "b"]), 2, 100) == 1
+    assert [a["url"] for a in cache.get("AAPL", 2, 100)] == ["c", "b"]
+
+
+def test_cache_does_not_serve_fetch_with_articles_missing_url(tmp_path):
+    cache = NewsCache(str(tmp_path / "news.db"))
+    articles = make_articles("AAPL", ["a"]) + [{"title": "t", "content": "c", "symbol": "AAPL"}]
+
+    cache.put("AAPL", articles, 2, 100)
+
+    assert cache.get("AAPL", 2, 100) is None
+
+
+def test_fetcher_uses_cache(tmp_path):
+    news = MagicMock()
+    news.get_news.return_value = make_articles("AAPL", ["a"])
+    fetcher = NewsFetcher(news, NewsCache(str(tmp_path / "news.db")))
+
+    assert fetcher.get_news("AAPL", limit=1, content_length=100) == make_articles("AAPL", ["a"])
+    assert fetcher.get_news("AAPL", limit=1, content_length=100) == make_articles("AAPL", ["a"])
+    assert news.get_news.call_count == 1
+
+
+def test_get_news_many_fetches_concurrently_and_logs_errors():
+    barrier = threading.Barrier(3, timeout=1)
+
+    def get_news(symbol, limit, content_length):
+        barrier.wait()
+        if symbol == "BAD":
+            raise Exception("unavailable")
+        return make_articles(symbol, [symbol])
+
+    news = MagicMock()
+    news.get_news.side_effect = get_news
+    logger = MagicMock()
+    fetcher = NewsFetcher(news, py_logger=logger, max_workers=3)
+
+    result = fetcher.get_news_many(["AAPL", "MSFT", "BAD"], limit=1)
+
+    assert result == {
+        "AAPL": make_articles("AAPL", ["AAPL"]),
+        "MSFT": make_articles("MSFT", ["MSFT"]),
+        "BAD": [],
+    }
+    logger.warning.assert_called_once()
+    fetcher.close()
+
+
+def test_get_news_reuses_prefetched_download():
+    news = MagicMock()
+    news.get_news.side_effect = lambda symbol, limit, content_length: make_articles(symbol, ["a"])
+    fetcher = NewsFetcher(news)
+
+    fetcher.prefetch(["AAPL", "AAPL"], limit=1, content_length=100)
+    fetcher.get_news("AAPL", limit=1, content_length=100)
+
+    assert news.get_news.call_count == 1
+    fetcher.close()
+
+
+def test_evaluator_fetches_news_through_fetcher():
+    news = MagicMock()
+    news.get_news.side_effect = lambda symbol, limit, content_length: make_articles(
+        symbol, ["a", "b", "c"]
+    )
+    fetcher = NewsFetcher(news)
+    openai = MagicMock()
+    openai.get_local_sentiments.side_effect = lambda articles: [None] * len(articles)
+    openai.classify_articles.side_effect = lambda articles: ["BEARISH"] * len(articles)
+    evaluator = NewsSentimentEvaluator(fetcher, openai, MagicMock(), 3, max_workers=1)
+
+    assert evaluator.filter_tickers(["AAA", "BBB", "CCC"], 1) == []
+    fetched = sorted(call.kwargs["symbol"] for call in news.get_news.call_args_list)
+    assert fetched == ["AAA", "BBB", "CCC"]
+    fetcher.close()
@@ -0,0 +1,84 @@
+import threading
+from unittest.mock import MagicMock
+
+from alpaca_daily_losers.news_pipeline import NewsPipeline
+from alpaca_daily_losers.news_sentiment import NewsSentimentEvaluator
+
+
+def make_evaluator(get_news, classify, max_workers=1, lookahead=1):
+    news = MagicMock()
+    news.get_news.side_effect = get_news
+    openai = MagicMock()
+    openai.get_local_sentiments.side_effect = lambda articles: [None] * len(articles)
+    openai.classify_articles.side_effect = classify
+    return NewsSentimentEvaluator(
+        news, openai, MagicMock(), 1, max_workers=max_workers, lookahead=lookahead
+    )
+
+
+def articles(symbol, limit, content_length):
+    return [{"title": "t", "symbol": symbol, "content": "c"}]
+
+
+def test_news_of_next_ticker_is_fetched_during_classification():
+    next_fetched = threading.Event()
+
+    def get_news(symbol, limit, content_length):
+        if symbol == "BBB":
+            next_fetched.set()
+        return articles(symbol, limit, content_length)
+
+    def classify(batch):
+        if batch[0]["symbol"] == "AAA":
+            assert next_fetched.wait(1)
+        return ["BULLISH"]
+
+    evaluator = make_evaluator(get_news, classify)
+
+    assert evaluator.filter_tickers(["AAA", "BBB"], 2) == ["AAA", "BBB"]
+
+
+def test_fetching_is_bounded_while_classification_is_blocked():
+    release = threading.Event()
+    fetched = []
+
+    def get_news(symbol, limit, content_length):
+        fetched.append(symbol)
+        return articles(symbol, limit, content_length)
+
+    def classify(batch):
+        release.wait(1)
+        return ["BEARISH"]
+
+    evaluator = make_evaluator(get_news, classify)
+    timer = threading.Timer(0.3, release.set)
+    timer.start()
+
+    pipeline = NewsPipeline(evaluator, max_workers=1, lookahead=1)
+    thread = threading.Thread(target=pipeline.run, args=([f"T{i}" for i in range(10)], 1))
+    thread.start()
+    thread.join(0.2)
+    assert len(fetched) <= 2
+    thread.join(5)
+    timer.cancel()
+
+
+def test_outstanding_tickers_are_cancelled_once_limit_is_reached():
+    classified = []
+
+    def classify(batch):
+        classified.append(batch[0]["symbol"])
+        return ["BULLISH"]
+
+    evaluator = make_evaluator(articles, classify, lookahead=4)
+
+    assert evaluator.filter_tickers([f"T{i}" for i in range(6)], 1) == ["T0"]
+    assert set(classified) <= {"T0", "T1"}
+
+
+def test_tickers_without_enough_news_are_not_classified():
+    classify = MagicMock(return_value=["BULLISH"])
+    evaluator = make_evaluator(lambda symbol, limit, content_length: [], classify)
+
+    assert evaluator.filter_tickers(["AAA"], 1) == []
+    classify.assert_not_called()
@@ -0,0 +1,167 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from alpaca_daily_losers.news_sentiment import MajorityVote, NewsSentimentEvaluator
+
+
+def make_evaluator(sentiments, article_counts=None, delays=None, max_workers=4):
+    article_counts = article_counts or {}
+    delays = delays or {}
+    fetched = []
+    lock = threading.Lock()
+
+    def get_news(symbol, limit, content_length):
+        with lock:
+            fetched.append(symbol)
+        time.sleep(delays.get(symbol, 0))
+        if sentiments[symbol] is Exception:
+            raise Exception("news unavailable")
+        count = article_counts.get(symbol, limit)
+        return [{"title": "t", "symbol": symbol, "content": "c"}] * count
+
+    news = MagicMock()
+    news.get_news.side_effect = get_news
+    openai = MagicMock()
+    openai.get_local_sentiments.side_effect = lambda articles: [None] * len(articles)
+    openai.classify_articles.side_effect = lambda articles: [
+        sentiments[article["symbol"]] for article in articles
+    ]
+    evaluator = NewsSentimentEvaluator(
+        news, openai, MagicMock(), article_limit=3, max_workers=max_workers
+    )
+    return evaluator, fetched
+
+
+def test_filter_tickers_requires_enough_articles_and_majority():
+    evaluator, _ = make_evaluator(
+        {"AAA": "BULLISH", "BBB": "BULLISH", "CCC": "BEARISH"}, article_counts={"BBB": 2}
+    )
+    assert evaluator.filter_tickers(["AAA", "BBB", "CCC"], 3) == ["AAA"]
+
+
+def test_filter_tickers_deduplicates_stories_once_per_ticker():
+    evaluator, _ = make_evaluator({"AAA": "BULLISH"})
+    with patch.object(
+        evaluator, "distinct_stories", wraps=evaluator.distinct_stories
+    ) as distinct_stories:
+        assert evaluator.filter_tickers(["AAA"], 1) == ["AAA"]
+    distinct_stories.assert_called_once()
+
+
+def test_filter_tickers_keeps_priority_order():
+    sentiments = {"AAA": "BEARISH", "BBB": "BULLISH", "CCC": "BULLISH", "DDD": "BULLISH"}
+    evaluator, _ = make_evaluator(sentiments, delays={"BBB": 0.05})
+    assert evaluator.filter_tickers(["AAA", "BBB", "CCC", "DDD"], 2) == ["BBB", "CCC"]
+
+
+def test_filter_tickers_stops_submitting_once_limit_is_reached():
+    sentiments = {f"T{i}": "BULLISH" for i in range(20)}
+    evaluator, fetched = make_evaluator(sentiments, max_workers=2)
+    assert evaluator.filter_tickers(list(sentiments), 2) == ["T0", "T1"]
+    # News is fetched ahead for at most `lookahead` tickers beyond the workers.
+    assert len(fetched) <= 2 + evaluator.max_workers + evaluator.lookahead
+
+
+def test_filter_tickers_treats_errors_as_not_bullish():
+    sentiments = {"AAA": Exception, "BBB": "BULLISH"}
+    evaluator, _ = make_evaluator(sentiments)
+    assert evaluator.filter_tickers(["AAA", "BBB"], 2) == ["BBB"]
+    evaluator.py_logger.warning.assert_called_once()
+
+
+def test_filter_tickers_with_zero_limit():
+    evaluator, fetched = make_evaluator({"AAA": "BULLISH"})
+    assert evaluator.filter_tickers(["AAA"], 0) == []
+    assert fetched == []
+
+
+def make_voting_evaluator(article_order=None, cached=None):
+    openai = MagicMock()
+    openai.get_local_sentiments.side_effect = lambda articles: [
+        (cached or {}).get(article["title"]) for article in articles
+    ]
+    openai.classify_articles.side_effect = lambda articles: [
+        article["sentiment"] for article in articles
+    ]
+    evaluator = NewsSentimentEvaluator(
+        MagicMock(), openai, MagicMock(), article_limit=4, article_order=article_order
+    )
+    return evaluator, openai
+
+
+def make_articles(sentiments):
+    return [
+        {
+            "title": f"t{i}",
+            "symbol": "AAA",
+            "content": "c" * (10 - i),
+            "publish_date": f"2024-06-0{i + 1}",
+            "sentiment": sentiment,
+        }
+        for i, sentiment in enumerate(sentiments)
+    ]
+
+
+def classified(openai):
+    return [
+        [article["title"] for article in call.args[0]]
+        for call in openai.classify_articles.call_args_list
+    ]
+
+
+@pytest.mark.parametrize(
+    "votes, expected",
+    [
+        (["BEARISH", "NEUTRAL", "BULLISH", "BULLISH"], False),
+        (["BULLISH", "BULLISH", "BULLISH", "BEARISH"], True),
+        (["BULLISH", "BULLISH", "BEARISH", "BULLISH"], True),
+        (["BULLISH", "BEARISH", "BULLISH", "NEUTRAL"], False),
+    ],
+)
+def test_majority_vote_matches_full_count(votes, expected):
+    vote = MajorityVote(len(votes))
+    for sentiment in votes:
+        vote.add(sentiment)
+    assert vote.decision is expected
+    assert expected == (votes.count("BULLISH") > len(votes) // 2)
+
+
+def test_majority_vote_stops_once_bullish_is_impossible():
+    evaluator, openai = make_voting_evaluator()
+    assert not evaluator.is_majority_bullish(
+        make_articles(["BEARISH", "NEUTRAL", "BULLISH", "BULLISH"])
+    )
+    assert classified(openai) == [["t0", "t1"]]
+
+
+def test_majority_vote_classifies_until_decided():
+    evaluator, openai = make_voting_evaluator()
+    assert evaluator.is_majority_bullish(
+        make_articles(["BULLISH", "BULLISH", "BEARISH", "BULLISH"])
+    )
+    assert classified(openai) == [["t0", "t1"], ["t2"], ["t3"]]
+
+
+def test_majority_vote_counts_cached_sentiments_first():
+    evaluator, openai = make_voting_evaluator(cached={"t2": "BEARISH", "t3": "BEARISH"})
+    assert not evaluator.is_majority_bullish(
+        make_articles(["BULLISH", "BULLISH", "BULLISH", "BULLISH"])
+    )
+    openai.classify_articles.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "article_order, expected", [("recency", ["t3", "t2"]), ("length", ["t3", "t2"])]
+)
+def test_majority_vote_article_order(article_order, expected):
+    evaluator, openai = make_voting_evaluator(article_order)
+    evaluator.is_majority_bullish(make_articles(["BULLISH", "BULLISH", "BEARISH", "NEUTRAL"]))
+    assert classified(openai)[0] == expected
+
+
+def test_unknown_article_order_is_rejected():
+    with pytest.raises(ValueError):
+        NewsSentimentEvaluator(MagicMock(), MagicMock(), MagicMock(), 4, article_order="random")
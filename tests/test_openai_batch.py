@@ -0,0 +1,97 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from alpaca_daily_losers.openai import OpenAIAPI
+from alpaca_daily_losers.sentiment_cache import SentimentCache
+
+
+def make_response(content):
+    response = MagicMock()
+    response.choices[0].message.content = content
+    return response
+
+
+def make_articles(count):
+    return [
+        {"title": f"Title {i}", "symbol": "AAPL", "content": f"Body {i}", "url": f"url-{i}"}
+        for i in range(count)
+    ]
+
+
+def test_parse_batch_response_with_indexed_entries():
+    content = json.dumps(
+        {
+            "sentiments": [
+                {"index": 1, "sentiment": "bearish"},
+                {"index": 0, "sentiment": "BULLISH"},
+                {"index": 7, "sentiment": "BULLISH"},
+            ]
+        }
+    )
+    assert OpenAIAPI._parse_batch_response(content, 3) == ["BULLISH", "BEARISH", None]
+
+
+def test_parse_batch_response_with_plain_list_and_invalid_labels():
+    content = json.dumps(["NEUTRAL", "MAYBE", "Bullish."])
+    assert OpenAIAPI._parse_batch_response(content, 3) == ["NEUTRAL", None, "BULLISH"]
+
+
+def test_parse_batch_response_with_invalid_json():
+    assert OpenAIAPI._parse_batch_response("BULLISH, BEARISH", 2) == [None, None]
+
+
+def test_get_sentiment_analyses_uses_one_completion():
+    api = OpenAIAPI()
+    content = json.dumps(
+        {"sentiments": [{"index": i, "sentiment": s} for i, s in enumerate(["BULLISH"] * 4)]}
+    )
+
+    with patch.object(
+        api, "completion_with_backoff", return_value=make_response(content)
+    ) as mock_completion:
+        assert api.get_sentiment_analyses(make_articles(4)) == ["BULLISH"] * 4
+
+    assert mock_completion.call_count == 1
+    assert "Article 3:" in mock_completion.call_args.kwargs["messages"][1]["content"]
+
+
+def test_get_sentiment_analyses_falls_back_for_unparsed_articles():
+    api = OpenAIAPI()
+    content = json.dumps({"sentiments": [{"index": 0, "sentiment": "BEARISH"}]})
+
+    with patch.object(
+        api, "completion_with_backoff", return_value=make_response(content)
+    ), patch.object(api, "_classify_single", return_value="BULLISH") as mock_single:
+        assert api.get_sentiment_analyses(make_articles(3)) == ["BEARISH", "BULLISH", "BULLISH"]
+
+    assert mock_single.call_count == 2
+    assert mock_single.call_args.args[0]["url"] == "url-2"
+
+
+def test_get_sentiment_analyses_is_neutral_when_batch_fails():
+    api = OpenAIAPI()
+
+    with patch.object(
+        api, "completion_with_backoff", side_effect=Exception("timeout")
+    ) as mock_completion, patch.object(api, "_classify_single") as mock_single:
+        assert api.get_sentiment_analyses(make_articles(2)) == ["NEUTRAL", "NEUTRAL"]
+
+    assert mock_completion.call_count == 1
+    mock_single.assert_not_called()
+    assert api.metrics.stats()["llm"] == {"attempts": 2, "hits": 0, "hit_rate": 0.0}
+
+
+def test_get_sentiment_analyses_only_sends_uncached_articles(tmp_path):
+    cache = SentimentCache(str(tmp_path / "sentiment.db"))
+    api = OpenAIAPI(sentiment_cache=cache)
+    articles = make_articles(3)
+    content = json.dumps(["BULLISH", "BEARISH", "NEUTRAL"])
+
+    with patch.object(api, "completion_with_backoff", return_value=make_response(content)):
+        first = api.get_sentiment_analyses(articles)
+
+    with patch.object(api, "completion_with_backoff") as mock_completion:
+        second = api.get_sentiment_analyses(articles)
+
+    assert first == second == ["BULLISH", "BEARISH", "NEUTRAL"]
+    mock_completion.assert_not_called()
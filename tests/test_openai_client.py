@@ -0,0 +1,113 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from alpaca_daily_losers.openai import wait_for_retry
+from alpaca_daily_losers.openai_client import OpenAIClientManager
+from alpaca_daily_losers.rate_limiter import (
+    RateLimitPacer,
+    parse_reset_duration,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("1s", 1.0), ("6m0s", 360.0), ("1h2m3.5s", 3723.5), ("20ms", 0.02)]
+)
+def test_parse_reset_duration(value, expected):
+    assert parse_reset_duration(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", [None, "", "soon", "5 s"])
+def test_parse_reset_duration_invalid(value):
+    assert parse_reset_duration(value) is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"retry-after-ms": "1500"}) == 1.5
+    assert parse_retry_after({"retry-after": "2"}) == 2.0
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) is None
+    assert parse_retry_after({}) is None
+
+
+def test_pacer_waits_for_request_window_reset():
+    clock = FakeClock()
+    pacer = RateLimitPacer(clock=clock, sleep=clock.sleep)
+    assert pacer.wait() == 0
+
+    pacer.update({"x-ratelimit-remaining-requests": "1", "x-ratelimit-reset-requests": "2s"})
+    assert pacer.wait() == 0
+    assert pacer.wait() == pytest.approx(2.0)
+    assert pacer.wait() == 0
+
+
+def test_pacer_waits_when_tokens_run_out():
+    clock = FakeClock()
+    pacer = RateLimitPacer(clock=clock, sleep=clock.sleep)
+    pacer.update({"x-ratelimit-remaining-tokens": "1000", "x-ratelimit-reset-tokens": "6s"})
+
+    assert pacer.wait(600) == 0
+    assert pacer.delay(600) == pytest.approx(6.0)
+    assert pacer.wait(600) == pytest.approx(6.0)
+
+
+def test_manager_feeds_response_headers_to_pacer():
+    client = MagicMock()
+    raw = client.chat.completions.with_raw_response.create.return_value
+    raw.headers = {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1s"}
+    pacer = MagicMock()
+    manager = OpenAIClientManager(client, pacer)
+
+    result = manager.create_chat_completion(model="gpt-4o", messages=[{"content": "abcd"}])
+
+    assert result is raw.parse.return_value
+    pacer.wait.assert_called_once_with(5)
+    pacer.update.assert_called_once_with(raw.headers)
+
+
+def test_manager_feeds_error_headers_to_pacer():
+    client = MagicMock()
+    error = Exception("rate limited")
+    error.response = MagicMock(headers={"x-ratelimit-remaining-requests": "0"})
+    client.chat.completions.with_raw_response.create.side_effect = error
+    pacer = MagicMock()
+    manager = OpenAIClientManager(client, pacer)
+
+    with pytest.raises(Exception):
+        manager.create_chat_completion(model="gpt-4o", messages=[])
+    pacer.update.assert_called_once_with(error.response.headers)
+
+
+def test_shared_manager_is_reused_per_api_key():
+    with patch("alpaca_daily_losers.openai_client.OpenAI") as mock_openai, patch.dict(
+        OpenAIClientManager._shared, clear=True
+    ):
+        first = OpenAIClientManager.shared("key")
+        second = OpenAIClientManager.shared("key")
+        other = OpenAIClientManager.shared("other")
+
+    assert first is second
+    assert first is not other
+    assert mock_openai.call_count == 2
+    mock_openai.assert_any_call(api_key="key", max_retries=0)
+
+
+def test_wait_for_retry_honours_retry_after():
+    error = Exception("rate limited")
+    error.response = MagicMock(headers={"retry-after": "3"})
+    retry_state = MagicMock()
+    retry_state.outcome.exception.return_value = error
+    assert wait_for_retry(retry_state) == 3.0
@@ -0,0 +1,157 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from alpaca_daily_losers.order_executor import (
+    OrderExecutor,
+    is_duplicate_order_error,
+    make_client_order_id,
+)
+
+
+class MarketWithClientOrderId:
+    def __init__(self):
+        self.calls = []
+
+    def market(self, symbol, notional=None, side="buy", client_order_id=None):
+        self.calls.append((symbol, client_order_id))
+
+
+def make_orders(*symbols):
+    return [{"symbol": symbol, "notional": 100.0, "side": "buy"} for symbol in symbols]
+
+
+def test_client_order_id_is_unique_per_batch():
+    first = make_client_order_id("buy", "AAPL", "buy", "batch-1", "2024-06-03")
+
+    assert first == make_client_order_id("buy", "AAPL", "buy", "batch-1", "2024-06-03")
+    assert first != make_client_order_id("buy", "AAPL", "buy", "batch-2", "2024-06-03")
+    assert first != make_client_order_id("buy", "AAPL", "buy", "batch-1", "2024-06-04")
+    assert first != make_client_order_id("liquidate", "AAPL", "sell", "batch-1", "2024-06-03")
+    assert first.startswith("daily-losers-buy-AAPL-")
+    assert len(first) <= 48
+
+
+def test_orders_are_submitted_concurrently_in_order():
+    barrier = threading.Barrier(3, timeout=1)
+    trading = MagicMock()
+    trading.orders.market.side_effect = lambda **kwargs: barrier.wait()
+
+    results = OrderExecutor(trading, MagicMock(), max_workers=3).submit_market_orders(
+        make_orders("AAPL", "MSFT", "GOOG"), stage="buy"
+    )
+
+    assert [result.symbol for result in results] == ["AAPL", "MSFT", "GOOG"]
+    assert all(result.ok and result.latency >= 0 for result in results)
+
+
+def test_client_order_id_is_passed_when_supported():
+    trading = MagicMock()
+    trading.orders = MarketWithClientOrderId()
+
+    results = OrderExecutor(trading, MagicMock()).submit_market_orders(
+        make_orders("AAPL"), stage="buy", session="2024-06-03", nonce="batch-1"
+    )
+
+    assert trading.orders.calls == [("AAPL", results[0].client_order_id)]
+    assert results[0].client_order_id == make_client_order_id(
+        "buy", "AAPL", "buy", "batch-1", "2024-06-03"
+    )
+
+
+def test_batches_get_new_client_order_ids():
+    executor = OrderExecutor(MagicMock(), MagicMock())
+
+    first = executor.submit_market_orders(make_orders("AAPL"), stage="buy")
+    second = executor.submit_market_orders(make_orders("AAPL"), stage="buy")
+
+    assert first[0].client_order_id != second[0].client_order_id
+
+
+def test_order_is_posted_with_client_order_id_to_orders_endpoint():
+    trading = MagicMock()
+    trading.orders.base_url = "https://paper-api.alpaca.markets/v2"
+    trading.orders.headers = {"key": "value"}
+
+    with patch("alpaca_daily_losers.order_executor.Requests") as mock_requests:
+        mock_requests.return_value.request.return_value.text = '{"id": "1"}'
+        results = OrderExecutor(trading, MagicMock()).submit_market_orders(
+            make_orders("AAPL"), stage="buy"
+        )
+
+    kwargs = mock_requests.return_value.request.call_args.kwargs
+    assert kwargs["url"] == "https://paper-api.alpaca.markets/v2/orders"
+    assert kwargs["json"]["client_order_id"] == results[0].client_order_id
+    trading.orders.market.assert_not_called()
+
+
+def test_connection_errors_are_retried_and_duplicates_count_as_submitted():
+    trading = MagicMock()
+    trading.orders = MarketWithClientOrderId()
+    errors = [
+        requests.exceptions.ConnectionError("reset"),
+        Exception("client_order_id must be unique"),
+    ]
+
+    def market(symbol, notional, side, client_order_id):
+        trading.orders.calls.append((symbol, client_order_id))
+        raise errors.pop(0)
+
+    trading.orders.market = market
+
+    executor = OrderExecutor(trading, MagicMock(), sleep=lambda seconds: None)
+    existing = {"symbol": "AAPL", "side": "buy", "status": "accepted"}
+
+    with patch.object(executor, "_get_order", return_value=existing) as mock_get_order:
+        result = executor.submit_market_orders(make_orders("AAPL"), stage="buy")[0]
+
+    assert result.ok and result.duplicate
+    assert result.attempts == 2
+    assert trading.orders.calls == [("AAPL", result.client_order_id)] * 2
+    mock_get_order.assert_called_once_with(result.client_order_id)
+
+
+def test_unconfirmed_duplicates_are_failures():
+    trading = MagicMock()
+    trading.orders.market.side_effect = Exception("client_order_id must be unique")
+    executor = OrderExecutor(trading, MagicMock())
+
+    with patch.object(
+        executor, "_get_order", return_value={"symbol": "AAPL", "side": "buy", "status": "canceled"}
+    ):
+        result = executor.submit_market_orders(make_orders("AAPL"), stage="buy")[0]
+
+    assert not result.ok and not result.duplicate
+
+
+def test_other_errors_are_not_retried():
+    trading = MagicMock()
+    trading.orders.market.side_effect = Exception("insufficient buying power")
+
+    result = OrderExecutor(trading, MagicMock()).submit_market_orders(
+        make_orders("AAPL"), stage="buy"
+    )[0]
+
+    assert not result.ok
+    assert trading.orders.market.call_count == 1
+
+
+def test_close_positions_reports_failures():
+    trading = MagicMock()
+    trading.positions.close.side_effect = lambda symbol_or_id, qty: (
+        (_ for _ in ()).throw(Exception("no position")) if symbol_or_id == "MSFT" else None
+    )
+    logger = MagicMock()
+
+    results = OrderExecutor(trading, logger).close_positions(
+        [{"symbol": "AAPL", "qty": 1}, {"symbol": "MSFT", "qty": 2}]
+    )
+
+    assert [result.ok for result in results] == [True, False]
+    assert "Submitted 1/2 close orders" in logger.info.call_args.args[0]
+
+
+def test_is_duplicate_order_error():
+    assert is_duplicate_order_error(Exception('{"message": "client_order_id must be unique"}'))
+    assert not is_duplicate_order_error(Exception("insufficient buying power"))
@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from alpaca_daily_losers.liquidate import Liquidate
+from alpaca_daily_losers.portfolio import PortfolioSnapshot
+
+
+@pytest.fixture
+def trading():
+    trading = MagicMock()
+    trading.positions.get_all.return_value = pd.DataFrame(
+        {
+            "symbol": ["Cash", "AAPL", "MSFT"],
+            "qty": [0.0, 10.0, 4.0],
+            "market_value": [100.0, 1000.0, 400.0],
+            "current_price": [0.0, 100.0, 100.0],
+            "profit_pct": [0.0, 12.0, 3.0],
+        }
+    )
+    return trading
+
+
+def test_positions_are_fetched_once(trading):
+    portfolio = PortfolioSnapshot(trading)
+
+    assert portfolio.cash == 100.0
+    assert len(portfolio.positions) == 3
+    assert trading.positions.get_all.call_count == 1
+    assert portfolio.version == 1
+
+
+def test_close_updates_position_and_cash(trading):
+    portfolio = PortfolioSnapshot(trading)
+    before = portfolio.positions
+
+    portfolio.apply_close("AAPL", 4)
+    portfolio.apply_close("MSFT", 4)
+
+    positions = portfolio.positions.set_index("symbol")
+    assert positions.loc["AAPL", "qty"] == 6.0
+    assert positions.loc["AAPL", "market_value"] == 600.0
+    assert "MSFT" not in positions.index
+    assert portfolio.cash == 900.0
+    assert portfolio.version == 3
+    assert before.loc[before["symbol"] == "AAPL", "qty"].iloc[0] == 10.0
+
+
+def test_market_orders_update_positions(trading):
+    portfolio = PortfolioSnapshot(trading)
+
+    portfolio.apply_market_order("AAPL", 250.0, "sell")
+    portfolio.apply_market_order("GOOG", 50.0, "buy")
+    portfolio.apply_market_order("MSFT", 100.0, "buy")
+
+    positions = portfolio.positions.set_index("symbol")
+    assert positions.loc["AAPL", "qty"] == 7.5
+    assert positions.loc["GOOG", "market_value"] == 50.0
+    assert positions.loc["MSFT", "qty"] == 5.0
+    assert portfolio.cash == 200.0
+
+
+def test_refresh_and_invalidate_fetch_again(trading):
+    portfolio = PortfolioSnapshot(trading)
+    portfolio.apply_close("AAPL", 10)
+
+    portfolio.invalidate()
+
+    assert "AAPL" in portfolio.positions["symbol"].tolist()
+    portfolio.refresh()
+    assert trading.positions.get_all.call_count == 3
+
+
+def test_stages_share_the_snapshot(trading):
+    portfolio = PortfolioSnapshot(trading)
+
+    Liquidate(trading, MagicMock()).liquidate_positions(portfolio=portfolio)
+
+    assert trading.positions.get_all.call_count == 1
+    assert portfolio.cash > 100.0
+    assert portfolio.version > 1
+
+
+def test_updates_keep_portfolio_pct_units(trading):
+    for scale in (1, 100):
+        positions = trading.positions.get_all.return_value.copy()
+        positions["portfolio_pct"] = positions["market_value"] / 1500.0 * scale
+        portfolio = PortfolioSnapshot(trading, positions=positions)
+
+        portfolio.apply_close("MSFT", 2)
+
+        before = positions.set_index("symbol")["portfolio_pct"]
+        after = portfolio.positions.set_index("symbol")["portfolio_pct"]
+        assert round(after.sum(), 6) == round(before.sum(), 6) == scale
+        assert round(after["AAPL"], 6) == round(before["AAPL"], 6)
+        assert after["MSFT"] < before["MSFT"]
@@ -0,0 +1,99 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from alpaca_daily_losers.openai import OpenAIAPI
+from alpaca_daily_losers.prompt_compaction import PromptCompactor
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def test_short_content_only_loses_boilerplate():
+    compactor = PromptCompactor(token_budget=100, count_tokens=count_words)
+    content = (
+        "Apple beats estimates. AAPL rose 5% on the news. "
+        "This article is not investment advice. Click here to subscribe."
+    )
+
+    assert compactor.compact_text(content, "AAPL", "Apple beats estimates") == (
+        "AAPL rose 5% on the news."
+    )
+
+
+@pytest.mark.parametrize(
+    "sentence",
+    [
+        "Netflix added 9 million subscribers, beating estimates.",
+        "The redesign update lifted engagement.",
+    ],
+)
+def test_boilerplate_words_inside_other_words_are_kept(sentence):
+    compactor = PromptCompactor(20)
+
+    assert compactor.compact_text(f"Shares rose. {sentence}", "NFLX") == f"Shares rose. {sentence}"
+
+
+def test_whole_boilerplate_phrases_are_dropped():
+    compactor = PromptCompactor(token_budget=100, count_tokens=count_words)
+    content = "Shares rose. Sign up for our newsletter. Disclosure: none. © 2024 Example."
+
+    assert compactor.compact_text(content, "NFLX") == "Shares rose."
+
+
+def test_duplicate_sentences_are_dropped():
+    compactor = PromptCompactor(token_budget=100, count_tokens=count_words)
+
+    assert compactor.compact_text("Shares rose. Shares rose.\nShares  rose.", "AAPL") == (
+        "Shares rose."
+    )
+
+
+def test_long_content_keeps_symbol_sentences_within_budget():
+    compactor = PromptCompactor(token_budget=12, count_tokens=count_words)
+    content = (
+        "Markets were mixed on Monday. Oil prices moved higher. "
+        "AAPL gained after results. Bonds were flat today. "
+        "Analysts raised their AAPL target."
+    )
+
+    compacted = compactor.compact_text(content, "AAPL")
+
+    assert compacted == "AAPL gained after results. Analysts raised their AAPL target."
+    assert count_words(compacted) <= 12
+
+
+def test_compact_returns_copy():
+    compactor = PromptCompactor(token_budget=2, count_tokens=count_words)
+    article = {"title": "T", "symbol": "AAPL", "content": "One two three. AAPL four."}
+
+    compacted = compactor.compact(article)
+
+    assert compacted["content"] == "AAPL four."
+    assert article["content"] == "One two three. AAPL four."
+
+
+def test_default_counter_estimates_tokens_from_characters():
+    compactor = PromptCompactor()
+
+    assert compactor.count_tokens("Apple shares rose five percent.") == 7
+
+
+def test_openai_sends_compacted_content_and_caches_by_original(tmp_path):
+    api = OpenAIAPI(prompt_compactor=PromptCompactor(token_budget=3, count_tokens=count_words))
+    response = MagicMock()
+    response.choices[0].message.content = json.dumps(["BULLISH", "NEUTRAL"])
+    articles = [
+        {"title": "A", "symbol": "AAPL", "content": "Filler words go here. AAPL rose."},
+        {"title": "B", "symbol": "AAPL", "content": "More filler words here. Nothing."},
+    ]
+
+    with patch.object(api, "completion_with_backoff", return_value=response) as mock_completion:
+        assert api.get_sentiment_analyses(articles) == ["BULLISH", "NEUTRAL"]
+
+    prompt = mock_completion.call_args.kwargs["messages"][1]["content"]
+    assert "AAPL rose." in prompt
+    assert "Filler" not in prompt
+    assert articles[0]["content"] == "Filler words go here. AAPL rose."
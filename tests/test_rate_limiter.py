@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from alpaca_daily_losers.openai import OpenAIAPI
+from alpaca_daily_losers.openai_client import OpenAIClientManager
+from alpaca_daily_losers.rate_limiter import (
+    RateLimiter,
+    RateLimitPacer,
+    TokenBucket,
+    estimate_tokens,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_estimate_tokens():
+    messages = [{"content": "a" * 400, "role": "user"}, {"content": "", "role": "user"}]
+    assert estimate_tokens(messages) == 108
+
+
+def test_token_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+def test_token_bucket_allows_burst_then_waits_for_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock=clock, sleep=clock.sleep)
+
+    for _ in range(60):
+        assert bucket.acquire() == 0
+    assert bucket.try_acquire() == pytest.approx(1.0)
+
+    assert bucket.acquire(2) == pytest.approx(2.0)
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_token_bucket_caps_requests_larger_than_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+    assert bucket.acquire(50) == 0
+    assert bucket.acquire(50) == pytest.approx(60.0)
+
+
+def test_rate_limiter_waits_for_token_budget():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        requests_per_minute=100, tokens_per_minute=1000, clock=clock, sleep=clock.sleep
+    )
+    assert limiter.acquire(800) == 0
+    assert limiter.acquire(400) == pytest.approx(12.0)
+
+
+def test_completion_with_backoff_is_paced_once_by_the_client_manager():
+    client = MagicMock()
+    pacer = MagicMock()
+    api = OpenAIAPI(client_manager=OpenAIClientManager(client, pacer))
+    messages = [{"content": "a" * 40, "role": "user"}]
+
+    api.completion_with_backoff(model=api.model, messages=messages)
+
+    pacer.wait.assert_called_once_with(14)
+    client.chat.completions.with_raw_response.create.assert_called_once_with(
+        model=api.model, messages=messages
+    )
+
+
+def test_first_wave_of_requests_is_held_to_the_base_limit():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        requests_per_minute=2, tokens_per_minute=1000, clock=clock, sleep=clock.sleep
+    )
+    pacer = RateLimitPacer(clock=clock, sleep=clock.sleep)
+    client = MagicMock()
+    client.chat.completions.with_raw_response.create.return_value.headers = {}
+    manager = OpenAIClientManager(client, pacer, rate_limiter=limiter)
+    messages = [{"content": "hi", "role": "user"}]
+
+    for _ in range(3):
+        manager.create_chat_completion(model="gpt-4o", messages=messages)
+
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_shared_manager_uses_the_base_limit():
+    limiter = MagicMock()
+    with patch("alpaca_daily_losers.openai_client.OpenAI") as mock_openai, patch.dict(
+        OpenAIClientManager._shared, clear=True
+    ):
+        mock_openai.return_value.chat.completions.with_raw_response.create.return_value.headers = {}
+        api = OpenAIAPI(rate_limiter=limiter)
+        api.api_key = "test-key"
+        api.completion_with_backoff(model=api.model, messages=[{"content": "", "role": "user"}])
+
+    limiter.acquire.assert_called_once_with(4)
@@ -0,0 +1,106 @@
+import sqlite3
+from unittest.mock import MagicMock, patch
+
+from alpaca_daily_losers.openai import OpenAIAPI
+from alpaca_daily_losers.sentiment_cache import SentimentCache, make_sentiment_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_make_sentiment_key_depends_on_content_and_model():
+    key = make_sentiment_key("id-1", "Title", "Body", "gpt-4o")
+    assert key == make_sentiment_key("id-1", "Title", "Body", "gpt-4o")
+    assert key != make_sentiment_key("id-1", "Title", "Edited body", "gpt-4o")
+    assert key != make_sentiment_key("id-1", "Title", "Body", "gpt-4o-mini")
+    assert key != make_sentiment_key("id-2", "Title", "Body", "gpt-4o")
+
+
+def test_get_returns_stored_sentiment(tmp_path):
+    cache = SentimentCache(str(tmp_path / "sentiment.db"))
+    assert cache.get("key") is None
+
+    cache.put("key", "BULLISH")
+    assert cache.get("key") == "BULLISH"
+
+    reopened = SentimentCache(str(tmp_path / "sentiment.db"))
+    assert reopened.get("key") == "BULLISH"
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    clock = FakeClock()
+    cache = SentimentCache(str(tmp_path / "sentiment.db"), ttl=60, clock=clock)
+    cache.put("old", "BEARISH")
+    clock.now += 30
+    cache.put("new", "BULLISH")
+
+    clock.now += 45
+    assert cache.get("old") is None
+    assert cache.get("new") == "BULLISH"
+    assert len(cache) == 1
+
+    clock.now += 60
+    assert cache.purge_expired() == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = FakeClock()
+    cache = SentimentCache(str(tmp_path / "sentiment.db"), max_entries=2, clock=clock)
+    cache.put("a", "BULLISH")
+    clock.now += 1
+    cache.put("b", "BEARISH")
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("c", "NEUTRAL")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "BULLISH"
+    assert cache.get("c") == "NEUTRAL"
+
+
+def test_evicted_entries_lose_their_signatures(tmp_path):
+    clock = FakeClock()
+    cache = SentimentCache(str(tmp_path / "sentiment.db"), max_entries=1, clock=clock)
+    cache.put("a", "BULLISH")
+    cache.put_signature("a", b"sig-a", ["band-1", "band-2"])
+    clock.now += 1
+    cache.put("b", "BEARISH")
+    cache.put_signature("b", b"sig-b", ["band-2"])
+
+    assert cache.similar_candidates(["band-1", "band-2"]) == [("b", b"sig-b")]
+    with sqlite3.connect(cache.path) as conn:
+        assert conn.execute("SELECT key FROM signature_band").fetchall() == [("b",)]
+
+
+def test_sentiment_analysis_consults_cache_before_api(tmp_path):
+    api = OpenAIAPI(sentiment_cache=SentimentCache(str(tmp_path / "sentiment.db")))
+    response = MagicMock()
+    response.choices[0].message.content = "Bullish."
+
+    with patch.object(api, "chat", return_value=response) as mock_chat:
+        first = api.get_sentiment_analysis("Title", "AAPL", "Body", article_id="url")
+        second = api.get_sentiment_analysis("Title", "AAPL", "Body", article_id="url")
+
+    assert first == second == "BULLISH"
+    assert mock_chat.call_count == 1
+
+
+def test_sentiment_analysis_does_not_cache_failures(tmp_path):
+    api = OpenAIAPI(sentiment_cache=SentimentCache(str(tmp_path / "sentiment.db")))
+    response = MagicMock()
+    response.choices[0].message.content = "Unsure"
+
+    with patch.object(api, "chat", return_value=response) as mock_chat:
+        assert api.get_sentiment_analysis("Title", "AAPL", "Body") == "NEUTRAL"
+        assert api.get_sentiment_analysis("Title", "AAPL", "Body") == "NEUTRAL"
+
+    assert mock_chat.call_count == 2
+    assert len(api.sentiment_cache) == 0